@@ -563,7 +563,9 @@ Researched {len(quotes)} Bitcoin quotes and {len(history)} historical events.
 def save_to_database(quotes: List[Dict], history: List[Dict],
                      session: BitcoinResearchSession) -> int:
     """Save Bitcoin research findings to database"""
-    saved_count = 0
+    research_records = []
+    research_types = []
+    content_records = []
 
     # Save quotes
     for quote in quotes:
@@ -573,19 +575,14 @@ def save_to_database(quotes: List[Dict], history: List[Dict],
             sources = [quote.get('source_url', quote['source'])]
             tags = ['bitcoin', 'quotes'] + quote['tags']
 
-            research_id = session.db.add_research(
-                topic=topic,
-                category='bitcoin',
-                findings=findings,
-                sources=sources,
-                tags=tags
-            )
-
-            session.log_database_entry('research_findings', 'bitcoin quote')
-            saved_count += 1
-
-            if VERBOSE:
-                print(f"  ✓ Saved to database: {topic} (ID: {research_id})")
+            research_records.append({
+                'topic': topic,
+                'category': 'bitcoin',
+                'findings': findings,
+                'sources': sources,
+                'tags': tags
+            })
+            research_types.append('bitcoin quote')
 
             # Generate content ideas with SMART SCORING
             content_ideas = [
@@ -610,21 +607,21 @@ def save_to_database(quotes: List[Dict], history: List[Dict],
                     'schedule': scoring['schedule_window']
                 })
 
-                session.db.add_content_idea(
-                    topic=f"Bitcoin Quote - {quote['author']} - {scoring['priority'].upper()}",
-                    category='bitcoin_quotes',
-                    content=idea,
-                    status=f"draft-{scoring['priority']}"
-                )
-                session.log_database_entry('content_ideas', f"{scoring['priority']} priority")
+                content_records.append({
+                    'topic': f"Bitcoin Quote - {quote['author']} - {scoring['priority'].upper()}",
+                    'category': 'bitcoin_quotes',
+                    'content': idea,
+                    'status': f"draft-{scoring['priority']}",
+                    'priority': scoring['priority']
+                })
 
                 if VERBOSE:
                     print(f"    ✓ Content idea: {scoring['score']}/100 ({scoring['priority'].upper()}) - {scoring['schedule_window']}")
 
         except Exception as e:
-            session.log_error(f"Database save failed: {e}", quote['author'])
+            session.log_error(f"Research preparation failed: {e}", quote.get('author', ''))
             if VERBOSE:
-                print(f"  ✗ Database error: {e}")
+                print(f"  ✗ Preparation error: {e}")
 
     # Save historical events
     for event in history:
@@ -638,19 +635,14 @@ def save_to_database(quotes: List[Dict], history: List[Dict],
             sources = [event.get('source_url', 'Historical record')]
             tags = ['bitcoin', 'history'] + event['tags']
 
-            research_id = session.db.add_research(
-                topic=topic,
-                category='bitcoin',
-                findings=findings,
-                sources=sources,
-                tags=tags
-            )
-
-            session.log_database_entry('research_findings', 'bitcoin history')
-            saved_count += 1
-
-            if VERBOSE:
-                print(f"  ✓ Saved to database: {topic} (ID: {research_id})")
+            research_records.append({
+                'topic': topic,
+                'category': 'bitcoin',
+                'findings': findings,
+                'sources': sources,
+                'tags': tags
+            })
+            research_types.append('bitcoin history')
 
             # Generate content ideas with SMART SCORING
             content_ideas = [
@@ -675,21 +667,45 @@ def save_to_database(quotes: List[Dict], history: List[Dict],
                     'schedule': scoring['schedule_window']
                 })
 
-                session.db.add_content_idea(
-                    topic=f"Bitcoin History - {event['event']} - {scoring['priority'].upper()}",
-                    category='bitcoin_history',
-                    content=idea,
-                    status=f"draft-{scoring['priority']}"
-                )
-                session.log_database_entry('content_ideas', f"{scoring['priority']} priority")
+                content_records.append({
+                    'topic': f"Bitcoin History - {event['event']} - {scoring['priority'].upper()}",
+                    'category': 'bitcoin_history',
+                    'content': idea,
+                    'status': f"draft-{scoring['priority']}",
+                    'priority': scoring['priority']
+                })
 
                 if VERBOSE:
                     print(f"    ✓ Content idea: {scoring['score']}/100 ({scoring['priority'].upper()}) - {scoring['schedule_window']}")
 
         except Exception as e:
-            session.log_error(f"Database save failed: {e}", event['event'])
+            session.log_error(f"Research preparation failed: {e}", event.get('event', ''))
             if VERBOSE:
-                print(f"  ✗ Database error: {e}")
+                print(f"  ✗ Preparation error: {e}")
+
+    # Write everything in one transaction; reruns skip rows that already exist
+    try:
+        with session.db.transaction():
+            research_ids = session.db.add_research_many(research_records)
+            content_ids = session.db.add_content_ideas_many(content_records)
+    except Exception as e:
+        session.log_error(f"Database save failed: {e}", 'bulk insert')
+        if VERBOSE:
+            print(f"  ✗ Database error: {e}")
+        return 0
+
+    saved_count = 0
+    for record, entry_type, research_id in zip(research_records, research_types, research_ids):
+        if research_id is None:
+            continue
+        session.log_database_entry('research_findings', entry_type)
+        saved_count += 1
+        if VERBOSE:
+            print(f"  ✓ Saved to database: {record['topic']} (ID: {research_id})")
+
+    for record, content_id in zip(content_records, content_ids):
+        if content_id is not None:
+            session.log_database_entry('content_ideas', f"{record['priority']} priority")
 
     return saved_count
 
@@ -26,7 +26,7 @@ import json
 # Add parent directory to path for imports
 parent_dir = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, parent_dir)
-from jett_db import get_db
+from jett_db import get_db, normalize_topic
 
 # Constants
 COOLDOWN_DAYS = 7  # Content can't be used again within this many days
@@ -270,10 +270,7 @@ class ContentPoolManager:
         recent_categories = self._get_category_counts_recent()
         
         # Normalize recent topics for matching (strip suffixes like " - HIGH", " - LOW")
-        normalized_recent = set()
-        for topic in recent_topics:
-            base = topic.rsplit(' - ', 1)[0]  # Strip " - HIGH/LOW" suffix
-            normalized_recent.add(base)
+        normalized_recent = {normalize_topic(topic) for topic in recent_topics}
         
         context = {
             'btc_price': btc_price,
@@ -287,7 +284,7 @@ class ContentPoolManager:
         # Filter out recent topics (both exact and base match)
         filtered = [
             c for c in all_content
-            if c.topic not in recent_topics and c.topic not in normalized_recent
+            if c.topic not in recent_topics and normalize_topic(c.topic) not in normalized_recent
         ]
         
         if not filtered:
@@ -83,9 +83,8 @@ function stopAutoRefresh() {
 // Data Loading
 async function loadData(force = false) {
     try {
-        // Always use cache-busting for JSON files
-        const timestamp = Date.now();
-        const response = await fetch(`token-usage.json?t=${timestamp}`);
+        // Revalidate with the server's ETag; unchanged data comes back as a 304
+        const response = await fetch('token-usage.json', { cache: 'no-cache' });
 
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -102,7 +101,7 @@ async function loadData(force = false) {
 
         // Load config if not already loaded
         if (!config) {
-            config = await fetch(`config.json?t=${timestamp}`).then(r => r.json());
+            config = await fetch('config.json', { cache: 'no-cache' }).then(r => r.json());
         }
 
         applyFilters();
@@ -1,37 +1,261 @@
 #!/usr/bin/env python3
 """
 Simple HTTP server for API Usage Dashboard
-Serves the dashboard on http://localhost:8000 with auto-reload support
+Serves the dashboard on http://localhost:8000 with live usage metrics:
+
+  /api/usage?days=7     usage summary from the UsageTracker rollups (ETag, gzip)
+  /api/usage/stream     Server-Sent Events, one 'usage' event per logged request
 """
 
+import gzip
 import http.server
-import socketserver
+import json
 import os
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+# usage_tracker lives in the repo root, one level up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from usage_tracker import DB_PATH, UsageTracker
+except ImportError:
+    UsageTracker = None
+    DB_PATH = None
 
 PORT = 8000
 DIRECTORY = "public"
 
-class NoCacheHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """HTTP handler with disabled caching for better reload experience."""
+USAGE_DB = os.environ.get('JETT_USAGE_DB', DB_PATH)
+# One poll for new usage rows per interval, shared by every client
+POLL_INTERVAL = 1.0
+# Cached /api/usage bodies are rebuilt after this long even without new rows
+SNAPSHOT_TTL = 60
+# SSE comment sent on idle streams so proxies keep them open
+KEEPALIVE_INTERVAL = 15
+# Events kept for clients reconnecting with Last-Event-ID
+RECENT_EVENTS = 1000
+# Smaller responses are sent uncompressed
+GZIP_MIN_BYTES = 1024
+MAX_DAYS = 365
+
+
+class UsageFeed:
+    """
+    Polls usage_stats for new rows on one thread and fans them out.
+
+    SSE streams wait on the feed and /api/usage bodies are cached per
+    (days, last row id), so sqlite sees the same load for one tab or fifty.
+    """
+
+    def __init__(self, tracker, poll_interval: float = POLL_INTERVAL):
+        self.tracker = tracker
+        self.poll_interval = poll_interval
+        self.last_id = tracker.get_last_usage_id()
+        self.recent = deque(maxlen=RECENT_EVENTS)
+        self._changed = threading.Condition()
+        self._snapshots = {}  # days -> (etag, body, gzipped body)
+        self._snapshot_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name='usage-feed', daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                events = self.tracker.get_usage_since(self.last_id, limit=RECENT_EVENTS)
+            except Exception as e:
+                # Keep polling: open streams would otherwise only ever see keepalives
+                print(f"⚠️  Usage feed poll failed: {e}")
+                events = []
+            if events:
+                with self._changed:
+                    self.recent.extend(events)
+                    self.last_id = events[-1]['id']
+                    self._changed.notify_all()
+            if len(events) < RECENT_EVENTS:
+                self._stopped.wait(self.poll_interval)
+
+    def events_after(self, event_id: int, timeout: float) -> list:
+        """
+        Events with id > event_id, waiting up to timeout for the first one.
+
+        Clients further behind than `recent` are backfilled from usage_stats,
+        RECENT_EVENTS at a time, so a long reconnect doesn't drop the gap.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.last_id > event_id, timeout)
+            oldest = self.recent[0]['id'] if self.recent else self.last_id + 1
+            if event_id >= oldest - 1:
+                return [event for event in self.recent if event['id'] > event_id]
+        # Read the gap outside the lock so the poller isn't held up
+        return self.tracker.get_usage_since(event_id, limit=RECENT_EVENTS)
+
+    def snapshot(self, days: int):
+        """(etag, body, gzipped body) of the /api/usage response for `days`."""
+        last_id = self.last_id
+        # Same rows and same TTL window -> same body
+        etag = f'"{days}-{last_id}-{int(time.time() // SNAPSHOT_TTL)}"'
+        with self._snapshot_lock:
+            cached = self._snapshots.get(days)
+            if cached and cached[0] == etag:
+                return cached
+
+            payload = {
+                'generatedAt': datetime.now().isoformat(),
+                'lastEventId': last_id,
+                'stats': self.tracker.get_stats(days=days),
+                'daily': self.tracker.get_daily_summary(days=days),
+                'latency': self.tracker.get_latency_percentiles(days=days, by_model=True),
+            }
+            body = json.dumps(payload).encode('utf-8')
+            gzipped = gzip.compress(body) if len(body) >= GZIP_MIN_BYTES else None
+            self._snapshots[days] = (etag, body, gzipped)
+            return self._snapshots[days]
+
+
+class DashboardRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static dashboard files plus the live usage API."""
+
+    feed = None  # UsageFeed, set by main() when usage_tracker is available
+    _static_gzip = {}  # path -> (etag, gzipped body)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
 
+    def do_GET(self):
+        if not self.send_dynamic():
+            super().do_GET()
+
+    def do_HEAD(self):
+        """Same routes as GET; the senders skip the body for HEAD."""
+        if not self.send_dynamic():
+            super().do_HEAD()
+
+    def send_dynamic(self) -> bool:
+        """Serve the usage API and JSON files; False for other static files."""
+        url = urlsplit(self.path)
+        if url.path == '/api/usage':
+            self.send_usage(parse_qs(url.query))
+        elif url.path == '/api/usage/stream':
+            self.stream_usage(parse_qs(url.query))
+        elif url.path.endswith('.json'):
+            self.send_json_file()
+        else:
+            return False
+        return True
+
     def end_headers(self):
         """Add cache control headers."""
-        # Disable caching for JSON files
-        if self.path.endswith('.json'):
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate, max-age=0')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-        # Allow caching for static assets
-        elif self.path.endswith(('.js', '.css', '.html')):
+        # Allow caching for static assets (JSON responses set their own)
+        if urlsplit(self.path).path.endswith(('.js', '.css', '.html')):
             self.send_header('Cache-Control', 'public, max-age=60')
 
         super().end_headers()
 
+    def send_body(self, body: bytes, etag: str, gzipped: bytes = None,
+                  content_type: str = 'application/json'):
+        """
+        Send a revalidatable response: 304 on a matching If-None-Match,
+        gzip when the client accepts it.
+        """
+        use_gzip = gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if use_gzip:
+            etag = etag[:-1] + '-gz"'
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+
+        payload = gzipped if use_gzip else body
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        # Browsers revalidate every time and get a 304 while nothing changed
+        self.send_header('Cache-Control', 'no-cache')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def send_json_file(self):
+        """Static JSON (token-usage.json) with an mtime ETag and cached gzip."""
+        path = self.translate_path(self.path)
+        try:
+            stat = os.stat(path)
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        cached = self._static_gzip.get(path)
+        if cached is None or cached[0] != etag:
+            cached = (etag, gzip.compress(body) if len(body) >= GZIP_MIN_BYTES else None)
+            self._static_gzip[path] = cached
+        self.send_body(body, etag, cached[1])
+
+    def send_usage(self, query: dict):
+        if self.feed is None:
+            self.send_error(503, "Usage tracking unavailable")
+            return
+        try:
+            days = min(MAX_DAYS, max(1, int(query.get('days', ['7'])[0])))
+        except ValueError:
+            self.send_error(400, "days must be an integer")
+            return
+        etag, body, gzipped = self.feed.snapshot(days)
+        self.send_body(body, etag, gzipped)
+
+    def stream_usage(self, query: dict):
+        """Server-Sent Events: a 'usage' event per new usage_stats row."""
+        if self.feed is None:
+            self.send_error(503, "Usage tracking unavailable")
+            return
+
+        # Reconnecting clients resume after the last event they saw; new ones start now
+        resume = self.headers.get('Last-Event-ID') or query.get('lastEventId', [''])[0]
+        try:
+            last_id = min(int(resume), self.feed.last_id)
+        except ValueError:
+            last_id = self.feed.last_id
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+
+        try:
+            self.wfile.write(b'retry: 3000\n\n')
+            self.wfile.flush()
+            while True:
+                events = self.feed.events_after(last_id, KEEPALIVE_INTERVAL)
+                if not events:
+                    self.wfile.write(b': keepalive\n\n')
+                for event in events:
+                    self.wfile.write(f"id: {event['id']}\nevent: usage\ndata: {json.dumps(event)}\n\n".encode('utf-8'))
+                    last_id = event['id']
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Tab closed
+
     def log_message(self, format, *args):
         """Custom log format with timestamp."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -44,16 +268,27 @@ def main():
     dashboard_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(dashboard_dir)
 
-    # Create socket server with address reuse
-    socketserver.TCPServer.allow_reuse_address = True
+    if UsageTracker is not None:
+        # Read-only use: no writer thread, no retention pass
+        tracker = UsageTracker(USAGE_DB, buffered=False, retention_days=None)
+        DashboardRequestHandler.feed = UsageFeed(tracker)
+        DashboardRequestHandler.feed.start()
+
+    # Threaded server with address reuse: one slow client or open stream blocks no one
+    http.server.ThreadingHTTPServer.allow_reuse_address = True
+    http.server.ThreadingHTTPServer.daemon_threads = True
 
     try:
-        with socketserver.TCPServer(("", PORT), NoCacheHTTPRequestHandler) as httpd:
+        with http.server.ThreadingHTTPServer(("", PORT), DashboardRequestHandler) as httpd:
             print("=" * 70)
             print(f"  🚀 API Usage Dashboard Server")
             print("=" * 70)
             print(f"  📍 URL: http://localhost:{PORT}")
             print(f"  📂 Serving from: {os.path.join(dashboard_dir, DIRECTORY)}")
+            if DashboardRequestHandler.feed is not None:
+                print(f"  📈 Live usage: /api/usage, /api/usage/stream ({USAGE_DB})")
+            else:
+                print(f"  ⚠️  usage_tracker not importable, /api/usage disabled")
             print(f"  ⏰ Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print("=" * 70)
             print(f"  💡 Press Ctrl+C to stop the server")
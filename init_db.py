@@ -1,129 +1,37 @@
 #!/usr/bin/env python3
 """
 Initialize Jett Knowledge Base Database
-Creates tables, indexes, and sample data
+Brings the schema up to date via schema_migrations.py and adds sample data
+to a brand-new database. Existing databases are upgraded in place.
 """
 
 import sqlite3
 import os
 from datetime import datetime
 
+from schema_migrations import upgrade
+
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'jett_knowledge.db')
 
 
 def init_database():
     """Initialize database with schema and indexes."""
 
-    # Ensure data directory exists
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    is_new = not os.path.exists(DB_PATH)
+
+    print(f"{'Creating' if is_new else 'Upgrading'} database at: {DB_PATH}")
 
-    # Check if database already exists
-    if os.path.exists(DB_PATH):
-        response = input(f"Database already exists at {DB_PATH}. Overwrite? (yes/no): ")
-        if response.lower() != 'yes':
-            print("Aborted.")
-            return
-        os.remove(DB_PATH)
+    # ==================== SCHEMA ====================
 
-    print(f"Creating database at: {DB_PATH}")
+    upgrade(DB_PATH)
+
+    if not is_new:
+        print("\n✓ Existing database upgraded in place (sample data not added)")
+        return
 
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # ==================== CREATE TABLES ====================
-
-    print("Creating tables...")
-
-    # Athletes table
-    cursor.execute("""
-        CREATE TABLE athletes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            sport TEXT NOT NULL,
-            team TEXT,
-            contract_value REAL,
-            contract_year INTEGER,
-            deal_type TEXT,
-            key_details TEXT,
-            analysis_notes TEXT,
-            last_updated TIMESTAMP NOT NULL,
-            source_file TEXT
-        )
-    """)
-
-    # Content ideas table
-    cursor.execute("""
-        CREATE TABLE content_ideas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            category TEXT NOT NULL,
-            status TEXT NOT NULL DEFAULT 'draft',
-            content TEXT NOT NULL,
-            created_date TIMESTAMP NOT NULL,
-            scheduled_date TIMESTAMP,
-            published_date TIMESTAMP,
-            platform TEXT
-        )
-    """)
-
-    # Research findings table
-    cursor.execute("""
-        CREATE TABLE research_findings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            topic TEXT NOT NULL,
-            category TEXT NOT NULL,
-            findings TEXT NOT NULL,
-            sources TEXT,
-            created_date TIMESTAMP NOT NULL,
-            tags TEXT
-        )
-    """)
-
-    # Tasks table
-    cursor.execute("""
-        CREATE TABLE tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            description TEXT NOT NULL,
-            category TEXT NOT NULL,
-            priority TEXT NOT NULL DEFAULT 'medium',
-            status TEXT NOT NULL DEFAULT 'pending',
-            created_date TIMESTAMP NOT NULL,
-            completed_date TIMESTAMP,
-            notes TEXT
-        )
-    """)
-
-    print("✓ Tables created")
-
-    # ==================== CREATE INDEXES ====================
-
-    print("Creating indexes...")
-
-    # Athletes indexes
-    cursor.execute("CREATE INDEX idx_athletes_sport ON athletes(sport)")
-    cursor.execute("CREATE INDEX idx_athletes_team ON athletes(team)")
-    cursor.execute("CREATE INDEX idx_athletes_deal_type ON athletes(deal_type)")
-    cursor.execute("CREATE INDEX idx_athletes_contract_value ON athletes(contract_value)")
-    cursor.execute("CREATE INDEX idx_athletes_name_lower ON athletes(LOWER(name))")
-
-    # Content ideas indexes
-    cursor.execute("CREATE INDEX idx_content_category ON content_ideas(category)")
-    cursor.execute("CREATE INDEX idx_content_status ON content_ideas(status)")
-    cursor.execute("CREATE INDEX idx_content_platform ON content_ideas(platform)")
-    cursor.execute("CREATE INDEX idx_content_scheduled_date ON content_ideas(scheduled_date)")
-
-    # Research findings indexes
-    cursor.execute("CREATE INDEX idx_research_category ON research_findings(category)")
-    cursor.execute("CREATE INDEX idx_research_created_date ON research_findings(created_date)")
-
-    # Tasks indexes
-    cursor.execute("CREATE INDEX idx_tasks_status ON tasks(status)")
-    cursor.execute("CREATE INDEX idx_tasks_priority ON tasks(priority)")
-    cursor.execute("CREATE INDEX idx_tasks_category ON tasks(category)")
-    cursor.execute("CREATE INDEX idx_tasks_created_date ON tasks(created_date)")
-
-    print("✓ Indexes created")
-
     # ==================== INSERT SAMPLE DATA ====================
 
     print("Inserting sample data...")
@@ -205,7 +113,7 @@ def init_database():
     print("✓ Database initialized successfully!")
     print(f"{'='*60}")
     print(f"\nDatabase location: {DB_PATH}")
-    print(f"\nTables created:")
+    print(f"\nSample data added:")
     print("  - athletes (3 sample records)")
     print("  - content_ideas (2 sample records)")
     print("  - research_findings (1 sample record)")
@@ -213,7 +121,8 @@ def init_database():
     print(f"\nNext steps:")
     print("  1. Test database: python jett_db.py")
     print("  2. Import markdown files: python migrate_markdown.py")
-    print("  3. Use in Python: from jett_db import get_db")
+    print("  3. Future schema changes: python schema_migrations.py")
+    print("  4. Use in Python: from jett_db import get_db")
     print(f"\n{'='*60}")
 
 
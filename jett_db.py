@@ -6,21 +6,599 @@ This replaces constantly re-reading markdown files and saves tokens.
 
 import sqlite3
 import json
+import re
+import threading
+import time
+import functools
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
 from contextlib import contextmanager
 import os
+import sys
+import atexit
 
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'jett_knowledge.db')
 
+# Connection tuning applied to pooled (long-lived) connections.
+# WAL lets readers keep going while a writer commits; NORMAL sync is safe under WAL
+# and skips the per-commit fsync of the main database file.
+POOL_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,        # ~16MB page cache (negative = KiB)
+    'mmap_size': 268435456,      # 256MB memory-mapped reads
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,        # ms to wait on a locked database
+}
+
+# Number of prepared statements each connection keeps cached for reuse
+STATEMENT_CACHE_SIZE = 256
+
+# How bulk inserts treat rows that already exist: skip them, update them in place,
+# or raise sqlite3.IntegrityError before anything is written
+CONFLICT_POLICIES = ('skip', 'update', 'fail')
+
+# Max bound parameters per lookup query (SQLite's default limit is 999 on older builds)
+SQL_PARAM_CHUNK = 500
+
+# Priority suffixes the research scripts append to content topics
+TOPIC_PRIORITY_SUFFIXES = (' - LOW', ' - HIGH', ' - MEDIUM')
+
+
+# FTS5 indexes over the free-text columns, kept in sync by triggers
+# (created by migrations/0006_fulltext_search.py).
+# source name -> (base table, fts table, indexed columns, bm25 column weights)
+FTS_SOURCES = {
+    'athletes': ('athletes', 'athletes_fts', ('name', 'key_details', 'analysis_notes'), (10.0, 2.0, 1.0)),
+    'content': ('content_ideas', 'content_ideas_fts', ('topic', 'content'), (5.0, 1.0)),
+    'research': ('research_findings', 'research_findings_fts', ('topic', 'findings', 'tags'), (5.0, 1.0, 2.0)),
+}
+
+
+def fts_query(text: str, prefix: bool = True) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 phrase query.
+
+    Words are matched as a phrase (like the old LIKE '%text%' search) and the
+    last word is a prefix when prefix=True, so "nil de" matches "NIL deals".
+    Returns None if text has no searchable words.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    return '"' + ' '.join(words) + '"' + ('*' if prefix else '')
+
+
+# Tables the read cache tracks generations for
+CACHED_TABLES = ('athletes', 'content_ideas', 'research_findings', 'tasks', 'ebay_deals')
+
+
+class QueryCache:
+    """
+    In-process LRU/TTL cache for JettDB read results.
+
+    Every entry remembers the generation of each table it read. Writes bump
+    table generations, so an entry whose tables changed is treated as a miss
+    the next time it is looked up. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 60.0):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None = until invalidated); also
+                bounds staleness from writes made outside this JettDB instance
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Any, Tuple[Optional[float], Tuple[str, ...], Tuple[int, ...], Any]]' = OrderedDict()
+        self._generations = {table: 0 for table in CACHED_TABLES}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def generations(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        """Current generation of each table."""
+        with self._lock:
+            return tuple(self._generations[table] for table in tables)
+
+    def bump(self, tables: Iterable[str] = CACHED_TABLES):
+        """Invalidate cached results that read any of tables."""
+        with self._lock:
+            for table in tables:
+                self._generations[table] += 1
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """Look up key; returns (hit, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, tables, generations, value = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            if generations != tuple(self._generations[table] for table in tables):
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, tables: Tuple[str, ...], generations: Tuple[int, ...], value: Any):
+        """Store value as read at the given table generations."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, tables, generations, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (metrics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy lists/dicts so callers can't modify a cached result in place."""
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    return value
+
+
+def _cached(*tables: str):
+    """Serve a JettDB read method from the query cache when one is enabled."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            if cache is None:
+                return method(self, *args, **kwargs)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments (lists, dicts) are never cached
+                return method(self, *args, **kwargs)
+
+            hit, value = cache.get(key)
+            if hit:
+                return _copy_result(value)
+            # Snapshot before querying: a write that lands mid-query makes the entry stale
+            generations = cache.generations(tables)
+            value = method(self, *args, **kwargs)
+            cache.put(key, tables, generations, value)
+            return _copy_result(value)
+        return wrapper
+    return decorator
+
+
+def _invalidates(*tables: str):
+    """Bump the cache generations of tables after a JettDB write method."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            outer = getattr(self._local, 'declared_write', False)
+            self._local.declared_write = True
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._local.declared_write = outer
+                if self._cache is not None:
+                    self._cache.bump(tables)
+        return wrapper
+    return decorator
+
+
+# Query profiling (opt-in; also enabled by JETT_DB_PROFILE=1 in the environment)
+SLOW_QUERY_MS = float(os.environ.get('JETT_DB_SLOW_MS', 50))
+
+# Samples buffered in memory before they are written to the profile database
+PROFILE_FLUSH_EVERY = 500
+
+# Frames in this module that never count as "the calling method"
+_PROFILE_PLUMBING = {
+    'get_connection', 'transaction', 'wrapper', 'execute', 'executemany',
+    'fetchone', 'fetchmany', 'fetchall', '__next__', '_finish', '_caller',
+    '__enter__', '__exit__', '_acquire', '_release',
+}
+
+PROFILE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS query_samples (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        method TEXT NOT NULL,
+        statement TEXT NOT NULL,
+        duration_ms REAL NOT NULL,
+        rows INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_query_samples_method ON query_samples(method)",
+    """
+    CREATE TABLE IF NOT EXISTS slow_queries (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        method TEXT NOT NULL,
+        statement TEXT NOT NULL,
+        params TEXT,
+        duration_ms REAL NOT NULL,
+        rows INTEGER NOT NULL,
+        query_plan TEXT
+    )
+    """,
+]
+
+
+def profile_path_for(db_path: str) -> str:
+    """Sidecar database the profiler writes to (keeps samples out of the main db)."""
+    return os.path.splitext(db_path)[0] + '_profile.db'
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+class QueryProfiler:
+    """
+    Records latency and row counts for every statement run through JettDB.
+
+    Samples are attributed to the JettDB method (or outside function) that ran
+    them, buffered, and flushed to a sidecar SQLite database. Statements slower
+    than slow_query_ms are also stored with their EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self, path: str, slow_query_ms: float = SLOW_QUERY_MS):
+        self.path = path
+        self.slow_query_ms = slow_query_ms
+        self._samples: List[Tuple] = []
+        self._slow: List[Tuple] = []
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _caller(self) -> str:
+        """Name of the JettDB method, or outside function, running the statement."""
+        frame = sys._getframe(2)
+        private = None
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename != __file__:
+                if private:
+                    return private
+                return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+            if code.co_name not in _PROFILE_PLUMBING:
+                if not code.co_name.startswith('_'):
+                    return code.co_name
+                private = private or code.co_name
+            frame = frame.f_back
+        return private or '<unknown>'
+
+    def record(self, conn: sqlite3.Connection, method: str, sql: str, params: Any,
+               duration_ms: float, rows: int):
+        """Buffer one finished statement, capturing the plan if it was slow."""
+        now = datetime.now().isoformat()
+        statement = ' '.join(sql.split())
+        slow = None
+        if duration_ms >= self.slow_query_ms and not statement.upper().startswith(('EXPLAIN', 'PRAGMA')):
+            slow = (now, method, statement, json.dumps(params, default=str) if params else None,
+                    duration_ms, rows, self._explain(conn, sql, params))
+
+        with self._lock:
+            self._samples.append((now, method, statement, duration_ms, rows))
+            if slow:
+                self._slow.append(slow)
+            full = len(self._samples) >= PROFILE_FLUSH_EVERY
+        if full:
+            self.flush()
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str, params: Any) -> Optional[str]:
+        """EXPLAIN QUERY PLAN for sql, one step per line (None if it can't be planned)."""
+        try:
+            steps = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+        except sqlite3.Error:
+            return None
+        return '\n'.join(step[-1] for step in steps)
+
+    def flush(self):
+        """Write buffered samples to the profile database."""
+        with self._lock:
+            samples, self._samples = self._samples, []
+            slow, self._slow = self._slow, []
+        if not samples and not slow:
+            return
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._schema_ready:
+                for statement in PROFILE_SCHEMA:
+                    conn.execute(statement)
+                self._schema_ready = True
+            conn.executemany(
+                "INSERT INTO query_samples (timestamp, method, statement, duration_ms, rows) "
+                "VALUES (?, ?, ?, ?, ?)", samples
+            )
+            conn.executemany(
+                "INSERT INTO slow_queries (timestamp, method, statement, params, duration_ms, rows, query_plan) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", slow
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class _ProfiledCursor:
+    """Cursor proxy timing execute and fetch calls for the statement it ran."""
+
+    def __init__(self, profiler: QueryProfiler, conn: sqlite3.Connection, cursor: sqlite3.Cursor):
+        self._profiler = profiler
+        self._conn = conn
+        self._cursor = cursor
+        self._statement = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _finish(self):
+        """Record the statement this cursor last ran, once its rows are consumed."""
+        if self._statement is None:
+            return
+        method, sql, params, elapsed, rows = self._statement
+        self._statement = None
+        if rows == 0 and self._cursor.rowcount > 0:
+            rows = self._cursor.rowcount  # INSERT/UPDATE/DELETE
+        self._profiler.record(self._conn, method, sql, params, elapsed * 1000, rows)
+
+    def _run(self, run, sql, params):
+        self._finish()
+        method = self._profiler._caller()
+        start = time.perf_counter()
+        try:
+            run()
+        finally:
+            self._statement = [method, sql, params, time.perf_counter() - start, 0]
+        return self
+
+    def execute(self, sql, params=()):
+        return self._run(lambda: self._cursor.execute(sql, params), sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        return self._run(lambda: self._cursor.executemany(sql, seq_of_params), sql,
+                         seq_of_params[0] if seq_of_params else None)
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        result = fetch(*args)
+        if self._statement is not None:
+            self._statement[3] += time.perf_counter() - start
+            if isinstance(result, list):
+                self._statement[4] += len(result)
+            elif result is not None:
+                self._statement[4] += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._cursor.fetchmany, size or self._cursor.arraysize)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+
+class _ProfiledConnection:
+    """Connection proxy handing out profiled cursors; everything else passes through."""
+
+    def __init__(self, profiler: QueryProfiler, conn: sqlite3.Connection):
+        self._profiler = profiler
+        self._conn = conn
+        self._cursors: List[_ProfiledCursor] = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._conn, name, value)
+
+    def cursor(self, *args):
+        cursor = _ProfiledCursor(self._profiler, self._conn, self._conn.cursor(*args))
+        self._cursors.append(cursor)
+        return cursor
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def finish(self):
+        """Record statements whose cursors were never closed or fully drained."""
+        for cursor in self._cursors:
+            cursor._finish()
+        self._cursors = []
+
+
+# Rows fetched per keyset page by the iter_* methods
+ITER_BATCH_SIZE = 500
+
+# Row shapes the iter_* methods can yield
+ROW_FORMATS = ('dict', 'tuple', 'record')
+
+
+class Record:
+    """
+    Lightweight read-only row with attribute access.
+
+    Concrete classes are built per table/column set by _record_class(), with
+    one __slots__ entry per column, so rows carry no per-instance __dict__.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, values: Iterable[Any]):
+        for slot, value in zip(self.__slots__, values):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def _asdict(self) -> Dict[str, Any]:
+        """Row as a dict keyed by column name (decoded like the dict rows)."""
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class ResearchRecord(Record):
+    """Research row whose sources/tags are decoded only when accessed."""
+    __slots__ = ()
+
+    @property
+    def sources(self) -> Optional[List[str]]:
+        return json.loads(self._sources) if self._sources else self._sources
+
+    @property
+    def tags(self) -> Optional[List[str]]:
+        return self._tags.split(',') if self._tags else self._tags
+
+
+_record_classes: Dict[Tuple[str, Tuple[str, ...]], type] = {}
+
+
+def _record_class(table: str, columns: Tuple[str, ...]) -> type:
+    """Slotted Record subclass for a table's column list (cached)."""
+    cls = _record_classes.get((table, columns))
+    if cls is None:
+        base = ResearchRecord if table == 'research_findings' else Record
+        lazy = {'sources', 'tags'} if base is ResearchRecord else set()
+        slots = tuple(f"_{col}" if col in lazy else col for col in columns)
+        name = ''.join(part.title() for part in table.split('_')) + 'Record'
+        cls = type(name, (base,), {'__slots__': slots, '_fields': columns})
+        _record_classes[(table, columns)] = cls
+    return cls
+
+
+def _decode_research(result: Dict) -> Dict:
+    """Parse the JSON sources and comma-separated tags of a research row."""
+    if result['sources']:
+        result['sources'] = json.loads(result['sources'])
+    if result['tags']:
+        result['tags'] = result['tags'].split(',')
+    return result
+
+
+def normalize_topic(topic: str) -> str:
+    """Strip priority suffixes so "X - HIGH" and "X - LOW" dedupe as the same topic."""
+    for suffix in TOPIC_PRIORITY_SUFFIXES:
+        topic = topic.replace(suffix, '')
+    return topic
+
+
+def _topic_key_expr(column: str = 'topic') -> str:
+    """SQL expression equivalent to normalize_topic() applied to column."""
+    expr = column
+    for suffix in TOPIC_PRIORITY_SUFFIXES:
+        expr = f"REPLACE({expr}, '{suffix}', '')"
+    return expr
+
+
+def _chunks(items: List, size: int = SQL_PARAM_CHUNK):
+    """Yield successive slices of items no longer than size."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 
 class JettDB:
     """Main database interface for Jett's knowledge base."""
 
-    def __init__(self, db_path: str = DB_PATH):
-        """Initialize database connection."""
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        pooled: bool = False,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = 60.0,
+        profile: Optional[bool] = None
+    ):
+        """
+        Initialize database connection.
+
+        Args:
+            db_path: Path to the SQLite database
+            pooled: Keep one long-lived, tuned connection per thread instead of
+                opening a new connection for every call
+            cache_size: Cache up to this many read results in memory (0 = off)
+            cache_ttl: Seconds a cached read stays valid (None = until a write)
+            profile: Record per-statement timings (default: JETT_DB_PROFILE env var)
+        """
         self.db_path = db_path
+        self.pooled = pooled
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool: List[sqlite3.Connection] = []
+        self._fts_cache: Optional[set] = None
+        self._topic_key_cache: Optional[str] = None
+        self._stats_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache: Optional[QueryCache] = None
+        if cache_size:
+            self.enable_cache(cache_size, cache_ttl)
+        self._profiler: Optional[QueryProfiler] = None
+        if profile if profile is not None else os.environ.get('JETT_DB_PROFILE') == '1':
+            self.enable_profiling()
         self._ensure_db_exists()
 
     def _ensure_db_exists(self):
@@ -28,20 +606,162 @@ class JettDB:
         if not os.path.exists(self.db_path):
             print(f"Database not found at {self.db_path}")
             print("Run: python init_db.py to create the database")
+            print("     (python schema_migrations.py upgrades an existing one)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection, applying pool pragmas when pooled."""
+        # Pooled connections are only used by the thread that opened them, but
+        # close() may run elsewhere, so the same-thread check is relaxed for them
+        conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                               check_same_thread=not self.pooled)
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        if self.pooled:
+            for pragma, value in POOL_PRAGMAS.items():
+                conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Get this thread's pooled connection, or a fresh one when not pooled."""
+        if not self.pooled:
+            return self._connect()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._pool_lock:
+                self._pool.append(conn)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection obtained from _acquire()."""
+        if not self.pooled:
+            conn.close()
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        """
+        Context manager for database connections.
+
+        Commits on success and rolls back on error. Inside transaction() the
+        shared connection is yielded and the commit is left to the transaction.
+        """
+        tx_conn = getattr(self._local, 'tx_conn', None)
+        if tx_conn is not None:
+            yield tx_conn
+            return
+
+        conn = self._acquire()
+        changes = conn.total_changes
+        handle = self._profiled(conn)
+        try:
+            yield handle
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            if handle is not conn:
+                handle.finish()
+            self._invalidate_raw_writes(conn, changes)
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several JettDB calls in a single transaction with one commit.
+
+        Usage:
+            with db.transaction():
+                db.add_research(...)
+                db.add_content_idea(...)
+
+        Nested transaction() blocks join the outermost one.
+        """
+        if getattr(self._local, 'tx_conn', None) is not None:
+            yield self._local.tx_conn
+            return
+
+        conn = self._acquire()
+        changes = conn.total_changes
+        handle = self._profiled(conn)
+        self._local.tx_conn = handle
         try:
-            yield conn
+            yield handle
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise e
         finally:
+            self._local.tx_conn = None
+            if handle is not conn:
+                handle.finish()
+            # Reads inside the transaction may have cached uncommitted rows
+            if self._cache is not None and conn.total_changes != changes:
+                self._cache.bump()
+            self._release(conn)
+
+    def _invalidate_raw_writes(self, conn: sqlite3.Connection, changes_before: int):
+        """
+        Invalidate the whole cache after writes made directly through
+        get_connection() (e.g. by scripts), since their tables are unknown.
+        """
+        if (self._cache is not None and conn.total_changes != changes_before
+                and not getattr(self._local, 'declared_write', False)):
+            self._cache.bump()
+
+    def enable_cache(self, max_entries: int = 256, ttl: Optional[float] = 60.0) -> QueryCache:
+        """
+        Turn on the in-memory read cache.
+
+        Read methods are served from memory until a write through this JettDB
+        touches a table they read, or ttl seconds pass. Writes by other
+        processes are only picked up when ttl expires.
+        """
+        self._cache = QueryCache(max_entries, ttl)
+        return self._cache
+
+    def disable_cache(self):
+        """Turn off the read cache and drop its entries."""
+        self._cache = None
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Read cache hit/miss/eviction metrics ({} when the cache is off)."""
+        return self._cache.metrics() if self._cache is not None else {}
+
+    def _profiled(self, conn: sqlite3.Connection):
+        """Wrap conn so its statements are timed when profiling is on."""
+        if self._profiler is None:
+            return conn
+        return _ProfiledConnection(self._profiler, conn)
+
+    def enable_profiling(self, slow_query_ms: float = SLOW_QUERY_MS,
+                         path: Optional[str] = None) -> QueryProfiler:
+        """
+        Record latency, rows and calling method for every statement.
+
+        Samples go to a sidecar database (default: <db>_profile.db); statements
+        slower than slow_query_ms are also logged with their query plan.
+        """
+        if self._profiler is None:
+            self._profiler = QueryProfiler(path or profile_path_for(self.db_path), slow_query_ms)
+            atexit.register(self._profiler.flush)
+        return self._profiler
+
+    def disable_profiling(self):
+        """Stop profiling and write out any buffered samples."""
+        profiler, self._profiler = self._profiler, None
+        if profiler is not None:
+            profiler.flush()
+
+    def close(self):
+        """Close all pooled connections held by this instance."""
+        if self._profiler is not None:
+            self._profiler.flush()
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for conn in pool:
             conn.close()
+        self._local = threading.local()
 
     def _row_to_dict(self, row) -> Dict:
         """Convert sqlite3.Row to dictionary."""
@@ -53,8 +773,205 @@ class JettDB:
         """Convert list of sqlite3.Row to list of dictionaries."""
         return [dict(row) for row in rows]
 
+    def _bulk_upsert(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        columns: Tuple[str, ...],
+        rows: List[Tuple],
+        keys: List[Any],
+        existing: Dict[Any, int],
+        on_conflict: str,
+        keep_on_update: Tuple[str, ...] = ('created_date',)
+    ) -> List[Optional[int]]:
+        """
+        Insert rows with executemany, resolving key conflicts per on_conflict.
+
+        Args:
+            conn: Connection with the write transaction open
+            table: Target table
+            columns: Column names matching each row tuple
+            rows: Row values in input order
+            keys: Conflict key of each row
+            existing: Conflict key -> id of rows already in the table
+            on_conflict: One of CONFLICT_POLICIES
+            keep_on_update: Columns left untouched when an existing row is updated
+
+        Returns:
+            Row id for each input row (None for skipped rows)
+        """
+        if on_conflict == 'fail':
+            clashes = [key for key in keys if key in existing]
+            if clashes or len(set(keys)) != len(keys):
+                raise sqlite3.IntegrityError(
+                    f"{len(clashes) or 'Duplicate'} {table} rows already exist "
+                    f"(first: {clashes[0] if clashes else keys[0]!r})"
+                )
+
+        ids: List[Optional[int]] = [None] * len(rows)
+        first_in_batch: Dict[Any, int] = {}
+        insert_positions = []
+        update_positions = []
+        for pos, key in enumerate(keys):
+            if key in existing:
+                ids[pos] = existing[key]
+                update_positions.append(pos)
+            elif key in first_in_batch:
+                # Later copy of a key earlier in this batch; resolved after the insert
+                update_positions.append(pos)
+            else:
+                first_in_batch[key] = pos
+                insert_positions.append(pos)
+
+        if insert_positions:
+            placeholders = ', '.join('?' for _ in columns)
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                [rows[pos] for pos in insert_positions]
+            )
+            # AUTOINCREMENT ids are consecutive while we hold the write lock
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - len(insert_positions) + 1
+            for offset, pos in enumerate(insert_positions):
+                ids[pos] = first_id + offset
+
+        if on_conflict == 'skip':
+            for pos in update_positions:
+                ids[pos] = None
+        elif update_positions:
+            for pos in update_positions:
+                if ids[pos] is None:
+                    ids[pos] = ids[first_in_batch[keys[pos]]]
+            updated = [i for i, col in enumerate(columns) if col not in keep_on_update]
+            assignments = ', '.join(f"{columns[i]} = ?" for i in updated)
+            conn.executemany(
+                f"UPDATE {table} SET {assignments} WHERE id = ?",
+                [tuple(rows[pos][i] for i in updated) + (ids[pos],) for pos in update_positions]
+            )
+
+        return ids
+
+    def _cached_stats(self, name: str, max_age: Optional[float], compute) -> Dict[str, Any]:
+        """Return stats computed within the last max_age seconds, else recompute."""
+        if max_age is not None:
+            cached = self._stats_cache.get(name)
+            if cached and time.monotonic() - cached[0] <= max_age:
+                return dict(cached[1])
+        stats = compute()
+        self._stats_cache[name] = (time.monotonic(), stats)
+        return dict(stats)
+
+    def _fts_tables(self, conn: sqlite3.Connection) -> set:
+        """Names of FTS tables present in the database (cached per instance)."""
+        if self._fts_cache is None:
+            cursor = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%\\_fts' ESCAPE '\\'"
+            )
+            self._fts_cache = {row['name'] for row in cursor}
+        return self._fts_cache
+
+    def _topic_key(self, conn: sqlite3.Connection) -> str:
+        """
+        SQL for a content row's normalized topic: the indexed topic_key column
+        when the database has it, otherwise the equivalent REPLACE() expression.
+        """
+        if self._topic_key_cache is None:
+            columns = {row['name'] for row in conn.execute("PRAGMA table_xinfo(content_ideas)")}
+            self._topic_key_cache = 'topic_key' if 'topic_key' in columns else _topic_key_expr()
+        return self._topic_key_cache
+
+    def _keyword_filter(
+        self,
+        conn: sqlite3.Connection,
+        source: str,
+        keyword: str,
+        like_columns: List[str]
+    ) -> Tuple[str, List[Any]]:
+        """
+        SQL condition + params matching keyword against a table's text columns.
+
+        Uses the FTS5 index when it exists, otherwise falls back to LIKE scans.
+        """
+        _, fts, _, _ = FTS_SOURCES[source]
+        match = fts_query(keyword)
+        if match and fts in self._fts_tables(conn):
+            column_filter = '{' + ' '.join(like_columns) + '}'
+            return (f" AND id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)",
+                    [f"{column_filter} : {match}"])
+
+        pattern = f"%{keyword}%"
+        clause = " OR ".join(f"LOWER({col}) LIKE LOWER(?)" for col in like_columns)
+        return f" AND ({clause})", [pattern] * len(like_columns)
+
+    @_cached('athletes', 'content_ideas', 'research_findings')
+    def search_ranked(
+        self,
+        source: str,
+        query: str,
+        limit: int = 10,
+        category: Optional[str] = None,
+        prefix: bool = True,
+        raw_query: bool = False,
+        highlight: Tuple[str, str] = ('[', ']'),
+        snippet_tokens: int = 16
+    ) -> List[Dict]:
+        """
+        Full-text search ranked by BM25, with snippets for prompt building.
+
+        Args:
+            source: 'athletes', 'content', or 'research'
+            query: Words to search for (or an FTS5 expression if raw_query)
+            limit: Max results (top-N by relevance)
+            category: Filter content/research by category
+            prefix: Treat the last word as a prefix
+            raw_query: Pass query to FTS5 MATCH as-is (AND/OR/NEAR, column filters)
+            highlight: Open/close markers placed around matched terms
+            snippet_tokens: Approximate snippet length in tokens (max 64)
+
+        Returns:
+            Matching rows, best first, each with extra keys:
+                - rank: BM25 score (lower = more relevant)
+                - snippet: Best-matching fragment with highlighted terms
+                - highlighted: First indexed column (name/topic) with highlighted terms
+        """
+        table, fts, _, weights = FTS_SOURCES[source]
+        match = query if raw_query else fts_query(query, prefix=prefix)
+        if not match:
+            return []
+
+        open_mark, close_mark = highlight
+        weight_args = ', '.join(str(w) for w in weights)
+        sql = f"""
+            SELECT t.*,
+                   bm25({fts}, {weight_args}) AS rank,
+                   snippet({fts}, -1, ?, ?, '...', ?) AS snippet,
+                   highlight({fts}, 0, ?, ?) AS highlighted
+            FROM {fts}
+            JOIN {table} t ON t.id = {fts}.rowid
+            WHERE {fts} MATCH ?
+        """
+        params: List[Any] = [open_mark, close_mark, min(snippet_tokens, 64),
+                             open_mark, close_mark, match]
+
+        if category and source != 'athletes':
+            sql += " AND t.category = ?"
+            params.append(category)
+
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            results = self._rows_to_dicts(cursor.fetchall())
+
+        if source == 'research':
+            results = [_decode_research(result) for result in results]
+        return results
+
     # ==================== ATHLETES ====================
 
+    @_invalidates('athletes')
     def add_athlete(
         self,
         name: str,
@@ -98,6 +1015,7 @@ class JettDB:
             ))
             return cursor.lastrowid
 
+    @_cached('athletes')
     def get_athlete(self, name: str) -> Optional[Dict]:
         """
         Get athlete by name.
@@ -117,6 +1035,7 @@ class JettDB:
             row = cursor.fetchone()
             return self._row_to_dict(row)
 
+    @_cached('athletes')
     def search_athletes(
         self,
         sport: Optional[str] = None,
@@ -163,18 +1082,20 @@ class JettDB:
             query += " AND contract_value <= ?"
             params.append(max_value)
 
-        if keyword:
-            query += " AND (LOWER(name) LIKE LOWER(?) OR LOWER(key_details) LIKE LOWER(?) OR LOWER(analysis_notes) LIKE LOWER(?))"
-            keyword_pattern = f"%{keyword}%"
-            params.extend([keyword_pattern, keyword_pattern, keyword_pattern])
+        with self.get_connection() as conn:
+            if keyword:
+                clause, keyword_params = self._keyword_filter(
+                    conn, 'athletes', keyword, ['name', 'key_details', 'analysis_notes'])
+                query += clause
+                params.extend(keyword_params)
 
-        query += " ORDER BY contract_value DESC"
+            query += " ORDER BY contract_value DESC"
 
-        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_invalidates('athletes')
     def update_athlete(self, name: str, **kwargs) -> bool:
         """
         Update athlete information.
@@ -213,6 +1134,7 @@ class JettDB:
             cursor.execute(query, values)
             return cursor.rowcount > 0
 
+    @_cached('athletes')
     def get_all_athletes(self, order_by: str = "contract_value DESC") -> List[Dict]:
         """Get all athletes, ordered by specified field."""
         with self.get_connection() as conn:
@@ -222,6 +1144,7 @@ class JettDB:
 
     # ==================== CONTENT IDEAS ====================
 
+    @_cached('content_ideas')
     def topic_exists(self, topic: str) -> bool:
         """
         Check if a topic already exists in the database.
@@ -234,17 +1157,78 @@ class JettDB:
             True if topic exists, False otherwise
         """
         # Normalize topic by removing priority suffixes
-        normalized_topic = topic.replace(' - LOW', '').replace(' - HIGH', '').replace(' - MEDIUM', '')
+        normalized_topic = normalize_topic(topic)
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM content_ideas
-                WHERE REPLACE(REPLACE(REPLACE(topic, ' - LOW', ''), ' - HIGH', ''), ' - MEDIUM', '') = ?
+            cursor.execute(f"""
+                SELECT EXISTS(
+                    SELECT 1 FROM content_ideas WHERE {self._topic_key(conn)} = ?
+                ) as found
             """, (normalized_topic,))
-            result = cursor.fetchone()
-            return result['count'] > 0
+            return bool(cursor.fetchone()['found'])
+
+    def topics_exist(self, topics: Iterable[str]) -> Dict[str, bool]:
+        """
+        Batch version of topic_exists().
+
+        Args:
+            topics: Topics to check
+
+        Returns:
+            Dict mapping each input topic to True if it (normalized) exists
+        """
+        topics = list(topics)
+        keys = {normalize_topic(topic) for topic in topics}
+        found = set()
+
+        with self.get_connection() as conn:
+            topic_key = self._topic_key(conn)
+            for chunk in _chunks(sorted(keys)):
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor = conn.execute(f"""
+                    SELECT DISTINCT {topic_key} as topic_key FROM content_ideas
+                    WHERE {topic_key} IN ({placeholders})
+                """, chunk)
+                found.update(row['topic_key'] for row in cursor)
+
+        return {topic: normalize_topic(topic) in found for topic in topics}
+
+    @_cached('content_ideas')
+    def get_duplicate_topics(self, statuses: Iterable[str] = ('draft', 'published')) -> Dict[str, List[Dict]]:
+        """
+        Find content ideas that share a normalized topic.
+
+        Args:
+            statuses: Only consider content with these statuses
+
+        Returns:
+            Dict mapping normalized topic -> its content rows (2 or more each)
+        """
+        statuses = list(statuses)
+        status_placeholders = ', '.join('?' for _ in statuses)
+
+        with self.get_connection() as conn:
+            topic_key = self._topic_key(conn)
+            cursor = conn.execute(f"""
+                SELECT id, topic, status, quality_score, created_date, published_date,
+                       category, {topic_key} as topic_key
+                FROM content_ideas
+                WHERE status IN ({status_placeholders})
+                AND {topic_key} IN (
+                    SELECT {topic_key} FROM content_ideas
+                    WHERE status IN ({status_placeholders})
+                    GROUP BY {topic_key} HAVING COUNT(*) > 1
+                )
+                ORDER BY topic_key, quality_score DESC, created_date ASC
+            """, statuses + statuses)
+
+            duplicates: Dict[str, List[Dict]] = {}
+            for row in cursor:
+                duplicates.setdefault(row['topic_key'], []).append(dict(row))
+            return duplicates
 
+    @_invalidates('content_ideas')
     def add_content_idea(
         self,
         topic: str,
@@ -287,6 +1271,61 @@ class JettDB:
             """, (topic, category, content, status, scheduled_date, platform, quality_score, source, datetime.now().isoformat()))
             return cursor.lastrowid
 
+    @_invalidates('content_ideas')
+    def add_content_ideas_many(
+        self,
+        ideas: Iterable[Dict[str, Any]],
+        on_conflict: str = 'skip'
+    ) -> List[Optional[int]]:
+        """
+        Add many content ideas in a single transaction.
+
+        Args:
+            ideas: Dicts with the add_content_idea() arguments (topic, category,
+                content, and optionally status, scheduled_date, platform,
+                quality_score, source)
+            on_conflict: What to do when the normalized topic already exists:
+                'skip' (default), 'update' (keeps status and created_date),
+                or 'fail' (raise sqlite3.IntegrityError, nothing written)
+
+        Returns:
+            Row id for each idea, in input order (None where skipped)
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"on_conflict must be one of {CONFLICT_POLICIES}, got {on_conflict!r}")
+
+        columns = ('topic', 'category', 'content', 'status', 'scheduled_date',
+                   'platform', 'quality_score', 'source', 'created_date')
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                idea['topic'], idea['category'], idea['content'],
+                idea.get('status', 'draft'), idea.get('scheduled_date'),
+                idea.get('platform'), idea.get('quality_score', 7),
+                idea.get('source'), now
+            )
+            for idea in ideas
+        ]
+        if not rows:
+            return []
+        keys = [normalize_topic(row[0]) for row in rows]
+
+        with self.get_connection() as conn:
+            topic_key = self._topic_key(conn)
+            existing = {}
+            for chunk in _chunks(sorted(set(keys))):
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor = conn.execute(f"""
+                    SELECT MAX(id) as id, {topic_key} as topic_key
+                    FROM content_ideas
+                    WHERE {topic_key} IN ({placeholders})
+                    GROUP BY {topic_key}
+                """, chunk)
+                existing.update({row['topic_key']: row['id'] for row in cursor})
+            return self._bulk_upsert(conn, 'content_ideas', columns, rows, keys, existing,
+                                     on_conflict, keep_on_update=('created_date', 'status'))
+
+    @_cached('content_ideas')
     def get_content_idea(self, content_id: int) -> Optional[Dict]:
         """Get content idea by ID."""
         with self.get_connection() as conn:
@@ -294,6 +1333,7 @@ class JettDB:
             cursor.execute("SELECT * FROM content_ideas WHERE id = ?", (content_id,))
             return self._row_to_dict(cursor.fetchone())
 
+    @_cached('content_ideas')
     def get_content_by_status(self, status: str, limit: Optional[int] = None) -> List[Dict]:
         """Get content ideas with specified status, optionally sorted by quality score."""
         with self.get_connection() as conn:
@@ -304,6 +1344,7 @@ class JettDB:
             cursor.execute(query, (status,))
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_cached('content_ideas')
     def get_content_by_category(
         self,
         category: str,
@@ -343,6 +1384,7 @@ class JettDB:
             cursor.execute(query, (status_pattern, category_pattern, min_quality))
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_cached('content_ideas')
     def get_pending_content(self) -> List[Dict]:
         """Get all pending (draft + scheduled) content."""
         with self.get_connection() as conn:
@@ -354,6 +1396,7 @@ class JettDB:
             """)
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_invalidates('content_ideas')
     def mark_content_published(self, content_id: int) -> bool:
         """Mark content as published."""
         with self.get_connection() as conn:
@@ -365,6 +1408,7 @@ class JettDB:
             """, (datetime.now().isoformat(), content_id))
             return cursor.rowcount > 0
 
+    @_cached('content_ideas')
     def search_content(
         self,
         category: Optional[str] = None,
@@ -383,20 +1427,22 @@ class JettDB:
             query += " AND platform = ?"
             params.append(platform)
 
-        if keyword:
-            query += " AND (LOWER(topic) LIKE LOWER(?) OR LOWER(content) LIKE LOWER(?))"
-            keyword_pattern = f"%{keyword}%"
-            params.extend([keyword_pattern, keyword_pattern])
+        with self.get_connection() as conn:
+            if keyword:
+                clause, keyword_params = self._keyword_filter(
+                    conn, 'content', keyword, ['topic', 'content'])
+                query += clause
+                params.extend(keyword_params)
 
-        query += " ORDER BY created_date DESC"
+            query += " ORDER BY created_date DESC"
 
-        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
             return self._rows_to_dicts(cursor.fetchall())
 
     # ==================== RESEARCH FINDINGS ====================
 
+    @_invalidates('research_findings')
     def add_research(
         self,
         topic: str,
@@ -430,6 +1476,56 @@ class JettDB:
             """, (topic, category, findings, sources_json, tags_str, datetime.now().isoformat()))
             return cursor.lastrowid
 
+    @_invalidates('research_findings')
+    def add_research_many(
+        self,
+        records: Iterable[Dict[str, Any]],
+        on_conflict: str = 'skip'
+    ) -> List[Optional[int]]:
+        """
+        Add many research findings in a single transaction.
+
+        Args:
+            records: Dicts with the add_research() arguments (topic, category,
+                findings, and optionally sources and tags as lists)
+            on_conflict: What to do when a (topic, category) pair already exists:
+                'skip' (default), 'update' (keeps created_date), or 'fail'
+                (raise sqlite3.IntegrityError, nothing written)
+
+        Returns:
+            Row id for each record, in input order (None where skipped)
+        """
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(f"on_conflict must be one of {CONFLICT_POLICIES}, got {on_conflict!r}")
+
+        columns = ('topic', 'category', 'findings', 'sources', 'tags', 'created_date')
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                record['topic'], record['category'], record['findings'],
+                json.dumps(record['sources']) if record.get('sources') else None,
+                ",".join(record['tags']) if record.get('tags') else None,
+                now
+            )
+            for record in records
+        ]
+        if not rows:
+            return []
+        keys = [(row[0], row[1]) for row in rows]
+
+        with self.get_connection() as conn:
+            existing = {}
+            for chunk in _chunks(sorted({topic for topic, _ in keys})):
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor = conn.execute(f"""
+                    SELECT MAX(id) as id, topic, category FROM research_findings
+                    WHERE topic IN ({placeholders})
+                    GROUP BY topic, category
+                """, chunk)
+                existing.update({(row['topic'], row['category']): row['id'] for row in cursor})
+            return self._bulk_upsert(conn, 'research_findings', columns, rows, keys, existing, on_conflict)
+
+    @_cached('research_findings')
     def get_research(self, research_id: int) -> Optional[Dict]:
         """Get research by ID."""
         with self.get_connection() as conn:
@@ -437,16 +1533,11 @@ class JettDB:
             cursor.execute("SELECT * FROM research_findings WHERE id = ?", (research_id,))
             row = cursor.fetchone()
             if row:
-                result = self._row_to_dict(row)
-                # Parse JSON sources
-                if result['sources']:
-                    result['sources'] = json.loads(result['sources'])
-                # Parse tags
-                if result['tags']:
-                    result['tags'] = result['tags'].split(',')
-                return result
+                # Parse JSON sources and tags
+                return _decode_research(self._row_to_dict(row))
             return None
 
+    @_cached('research_findings')
     def search_research(
         self,
         query: Optional[str] = None,
@@ -467,11 +1558,6 @@ class JettDB:
         sql = "SELECT * FROM research_findings WHERE 1=1"
         params = []
 
-        if query:
-            sql += " AND (LOWER(topic) LIKE LOWER(?) OR LOWER(findings) LIKE LOWER(?))"
-            query_pattern = f"%{query}%"
-            params.extend([query_pattern, query_pattern])
-
         if category:
             sql += " AND category = ?"
             params.append(category)
@@ -480,24 +1566,23 @@ class JettDB:
             sql += " AND tags LIKE ?"
             params.append(f"%{tag}%")
 
-        sql += " ORDER BY created_date DESC"
-
         with self.get_connection() as conn:
+            if query:
+                clause, query_params = self._keyword_filter(
+                    conn, 'research', query, ['topic', 'findings'])
+                sql += clause
+                params.extend(query_params)
+
+            sql += " ORDER BY created_date DESC"
+
             cursor = conn.cursor()
             cursor.execute(sql, params)
-            results = self._rows_to_dicts(cursor.fetchall())
-
             # Parse JSON and tags for each result
-            for result in results:
-                if result['sources']:
-                    result['sources'] = json.loads(result['sources'])
-                if result['tags']:
-                    result['tags'] = result['tags'].split(',')
-
-            return results
+            return [_decode_research(result) for result in self._rows_to_dicts(cursor.fetchall())]
 
     # ==================== TASKS ====================
 
+    @_invalidates('tasks')
     def add_task(
         self,
         description: str,
@@ -526,6 +1611,7 @@ class JettDB:
             """, (description, category, priority, notes, datetime.now().isoformat()))
             return cursor.lastrowid
 
+    @_cached('tasks')
     def get_task(self, task_id: int) -> Optional[Dict]:
         """Get task by ID."""
         with self.get_connection() as conn:
@@ -533,6 +1619,7 @@ class JettDB:
             cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
             return self._row_to_dict(cursor.fetchone())
 
+    @_cached('tasks')
     def get_tasks_by_status(self, status: str) -> List[Dict]:
         """Get all tasks with specified status."""
         with self.get_connection() as conn:
@@ -543,6 +1630,7 @@ class JettDB:
             )
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_cached('tasks')
     def get_tasks_by_priority(self, priority: str) -> List[Dict]:
         """Get all tasks with specified priority."""
         with self.get_connection() as conn:
@@ -553,6 +1641,7 @@ class JettDB:
             )
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_invalidates('tasks')
     def update_task_status(self, task_id: int, status: str) -> bool:
         """
         Update task status.
@@ -582,6 +1671,7 @@ class JettDB:
                 )
             return cursor.rowcount > 0
 
+    @_cached('tasks')
     def search_tasks(
         self,
         category: Optional[str] = None,
@@ -613,6 +1703,7 @@ class JettDB:
 
     # ==================== EBAY DEALS ====================
 
+    @_invalidates('ebay_deals')
     def add_ebay_deal(
         self,
         card_name: str,
@@ -664,6 +1755,7 @@ class JettDB:
             ))
             return cursor.lastrowid
 
+    @_cached('ebay_deals')
     def get_deals_by_score(self, min_score: float = 70.0) -> List[Dict]:
         """
         Get deals with score above threshold.
@@ -683,6 +1775,7 @@ class JettDB:
             """, (min_score,))
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_cached('ebay_deals')
     def get_recent_deals(self, days: int = 7, status: Optional[str] = None) -> List[Dict]:
         """
         Get deals found in the last N days.
@@ -711,6 +1804,7 @@ class JettDB:
             cursor.execute(query, params)
             return self._rows_to_dicts(cursor.fetchall())
 
+    @_invalidates('ebay_deals')
     def mark_deal_purchased(self, deal_id: int, notes: Optional[str] = None) -> bool:
         """
         Mark a deal as purchased.
@@ -738,6 +1832,7 @@ class JettDB:
                 """, (deal_id,))
             return cursor.rowcount > 0
 
+    @_invalidates('ebay_deals')
     def mark_deal_skipped(self, deal_id: int, reason: Optional[str] = None) -> bool:
         """
         Mark a deal as skipped.
@@ -765,6 +1860,7 @@ class JettDB:
                 """, (deal_id,))
             return cursor.rowcount > 0
 
+    @_cached('ebay_deals')
     def get_ebay_deal(self, deal_id: int) -> Optional[Dict]:
         """Get eBay deal by ID."""
         with self.get_connection() as conn:
@@ -772,6 +1868,7 @@ class JettDB:
             cursor.execute("SELECT * FROM ebay_deals WHERE id = ?", (deal_id,))
             return self._row_to_dict(cursor.fetchone())
 
+    @_cached('ebay_deals')
     def search_ebay_deals(
         self,
         card_name: Optional[str] = None,
@@ -817,110 +1914,448 @@ class JettDB:
             cursor.execute(query, params)
             return self._rows_to_dicts(cursor.fetchall())
 
-    def get_deal_stats(self) -> Dict[str, Any]:
+    @_cached('ebay_deals')
+    def get_deal_stats(self, max_age: Optional[float] = None) -> Dict[str, Any]:
         """
         Get eBay deals statistics.
 
+        Args:
+            max_age: Reuse stats computed within this many seconds (default: always fresh)
+
         Returns:
             Dictionary with deal stats
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-
-            stats = {}
-
-            # Total deals
-            cursor.execute("SELECT COUNT(*) as count FROM ebay_deals")
-            stats['total_deals'] = cursor.fetchone()['count']
-
-            # By status
-            cursor.execute("SELECT status, COUNT(*) as count FROM ebay_deals GROUP BY status")
-            stats['by_status'] = {row['status']: row['count'] for row in cursor.fetchall()}
+        return self._cached_stats('deals', max_age, self._compute_deal_stats)
 
-            # New deals with high scores
-            cursor.execute("SELECT COUNT(*) as count FROM ebay_deals WHERE status = 'new' AND deal_score >= 70")
-            stats['hot_deals'] = cursor.fetchone()['count']
-
-            # Average deal score
-            cursor.execute("SELECT AVG(deal_score) as avg FROM ebay_deals WHERE status = 'new'")
-            avg_row = cursor.fetchone()
-            stats['avg_deal_score'] = round(avg_row['avg'], 2) if avg_row['avg'] else 0
+    def _compute_deal_stats(self) -> Dict[str, Any]:
+        """All deal counters in one grouped pass over ebay_deals."""
+        from datetime import timedelta
+        cutoff = (datetime.now() - timedelta(days=7)).isoformat()
 
-            # Total potential savings
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute("""
-                SELECT SUM(market_value - current_price) as savings
+                SELECT status,
+                       COUNT(*) as count,
+                       SUM(deal_score >= 70) as hot,
+                       SUM(deal_score) as score_sum,
+                       COUNT(deal_score) as score_count,
+                       SUM(market_value - current_price) as savings,
+                       SUM(date_found >= ?) as recent
                 FROM ebay_deals
-                WHERE status = 'new' AND market_value IS NOT NULL AND current_price IS NOT NULL
-            """)
-            savings_row = cursor.fetchone()
-            stats['potential_savings'] = round(savings_row['savings'], 2) if savings_row['savings'] else 0
-
-            # Recent activity (last 7 days)
-            from datetime import timedelta
-            cutoff = (datetime.now() - timedelta(days=7)).isoformat()
-            cursor.execute("SELECT COUNT(*) as count FROM ebay_deals WHERE date_found >= ?", (cutoff,))
-            stats['deals_last_7_days'] = cursor.fetchone()['count']
-
-            return stats
-
-    # ==================== UTILITY FUNCTIONS ====================
+                GROUP BY status
+            """, (cutoff,))
+            rows = cursor.fetchall()
+
+        by_status = {row['status']: row['count'] for row in rows}
+        new = next((row for row in rows if row['status'] == 'new'), None)
+
+        stats = {}
+        stats['total_deals'] = sum(by_status.values())
+        stats['by_status'] = by_status
+        stats['hot_deals'] = (new['hot'] or 0) if new else 0
+        stats['avg_deal_score'] = (
+            round(new['score_sum'] / new['score_count'], 2) if new and new['score_count'] else 0
+        )
+        stats['potential_savings'] = round(new['savings'], 2) if new and new['savings'] else 0
+        stats['deals_last_7_days'] = sum(row['recent'] or 0 for row in rows)
+        return stats
+
+    # ==================== STREAMING ITERATORS ====================
+
+    def _iter_rows(
+        self,
+        table: str,
+        conditions: List[str],
+        params: List[Any],
+        date_column: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        batch_size: int = ITER_BATCH_SIZE,
+        row_format: str = 'dict',
+        keyword: Optional[Tuple[str, str, List[str]]] = None
+    ) -> Iterator[Any]:
+        """
+        Yield rows of table page by page using keyset pagination on id.
 
-    def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        Each page is a fresh query (WHERE id > last_id LIMIT batch_size), so no
+        cursor or read transaction stays open while the caller works on rows.
 
-            stats = {}
+        Args:
+            table: Table to read
+            conditions: SQL conditions ANDed together
+            params: Parameters for conditions
+            date_column: Column since/until apply to
+            since: Only rows with date_column >= since (ISO format)
+            until: Only rows with date_column < until (ISO format)
+            after_id: Resume after this id (exclusive; before it when newest_first)
+            limit: Stop after this many rows
+            newest_first: Walk ids in descending order
+            batch_size: Rows fetched per query
+            row_format: 'dict', 'tuple' (raw values in column order) or 'record'
+            keyword: (fts source, text, LIKE columns) for a keyword filter
+        """
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"row_format must be one of {ROW_FORMATS}, got {row_format!r}")
+
+        conditions = list(conditions)
+        params = list(params)
+        if since:
+            conditions.append(f"{date_column} >= ?")
+            params.append(since)
+        if until:
+            conditions.append(f"{date_column} < ?")
+            params.append(until)
+
+        keyset = "id < ?" if newest_first else "id > ?"
+        order = "DESC" if newest_first else "ASC"
+        last_id = after_id
+        remaining = limit
+        record_class = None
+        decode = table == 'research_findings' and row_format == 'dict'
+
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            where = list(conditions)
+            page_params = list(params)
+            if last_id is not None:
+                where.append(keyset)
+                page_params.append(last_id)
+
+            with self.get_connection() as conn:
+                sql = f"SELECT * FROM {table} WHERE " + (" AND ".join(where) or "1=1")
+                if keyword:
+                    clause, keyword_params = self._keyword_filter(conn, *keyword)
+                    sql += clause
+                    page_params.extend(keyword_params)
+                sql += f" ORDER BY id {order} LIMIT ?"
+                page_params.append(page_size)
+
+                cursor = conn.execute(sql, page_params)
+                rows = cursor.fetchall()
+                columns = tuple(col[0] for col in cursor.description)
+
+            if not rows:
+                return
+
+            if row_format == 'record' and record_class is None:
+                record_class = _record_class(table, columns)
+
+            for row in rows:
+                if row_format == 'dict':
+                    yield _decode_research(dict(row)) if decode else dict(row)
+                elif row_format == 'tuple':
+                    yield tuple(row)
+                else:
+                    yield record_class(row)
+
+            last_id = rows[-1]['id']
+            if remaining is not None:
+                remaining -= len(rows)
+            if len(rows) < page_size:
+                return
+
+    def iter_athletes(
+        self,
+        sport: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+        row_format: str = 'dict'
+    ) -> Iterator[Any]:
+        """
+        Stream athletes in id order (see _iter_rows for paging arguments).
 
-            # Athletes
-            cursor.execute("SELECT COUNT(*) as count FROM athletes")
-            stats['total_athletes'] = cursor.fetchone()['count']
+        Args:
+            sport: Filter by sport (case-insensitive)
+        """
+        conditions, params = [], []
+        if sport:
+            conditions.append("LOWER(sport) = LOWER(?)")
+            params.append(sport)
+        return self._iter_rows('athletes', conditions, params, after_id=after_id, limit=limit,
+                               batch_size=batch_size, row_format=row_format)
 
-            cursor.execute("SELECT COUNT(DISTINCT sport) as count FROM athletes")
-            stats['total_sports'] = cursor.fetchone()['count']
+    def iter_content(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        platform: Optional[str] = None,
+        keyword: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        batch_size: int = ITER_BATCH_SIZE,
+        row_format: str = 'dict'
+    ) -> Iterator[Any]:
+        """
+        Stream content ideas in id order (see _iter_rows for paging arguments).
 
-            # Content
-            cursor.execute("SELECT COUNT(*) as count FROM content_ideas")
-            stats['total_content'] = cursor.fetchone()['count']
+        Args:
+            category: Filter by category
+            status: Filter by status
+            platform: Filter by platform
+            keyword: Search in topic or content
+            since/until: created_date range (ISO format)
+        """
+        conditions, params = [], []
+        for column, value in (('category', category), ('status', status), ('platform', platform)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        return self._iter_rows(
+            'content_ideas', conditions, params, date_column='created_date',
+            since=since, until=until, after_id=after_id, limit=limit,
+            newest_first=newest_first, batch_size=batch_size, row_format=row_format,
+            keyword=('content', keyword, ['topic', 'content']) if keyword else None
+        )
+
+    def iter_research(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        batch_size: int = ITER_BATCH_SIZE,
+        row_format: str = 'dict'
+    ) -> Iterator[Any]:
+        """
+        Stream research findings in id order (see _iter_rows for paging arguments).
 
-            cursor.execute("SELECT COUNT(*) as count FROM content_ideas WHERE status = 'draft'")
-            stats['draft_content'] = cursor.fetchone()['count']
+        Dict rows have sources/tags decoded as they are yielded; 'record' rows
+        decode them only when the attribute is read.
 
-            cursor.execute("SELECT COUNT(*) as count FROM content_ideas WHERE status = 'published'")
-            stats['published_content'] = cursor.fetchone()['count']
+        Args:
+            query: Search in topic or findings
+            category: Filter by category
+            tag: Filter by tag
+            since/until: created_date range (ISO format)
+        """
+        conditions, params = [], []
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if tag:
+            conditions.append("tags LIKE ?")
+            params.append(f"%{tag}%")
+        return self._iter_rows(
+            'research_findings', conditions, params, date_column='created_date',
+            since=since, until=until, after_id=after_id, limit=limit,
+            newest_first=newest_first, batch_size=batch_size, row_format=row_format,
+            keyword=('research', query, ['topic', 'findings']) if query else None
+        )
+
+    def iter_deals(
+        self,
+        status: Optional[str] = None,
+        min_score: Optional[float] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        batch_size: int = ITER_BATCH_SIZE,
+        row_format: str = 'dict'
+    ) -> Iterator[Any]:
+        """
+        Stream eBay deals in id order (see _iter_rows for paging arguments).
 
-            # Research
-            cursor.execute("SELECT COUNT(*) as count FROM research_findings")
-            stats['total_research'] = cursor.fetchone()['count']
+        Args:
+            status: Filter by status
+            min_score: Minimum deal score
+            since/until: date_found range (ISO format)
+        """
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if min_score is not None:
+            conditions.append("deal_score >= ?")
+            params.append(min_score)
+        return self._iter_rows(
+            'ebay_deals', conditions, params, date_column='date_found',
+            since=since, until=until, after_id=after_id, limit=limit,
+            newest_first=newest_first, batch_size=batch_size, row_format=row_format
+        )
 
-            # Tasks
-            cursor.execute("SELECT COUNT(*) as count FROM tasks WHERE status = 'pending'")
-            stats['pending_tasks'] = cursor.fetchone()['count']
+    # ==================== UTILITY FUNCTIONS ====================
 
-            cursor.execute("SELECT COUNT(*) as count FROM tasks WHERE status = 'completed'")
-            stats['completed_tasks'] = cursor.fetchone()['count']
+    @_cached('athletes', 'content_ideas', 'research_findings', 'tasks', 'ebay_deals')
+    def get_stats(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get database statistics.
 
-            # eBay Deals
-            cursor.execute("SELECT COUNT(*) as count FROM ebay_deals")
-            stats['total_ebay_deals'] = cursor.fetchone()['count']
+        Reads the trigger-maintained stat_counters table when the database
+        has it (migration 0007), otherwise counts each table in one pass.
 
-            cursor.execute("SELECT COUNT(*) as count FROM ebay_deals WHERE status = 'new'")
-            stats['new_ebay_deals'] = cursor.fetchone()['count']
+        Args:
+            max_age: Reuse stats computed within this many seconds (default: always fresh)
+        """
+        return self._cached_stats('db', max_age, self._compute_stats)
 
-            cursor.execute("SELECT COUNT(*) as count FROM ebay_deals WHERE status = 'purchased'")
-            stats['purchased_deals'] = cursor.fetchone()['count']
+    def _compute_stats(self) -> Dict[str, Any]:
+        """Compute get_stats() from counters or a single pass per table."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            has_counters = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stat_counters'"
+            ).fetchone()
+
+            if has_counters:
+                cursor.execute("SELECT scope, key, value FROM stat_counters WHERE value != 0")
+                counters = {(row['scope'], row['key']): row['value'] for row in cursor.fetchall()}
+                return {
+                    'total_athletes': counters.get(('athletes', '*'), 0),
+                    'total_sports': sum(1 for scope, key in counters
+                                        if scope == 'athletes.sport' and key != ''),
+                    'total_content': counters.get(('content_ideas', '*'), 0),
+                    'draft_content': counters.get(('content_ideas.status', 'draft'), 0),
+                    'published_content': counters.get(('content_ideas.status', 'published'), 0),
+                    'total_research': counters.get(('research_findings', '*'), 0),
+                    'pending_tasks': counters.get(('tasks.status', 'pending'), 0),
+                    'completed_tasks': counters.get(('tasks.status', 'completed'), 0),
+                    'total_ebay_deals': counters.get(('ebay_deals', '*'), 0),
+                    'new_ebay_deals': counters.get(('ebay_deals.status', 'new'), 0),
+                    'purchased_deals': counters.get(('ebay_deals.status', 'purchased'), 0),
+                }
 
-            return stats
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM athletes) as total_athletes,
+                    (SELECT COUNT(DISTINCT sport) FROM athletes) as total_sports,
+                    content.total as total_content,
+                    content.drafts as draft_content,
+                    content.published as published_content,
+                    (SELECT COUNT(*) FROM research_findings) as total_research,
+                    tasks.pending as pending_tasks,
+                    tasks.completed as completed_tasks,
+                    deals.total as total_ebay_deals,
+                    deals.new as new_ebay_deals,
+                    deals.purchased as purchased_deals
+                FROM
+                    (SELECT COUNT(*) as total,
+                            SUM(status = 'draft') as drafts,
+                            SUM(status = 'published') as published
+                     FROM content_ideas) as content,
+                    (SELECT SUM(status = 'pending') as pending,
+                            SUM(status = 'completed') as completed
+                     FROM tasks) as tasks,
+                    (SELECT COUNT(*) as total,
+                            SUM(status = 'new') as new,
+                            SUM(status = 'purchased') as purchased
+                     FROM ebay_deals) as deals
+            """)
+            # SUM() over an empty table is NULL
+            return {key: value or 0 for key, value in dict(cursor.fetchone()).items()}
 
 
 # Convenience functions for direct use
-def get_db() -> JettDB:
-    """Get database instance."""
-    return JettDB()
+_shared_dbs: Dict[str, JettDB] = {}
+_shared_dbs_lock = threading.Lock()
+
+
+def get_db(db_path: str = DB_PATH) -> JettDB:
+    """Get the shared, pooled database instance for db_path."""
+    with _shared_dbs_lock:
+        db = _shared_dbs.get(db_path)
+        if db is None:
+            db = JettDB(db_path, pooled=True)
+            _shared_dbs[db_path] = db
+        return db
+
+
+def profile_report(db_path: str = DB_PATH, slow_limit: int = 10) -> Dict[str, Any]:
+    """
+    Aggregate recorded query profiles.
+
+    Returns per-method call counts and p50/p95/p99 latency (ms), heaviest total
+    time first, plus the slowest logged statements with their query plans.
+    """
+    path = profile_path_for(db_path)
+    if not os.path.exists(path):
+        return {'methods': [], 'slow': []}
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        timings: Dict[str, List[float]] = {}
+        rows: Dict[str, int] = {}
+        for method, duration_ms, row_count in conn.execute(
+            "SELECT method, duration_ms, rows FROM query_samples"
+        ):
+            timings.setdefault(method, []).append(duration_ms)
+            rows[method] = rows.get(method, 0) + row_count
+
+        methods = []
+        for method, values in timings.items():
+            values.sort()
+            methods.append({
+                'method': method,
+                'calls': len(values),
+                'total_ms': round(sum(values), 2),
+                'p50_ms': round(_percentile(values, 50), 3),
+                'p95_ms': round(_percentile(values, 95), 3),
+                'p99_ms': round(_percentile(values, 99), 3),
+                'max_ms': round(values[-1], 3),
+                'avg_rows': round(rows[method] / len(values), 1),
+            })
+        methods.sort(key=lambda m: m['total_ms'], reverse=True)
+
+        slow = [dict(row) for row in conn.execute(
+            "SELECT timestamp, method, statement, duration_ms, rows, query_plan "
+            "FROM slow_queries ORDER BY duration_ms DESC LIMIT ?", (slow_limit,)
+        )]
+        return {'methods': methods, 'slow': slow}
+    finally:
+        conn.close()
+
+
+def print_profile_report(db_path: str = DB_PATH, slow_limit: int = 10):
+    """Print profile_report() as tables."""
+    report = profile_report(db_path, slow_limit)
+    if not report['methods']:
+        print(f"No query profile recorded for {db_path}")
+        print("Run the pipeline with JETT_DB_PROFILE=1 (threshold: JETT_DB_SLOW_MS) to record one")
+        return
+
+    print("Query Profile (by total time)")
+    print(f"{'method':<40} {'calls':>7} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'rows':>7}")
+    for m in report['methods']:
+        print(f"{m['method'][:40]:<40} {m['calls']:>7} {m['total_ms']:>10.1f} "
+              f"{m['p50_ms']:>8.2f} {m['p95_ms']:>8.2f} {m['p99_ms']:>8.2f} {m['avg_rows']:>7.1f}")
+
+    if report['slow']:
+        print("\nSlowest Statements")
+        for q in report['slow']:
+            print(f"\n  {q['duration_ms']:.1f} ms  {q['method']}  ({q['rows']} rows, {q['timestamp'][:19]})")
+            print(f"    {q['statement'][:200]}")
+            for step in (q['query_plan'] or '').splitlines():
+                print(f"      {step}")
 
 
 if __name__ == "__main__":
-    # Quick test
-    db = get_db()
-    print("Database Stats:")
-    print(json.dumps(db.get_stats(), indent=2))
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Jett knowledge base")
+    parser.add_argument('--db', default=DB_PATH, help="Database path")
+    parser.add_argument('--profile', action='store_true',
+                        help="Show p50/p95/p99 latency per method from recorded query profiles")
+    parser.add_argument('--slow', type=int, default=10, help="Slow statements to list with --profile")
+    args = parser.parse_args()
+
+    if args.profile:
+        print_profile_report(args.db, args.slow)
+    else:
+        db = get_db(args.db)
+        # Quick test
+        print("Database Stats:")
+        print(json.dumps(db.get_stats(), indent=2))
@@ -0,0 +1,235 @@
+"""
+Jett Knowledge Base - asyncio interface
+AsyncJettDB exposes every JettDB method as a coroutine without blocking the
+event loop: reads run concurrently on a reader thread pool (WAL lets them
+proceed during writes) and writes are serialized on one writer thread that
+groups queued writes into a single commit.
+
+Usage:
+    async with AsyncJettDB() as db:
+        await db.add_research(topic, 'sports', findings)
+        hits = await db.search_research(query='nil')
+        async for row in db.iter_research(category='bitcoin'):
+            ...
+"""
+
+import asyncio
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from jett_db import DB_PATH, JettDB
+
+# JettDB methods that modify the database and go through the writer thread
+WRITE_METHODS = {
+    'add_athlete', 'update_athlete',
+    'add_content_idea', 'add_content_ideas_many', 'mark_content_published',
+    'add_research', 'add_research_many',
+    'add_task', 'update_task_status',
+    'add_ebay_deal', 'mark_deal_purchased', 'mark_deal_skipped',
+}
+
+# JettDB methods that are not part of the async surface
+EXCLUDED_METHODS = {'get_connection', 'transaction', 'close'}
+
+# Queued writes committed together at most
+GROUP_COMMIT_MAX = 100
+
+# How long the writer waits for more writes before committing a group (seconds)
+GROUP_COMMIT_WINDOW = 0.002
+
+_STOP = object()
+
+
+class AsyncJettDB:
+    """asyncio facade over JettDB with a single writer thread and a reader pool."""
+
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        readers: int = 4,
+        group_commit_max: int = GROUP_COMMIT_MAX,
+        group_commit_window: float = GROUP_COMMIT_WINDOW
+    ):
+        """
+        Args:
+            db_path: Path to the SQLite database
+            readers: Threads serving read methods concurrently
+            group_commit_max: Most writes committed in one transaction
+            group_commit_window: Seconds to wait for more writes before committing
+        """
+        self.db = JettDB(db_path, pooled=True)
+        self.group_commit_max = group_commit_max
+        self.group_commit_window = group_commit_window
+
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='jettdb-reader')
+        self._writes: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name='jettdb-writer', daemon=True)
+        self._writer.start()
+        self._closed = False
+
+        self.stats = {'writes': 0, 'commits': 0, 'reads': 0}
+
+    # ==================== DISPATCH ====================
+
+    async def _read(self, method: Callable, *args, **kwargs) -> Any:
+        """Run a read method on the reader pool."""
+        self._check_open()
+        self.stats['reads'] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(method, *args, **kwargs))
+
+    async def _write(self, method: Callable, *args, **kwargs) -> Any:
+        """Queue a write for the writer thread and wait until it is committed."""
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writes.put((method, args, kwargs, future, loop))
+        return await future
+
+    async def _iterate(self, method: Callable, *args, **kwargs):
+        """Drive a JettDB iter_* generator on the reader pool, one page per hop."""
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        batch_size = kwargs.get('batch_size') or 500
+        rows = method(*args, **kwargs)
+
+        def next_page() -> List[Any]:
+            page = []
+            for row in rows:
+                page.append(row)
+                if len(page) >= batch_size:
+                    break
+            return page
+
+        while True:
+            page = await loop.run_in_executor(self._readers, next_page)
+            if not page:
+                return
+            for row in page:
+                yield row
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("AsyncJettDB is closed")
+
+    # ==================== WRITER THREAD ====================
+
+    def _writer_loop(self):
+        """Take queued writes and commit them in groups."""
+        while True:
+            item = self._writes.get()
+            if item is _STOP:
+                return
+
+            group = [item]
+            stop = False
+            while len(group) < self.group_commit_max:
+                try:
+                    item = self._writes.get(timeout=self.group_commit_window)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                group.append(item)
+
+            self._commit_group(group)
+            if stop:
+                return
+
+    def _commit_group(self, group: List[Tuple]):
+        """
+        Run a group of writes in one transaction.
+
+        Each write gets its own savepoint, so a failing write is rolled back
+        and reported to its caller without affecting the rest of the group.
+        Callers are only resolved once the commit has succeeded.
+        """
+        outcomes = []
+        try:
+            with self.db.transaction() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for method, args, kwargs, _, _ in group:
+                    conn.execute("SAVEPOINT jettdb_write")
+                    try:
+                        outcomes.append((True, method(*args, **kwargs)))
+                        conn.execute("RELEASE jettdb_write")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO jettdb_write")
+                        conn.execute("RELEASE jettdb_write")
+                        outcomes.append((False, e))
+        except Exception as e:
+            outcomes = [(False, e)] * len(group)
+        else:
+            self.stats['commits'] += 1
+            self.stats['writes'] += len(group)
+
+        for (ok, value), (_, _, _, future, loop) in zip(outcomes, group):
+            try:
+                loop.call_soon_threadsafe(_resolve, future, ok, value)
+            except RuntimeError:
+                pass  # Caller's loop closed meanwhile; nobody is waiting on this write
+
+    # ==================== LIFECYCLE ====================
+
+    async def close(self):
+        """Flush pending writes, stop the threads and close connections."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writes.put(_STOP)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.join)
+        self._readers.shutdown(wait=True)
+        self.db.close()
+
+    async def __aenter__(self) -> 'AsyncJettDB':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _resolve(future: asyncio.Future, ok: bool, value: Any):
+    """Complete a caller's future unless it was cancelled meanwhile."""
+    if future.cancelled():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+def _make_method(name: str, method: Callable) -> Callable:
+    """Build the async counterpart of a JettDB method."""
+    if name.startswith('iter_'):
+        def wrapper(self, *args, **kwargs):
+            return self._iterate(getattr(self.db, name), *args, **kwargs)
+    elif name in WRITE_METHODS:
+        async def wrapper(self, *args, **kwargs):
+            return await self._write(getattr(self.db, name), *args, **kwargs)
+    else:
+        async def wrapper(self, *args, **kwargs):
+            return await self._read(getattr(self.db, name), *args, **kwargs)
+    return functools.wraps(method)(wrapper)
+
+
+for _name in dir(JettDB):
+    _attr = getattr(JettDB, _name)
+    if _name.startswith('_') or _name in EXCLUDED_METHODS or not callable(_attr):
+        continue
+    setattr(AsyncJettDB, _name, _make_method(_name, _attr))
+
+
+_shared: Optional[AsyncJettDB] = None
+
+
+def get_async_db() -> AsyncJettDB:
+    """Get the shared AsyncJettDB for the default database."""
+    global _shared
+    if _shared is None or _shared._closed:
+        _shared = AsyncJettDB()
+    return _shared
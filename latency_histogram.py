@@ -0,0 +1,100 @@
+"""
+Latency Histogram - Compact, mergeable latency distributions
+Log-scale buckets (HDR-style) for percentiles over any set of hours
+"""
+
+import math
+import struct
+from typing import Dict, Iterable, Optional
+
+
+# Bucket i covers (MIN_MS * 2^((i-1)/BUCKETS_PER_DOUBLING), MIN_MS * 2^(i/BUCKETS_PER_DOUBLING)];
+# 8 per doubling keeps percentiles within ~4.5% of the true value
+BUCKETS_PER_DOUBLING = 8
+MIN_MS = 0.01
+# One byte per bucket index: 0.01ms up to ~11 hours
+MAX_BUCKET = 255
+
+PERCENTILES = (50, 90, 99)
+
+# Serialized form: (bucket: uint8, count: uint32) pairs
+_PAIR = struct.Struct('<BI')
+
+
+def bucket_for(value_ms: float) -> int:
+    """Bucket index of a latency in milliseconds."""
+    if value_ms <= MIN_MS:
+        return 0
+    return min(MAX_BUCKET, math.ceil(math.log2(value_ms / MIN_MS) * BUCKETS_PER_DOUBLING))
+
+
+def bucket_value(bucket: int) -> float:
+    """Representative latency of a bucket (geometric middle of its range)."""
+    if bucket == 0:
+        return MIN_MS
+    return MIN_MS * 2 ** ((bucket - 0.5) / BUCKETS_PER_DOUBLING)
+
+
+class LatencyHistogram:
+    """
+    Sparse latency histogram: bucket index -> count.
+
+    Histograms merge by adding counts, so per-hour histograms can be
+    combined into any longer period without keeping raw samples. An hour
+    with a handful of distinct latencies serializes to a few dozen bytes.
+    """
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None):
+        self.counts: Dict[int, int] = dict(counts or {})
+
+    @classmethod
+    def of(cls, values_ms: Iterable[float]) -> 'LatencyHistogram':
+        """Histogram of latency samples (None values are skipped)."""
+        histogram = cls()
+        for value in values_ms:
+            if value is not None:
+                histogram.add(value)
+        return histogram
+
+    def add(self, value_ms: float, count: int = 1):
+        bucket = bucket_for(value_ms)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Add other's counts into this histogram (returns self)."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        return self
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency at percentile p (0-100), or None if empty."""
+        total = self.total
+        if not total:
+            return None
+        rank = max(1, math.ceil(total * p / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return bucket_value(bucket)
+        return bucket_value(max(self.counts))
+
+    def percentiles(self, ps: Iterable[float] = PERCENTILES) -> Dict[str, Optional[float]]:
+        """{'p50': ..., 'p90': ..., 'p99': ...} for the given percentiles."""
+        return {f"p{p:g}": self.percentile(p) for p in ps}
+
+    def to_bytes(self) -> bytes:
+        return b''.join(_PAIR.pack(bucket, count) for bucket, count in sorted(self.counts.items()))
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes]) -> 'LatencyHistogram':
+        if not data:
+            return cls()
+        return cls({bucket: count for bucket, count in _PAIR.iter_unpack(data)})
+
+    def __repr__(self):
+        return f"LatencyHistogram(total={self.total}, buckets={len(self.counts)})"
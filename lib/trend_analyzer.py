@@ -33,12 +33,9 @@ class TrendAnalyzer:
         - BTC equivalent trends
         - Sport-specific patterns
         """
-        # Get all sports research
-        all_sports = self.db.search_research(category='sports')
-
-        # Filter by date
+        # Get recent sports research, newest first (date filter runs in SQL)
         cutoff = (datetime.now() - timedelta(days=days_back)).isoformat()
-        recent = [r for r in all_sports if r['created_date'] >= cutoff]
+        recent = list(self.db.iter_research(category='sports', since=cutoff, newest_first=True))
 
         if not recent:
             return {'error': 'No recent sports research found'}
@@ -137,12 +134,9 @@ class TrendAnalyzer:
         - Quote sources
         - Historical events covered
         """
-        # Get all bitcoin research
-        all_bitcoin = self.db.search_research(category='bitcoin')
-
-        # Filter by date
+        # Get recent bitcoin research, newest first (date filter runs in SQL)
         cutoff = (datetime.now() - timedelta(days=days_back)).isoformat()
-        recent = [r for r in all_bitcoin if r['created_date'] >= cutoff]
+        recent = list(self.db.iter_research(category='bitcoin', since=cutoff, newest_first=True))
 
         if not recent:
             return {'error': 'No recent bitcoin research found'}
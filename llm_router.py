@@ -4,12 +4,77 @@ Routes simple tasks to local LLM, complex tasks to Claude API
 Saves 70%+ on API costs while maintaining quality
 """
 
+import asyncio
+import hashlib
+import math
+import os
+import queue
 import re
+import sqlite3
 import time
-from typing import Dict, Optional, Tuple
+import threading
+import weakref
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import json
 
+from routing_policy import AdaptiveRoutingPolicy
+from token_counter import TokenCounter, get_token_counter
+
+
+# Requests Ollama serves in parallel; keep in sync with the server's OLLAMA_NUM_PARALLEL
+OLLAMA_NUM_PARALLEL = int(os.environ.get('OLLAMA_NUM_PARALLEL', 4))
+
+# Context window requested from Ollama (num_ctx); prompts are fitted to it
+OLLAMA_NUM_CTX = int(os.environ.get('OLLAMA_NUM_CTX', 4096))
+
+# Tokens of the context window left free for the response
+OUTPUT_TOKEN_RESERVE = 512
+
+# What to do with a prompt too long for the local context window:
+# 'trim' keeps the start, 'chunk' runs each piece and joins the responses
+CONTEXT_OVERFLOW_POLICIES = ('trim', 'chunk')
+
+# Seconds a local stream may go without output before failing over to the API:
+# before the first token (covers prompt processing and model loading), and between tokens
+LOCAL_FIRST_TOKEN_TIMEOUT = 30.0
+LOCAL_STALL_TIMEOUT = 5.0
+
+# How long Ollama keeps a model loaded after a request (sent as keep_alive)
+OLLAMA_KEEP_ALIVE = os.environ.get('OLLAMA_KEEP_ALIVE', '30m')
+
+
+def _parse_models(spec: str) -> Dict[str, float]:
+    """'model=quality,model,...' -> {model: quality}; quality defaults to 0.6."""
+    models = {}
+    for entry in spec.split(','):
+        name, sep, quality = entry.strip().rpartition('=')
+        if not sep:
+            name, quality = quality, '0.6'
+        if name:
+            models[name] = float(quality)
+    return models
+
+
+# Local model fleet: model -> highest complexity_score it is trusted with.
+# Override with OLLAMA_MODELS="llama3.1:8b=0.6,llama3.2:3b=0.3"
+LOCAL_MODELS = _parse_models(os.environ.get('OLLAMA_MODELS', 'llama3.1:8b=0.6'))
+
+# A model load slower than this (ms) counts as a cold load / model swap
+COLD_LOAD_MS = 500.0
+
+# How long the list of loaded models from /api/ps is trusted (seconds)
+LOADED_MODELS_TTL = 10.0
+
+# Max in-flight requests per provider for batch and async routing
+PROVIDER_CONCURRENCY = {
+    'ollama': OLLAMA_NUM_PARALLEL,
+    'claude': 8,
+}
+
 
 class TaskComplexityAnalyzer:
     """Analyzes task complexity to determine routing."""
@@ -65,6 +130,38 @@ class TaskComplexityAnalyzer:
         r'database|db|query|sql'
     ]
 
+    # Literals of which at least one must appear for the DB_QUERY_PATTERNS entry at
+    # the same index to match; the regex only runs on prompts containing one.
+    # None = always run the pattern.
+    DB_QUERY_ANCHORS = [
+        ('athlete',),
+        ('athlete',),
+        ('how many', 'count'),
+        ('contract',),
+        ('search', 'query', 'filter'),
+        ('database', 'db', 'query', 'sql'),
+    ]
+
+    # Compiled matchers, built on first use from the lists above
+    _matchers = None
+
+    @staticmethod
+    def _get_matchers() -> Tuple:
+        """
+        Prepare the indicator lists for scanning.
+
+        Returns (complex keywords, simple keywords, [(anchors, compiled DB
+        pattern)]), compiled once per process.
+        """
+        cls = TaskComplexityAnalyzer
+        if cls._matchers is None:
+            anchors = list(cls.DB_QUERY_ANCHORS)
+            anchors += [None] * (len(cls.DB_QUERY_PATTERNS) - len(anchors))
+            db_rules = [(anchor, re.compile(pattern))
+                        for anchor, pattern in zip(anchors, cls.DB_QUERY_PATTERNS)]
+            cls._matchers = (tuple(cls.COMPLEX_INDICATORS), tuple(cls.SIMPLE_INDICATORS), db_rules)
+        return cls._matchers
+
     @staticmethod
     def analyze(prompt: str) -> Dict:
         """
@@ -80,20 +177,90 @@ class TaskComplexityAnalyzer:
                 - reason: str (explanation)
                 - complexity_score: float (0-1, higher = more complex)
         """
+        complex_keywords, simple_keywords, db_rules = TaskComplexityAnalyzer._get_matchers()
         prompt_lower = prompt.lower()
 
         # Count complexity indicators
-        complex_score = sum(1 for keyword in TaskComplexityAnalyzer.COMPLEX_INDICATORS
-                           if keyword in prompt_lower)
-        simple_score = sum(1 for keyword in TaskComplexityAnalyzer.SIMPLE_INDICATORS
-                          if keyword in prompt_lower)
+        complex_score = sum(1 for keyword in complex_keywords if keyword in prompt_lower)
+        simple_score = sum(1 for keyword in simple_keywords if keyword in prompt_lower)
+
+        # Check for database query patterns (skipping regexes whose anchors are absent)
+        is_db_query = any(
+            (anchors is None or any(a in prompt_lower for a in anchors)) and pattern.search(prompt_lower)
+            for anchors, pattern in db_rules
+        )
+
+        # Only the first ~200 words affect the decision, so stop splitting there
+        word_count = len(prompt.split(None, 201))
 
-        # Check for database query patterns
-        is_db_query = any(re.search(pattern, prompt_lower)
-                         for pattern in TaskComplexityAnalyzer.DB_QUERY_PATTERNS)
+        return TaskComplexityAnalyzer._decide(complex_score, simple_score, is_db_query, word_count)
 
+    @staticmethod
+    def analyze_many(prompts: List[str]) -> List[Dict]:
+        """
+        Analyze a batch of prompts together.
+
+        The batch is lowercased and searched as one string, one scan per keyword,
+        so short prompts don't each pay the per-keyword call overhead.
+
+        Returns one analyze() result per prompt, in input order.
+        """
+        if not prompts:
+            return []
+
+        complex_keywords, simple_keywords, db_rules = TaskComplexityAnalyzer._get_matchers()
+        # Lowercase before joining: lower() can change a prompt's length ('İ'),
+        # so offsets must come from the lowered strings.
+        # NUL never appears in a keyword or DB pattern, so no match spans two prompts
+        lowered = [prompt.lower() for prompt in prompts]
+        text = '\0'.join(lowered)
+        starts = [0]
+        for prompt_lower in lowered[:-1]:
+            starts.append(starts[-1] + len(prompt_lower) + 1)
+        ends = [start + len(prompt_lower) for start, prompt_lower in zip(starts, lowered)]
+
+        found: Dict[str, set] = {}
+
+        def containing(literal: str) -> set:
+            """Indexes of the prompts containing literal."""
+            if literal not in found:
+                hits = set()
+                index = text.find(literal)
+                while index != -1:
+                    i = bisect_right(starts, index) - 1
+                    hits.add(i)
+                    if i + 1 == len(starts):
+                        break
+                    index = text.find(literal, starts[i + 1])
+                found[literal] = hits
+            return found[literal]
+
+        complex_scores = [0] * len(prompts)
+        simple_scores = [0] * len(prompts)
+        for keywords, scores in ((complex_keywords, complex_scores), (simple_keywords, simple_scores)):
+            for keyword in keywords:
+                for i in containing(keyword):
+                    scores[i] += 1
+
+        is_db = [False] * len(prompts)
+        for anchors, pattern in db_rules:
+            candidates = (range(len(prompts)) if anchors is None
+                          else set().union(*(containing(a) for a in anchors)))
+            for i in candidates:
+                if not is_db[i] and pattern.search(text, starts[i], ends[i]):
+                    is_db[i] = True
+
+        return [
+            TaskComplexityAnalyzer._decide(complex_scores[i], simple_scores[i], is_db[i],
+                                           len(prompt.split(None, 201)))
+            for i, prompt in enumerate(prompts)
+        ]
+
+    @staticmethod
+    def _decide(complex_score: int, simple_score: int, is_db_query: bool,
+                word_count: int) -> Dict:
+        """Routing decision from the keyword scores."""
         # Check prompt length (very long prompts might be complex)
-        word_count = len(prompt.split())
         length_factor = min(word_count / 100, 1.0)  # Normalize to 0-1
 
         # Calculate complexity score
@@ -147,21 +314,127 @@ class TaskComplexityAnalyzer:
 class OllamaClient:
     """Client for local Ollama LLM."""
 
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    # How long a health check result is trusted (seconds)
+    HEALTH_TTL = 30.0
+    # Re-probe sooner after a failure so a restarted Ollama is picked up quickly
+    UNHEALTHY_RETRY = 5.0
+
+    def __init__(self, base_url: str = "http://localhost:11434",
+                 pool_size: int = OLLAMA_NUM_PARALLEL,
+                 keep_alive: Optional[str] = OLLAMA_KEEP_ALIVE):
         self.base_url = base_url
         self.default_model = "llama3.1:8b"  # 8B model - better quality, falls back to Claude if needed
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._healthy: Optional[bool] = None
+        self._health_checked_at = 0.0
+        self._async_client = None
+        self._async_client_loop = None
+
+    @property
+    def session(self):
+        """Shared requests.Session with keep-alive connections to Ollama."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def close(self):
+        """Close pooled connections."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    async def aclose(self):
+        """Close pooled connections, including the async client."""
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _set_health(self, healthy: bool):
+        self._healthy = healthy
+        self._health_checked_at = time.monotonic()
+
+    def mark_unhealthy(self):
+        """Record a failed request so the next is_available() re-probes soon."""
+        self._set_health(False)
+
+    def _payload(self, model: str, prompt: str, stream: bool,
+                 temperature: Optional[float], num_ctx: Optional[int]) -> Dict:
+        """/api/generate request body."""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": self._options(temperature, num_ctx)
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    @staticmethod
+    def _options(temperature: Optional[float], num_ctx: Optional[int]) -> Dict:
+        """Ollama generation options (unset ones are left to the model's defaults)."""
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if num_ctx:
+            options["num_ctx"] = num_ctx
+        return options
+
+    def _cached_health(self) -> Optional[bool]:
+        """Cached health state, or None once it has expired."""
+        if self._healthy is None:
+            return None
+        ttl = self.HEALTH_TTL if self._healthy else self.UNHEALTHY_RETRY
+        if time.monotonic() - self._health_checked_at < ttl:
+            return self._healthy
+        return None
+
+    def is_available(self, refresh: bool = False) -> bool:
+        """
+        Check if Ollama is running and available.
+
+        The result is cached for HEALTH_TTL seconds (UNHEALTHY_RETRY after a
+        failure) and refreshed by every successful query, so routed prompts
+        don't pay for an /api/tags round-trip each time.
+
+        Args:
+            refresh: Ignore the cached state and probe now
+        """
+        if not refresh:
+            cached = self._cached_health()
+            if cached is not None:
+                return cached
 
-    def is_available(self) -> bool:
-        """Check if Ollama is running and available."""
         try:
-            import requests
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            return response.status_code == 200
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=2)
+            healthy = response.status_code == 200
         except Exception:
-            return False
+            healthy = False
+        self._set_health(healthy)
+        return healthy
 
     def query(self, prompt: str, model: Optional[str] = None,
-              temperature: float = 0.7) -> Dict:
+              temperature: float = 0.7, num_ctx: Optional[int] = None) -> Dict:
         """
         Query local Ollama LLM.
 
@@ -169,48 +442,47 @@ class OllamaClient:
             prompt: User prompt
             model: Model name (default: llama3.1:8b)
             temperature: Sampling temperature
+            num_ctx: Context window to request (default: the model's)
 
         Returns:
             Dict with keys:
                 - success: bool
                 - response: str (LLM response)
                 - model: str (model used)
-                - tokens: int (estimated tokens)
+                - tokens: int (output tokens)
+                - input_tokens: int (prompt tokens, as counted by Ollama)
+                - load_ms: float (time Ollama spent loading the model)
                 - time_ms: float (response time)
                 - error: str (if failed)
         """
-        import requests
-
         start_time = time.time()
         model = model or self.default_model
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature
-                    }
-                },
+                json=self._payload(model, prompt, False, temperature, num_ctx),
                 timeout=60
             )
 
             if response.status_code == 200:
                 data = response.json()
                 elapsed_ms = (time.time() - start_time) * 1000
+                self._set_health(True)
 
                 return {
                     'success': True,
                     'response': data.get('response', ''),
                     'model': model,
                     'tokens': data.get('eval_count', 0),
+                    'input_tokens': data.get('prompt_eval_count', 0),
+                    'load_ms': data.get('load_duration', 0) / 1e6,
                     'time_ms': elapsed_ms,
                     'error': None
                 }
             else:
+                if response.status_code >= 500:
+                    self.mark_unhealthy()
                 return {
                     'success': False,
                     'response': None,
@@ -218,66 +490,780 @@ class OllamaClient:
                 }
 
         except Exception as e:
+            self.mark_unhealthy()
             return {
                 'success': False,
                 'response': None,
                 'error': str(e)
             }
 
-    def stream(self, prompt: str, model: Optional[str] = None):
+    def loaded_models(self) -> Optional[List[str]]:
+        """Models Ollama currently has in memory (/api/ps), or None if it can't be asked."""
+        try:
+            response = self.session.get(f"{self.base_url}/api/ps", timeout=2)
+            if response.status_code == 200:
+                return [m.get('name') or m.get('model') for m in response.json().get('models', [])]
+        except Exception:
+            self.mark_unhealthy()
+        return None
+
+    async def ais_available(self) -> bool:
+        """Async is_available(); only probes (off the event loop) when the cache expired."""
+        cached = self._cached_health()
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.is_available)
+
+    def _get_async_client(self):
+        """httpx.AsyncClient for the running event loop (None if httpx isn't installed)."""
+        try:
+            import httpx
+        except ImportError:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.pool_size),
+                timeout=60
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def aquery(self, prompt: str, model: Optional[str] = None,
+                     temperature: float = 0.7, num_ctx: Optional[int] = None) -> Dict:
         """
-        Stream response from Ollama (for long responses).
+        Async query() over a pooled httpx.AsyncClient.
 
-        Yields response chunks as they arrive.
+        Falls back to running query() in a worker thread when httpx isn't
+        installed. Returns the same dict as query().
         """
-        import requests
+        client = self._get_async_client()
+        if client is None:
+            return await asyncio.to_thread(self.query, prompt, model, temperature, num_ctx)
 
+        start_time = time.time()
         model = model or self.default_model
 
         try:
-            response = requests.post(
+            response = await client.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": True
-                },
+                json=self._payload(model, prompt, False, temperature, num_ctx)
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                elapsed_ms = (time.time() - start_time) * 1000
+                self._set_health(True)
+
+                return {
+                    'success': True,
+                    'response': data.get('response', ''),
+                    'model': model,
+                    'tokens': data.get('eval_count', 0),
+                    'input_tokens': data.get('prompt_eval_count', 0),
+                    'load_ms': data.get('load_duration', 0) / 1e6,
+                    'time_ms': elapsed_ms,
+                    'error': None
+                }
+            else:
+                if response.status_code >= 500:
+                    self.mark_unhealthy()
+                return {
+                    'success': False,
+                    'response': None,
+                    'error': f"HTTP {response.status_code}: {response.text}"
+                }
+
+        except Exception as e:
+            self.mark_unhealthy()
+            return {
+                'success': False,
+                'response': None,
+                'error': str(e)
+            }
+
+    def embed(self, text: str, model: str = "nomic-embed-text") -> Optional[List[float]]:
+        """Embedding vector for text, or None if Ollama can't produce one."""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/embeddings",
+                json={"model": model, "prompt": text},
+                timeout=30
+            )
+            if response.status_code == 200:
+                return response.json().get('embedding') or None
+        except Exception:
+            self.mark_unhealthy()
+        return None
+
+    def stream_events(self, prompt: str, model: Optional[str] = None,
+                      temperature: Optional[float] = None, num_ctx: Optional[int] = None):
+        """
+        Stream raw /api/generate events.
+
+        Yields the decoded JSON lines: text arrives in 'response', and the
+        last event has done=True plus Ollama's eval_count/eval_duration.
+        Raises on connection, HTTP or in-stream errors.
+        """
+        model = model or self.default_model
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(model, prompt, True, temperature, num_ctx),
                 stream=True,
                 timeout=60
             )
-
-            for line in response.iter_lines():
+        except Exception:
+            self.mark_unhealthy()
+            raise
+
+        # Closing the response returns its connection to the pool
+        with response:
+            if response.status_code != 200:
+                if response.status_code >= 500:
+                    self.mark_unhealthy()
+                raise RuntimeError(f"HTTP {response.status_code}: {response.text}")
+
+            # chunk_size=None: hand over each chunk as it arrives instead of
+            # waiting for 512 bytes, which would hold back the first tokens
+            for line in response.iter_lines(chunk_size=None):
                 if line:
                     data = json.loads(line)
-                    if 'response' in data:
-                        yield data['response']
+                    if 'error' in data:
+                        raise RuntimeError(data['error'])
+                    yield data
+        self._set_health(True)
+
+    def stream(self, prompt: str, model: Optional[str] = None):
+        """
+        Stream response from Ollama (for long responses).
+
+        Yields response chunks as they arrive.
+        """
+        try:
+            for data in self.stream_events(prompt, model):
+                if 'response' in data:
+                    yield data['response']
 
         except Exception as e:
             yield f"Error: {e}"
 
 
+_shared_clients: Dict[str, OllamaClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_ollama_client(base_url: str = "http://localhost:11434") -> OllamaClient:
+    """Get the shared OllamaClient (and its connection pool) for base_url."""
+    with _shared_clients_lock:
+        client = _shared_clients.get(base_url)
+        if client is None:
+            client = OllamaClient(base_url)
+            _shared_clients[base_url] = client
+        return client
+
+
+class ModelScheduler:
+    """
+    Picks local models so Ollama swaps them as little as possible.
+
+    Knows which models are loaded (from /api/ps, refreshed every
+    LOADED_MODELS_TTL seconds and updated by each response), prefers a warm
+    model whose quality covers the prompt's complexity, orders batches so
+    prompts for the same model run together, and counts cold loads and the
+    time spent loading per model.
+    """
+
+    def __init__(self, client: OllamaClient, models: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            client: Ollama server to schedule for
+            models: Model -> highest complexity_score it handles (default: LOCAL_MODELS)
+        """
+        self.client = client
+        self.models = dict(models or LOCAL_MODELS)
+        self._loaded: set = set()
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._load_stats: Dict[str, Dict] = {}
+
+    def needs_refresh(self) -> bool:
+        """True when the next loaded() call will ask /api/ps (a blocking request)."""
+        return time.monotonic() - self._loaded_at >= LOADED_MODELS_TTL
+
+    def loaded(self, refresh: bool = False) -> set:
+        """Models currently in Ollama's memory (last known if /api/ps is unreachable)."""
+        if refresh or self.needs_refresh():
+            models = self.client.loaded_models()
+            with self._lock:
+                self._loaded_at = time.monotonic()
+                if models is not None:
+                    self._loaded = set(models)
+        return self._loaded
+
+    def pick_model(self, complexity_score: float = 0.0) -> str:
+        """
+        Local model for a prompt.
+
+        The most capable warm model whose quality covers complexity_score;
+        if none is warm, the client's default model (or the most capable
+        model if the default isn't good enough).
+        """
+        eligible = [m for m, quality in self.models.items() if quality >= complexity_score]
+        loaded = self.loaded()
+        warm = [m for m in eligible if m in loaded]
+        if warm:
+            return max(warm, key=self.models.get)
+        default = self.client.default_model
+        if default in eligible or not self.models:
+            return default
+        return max(eligible or self.models, key=self.models.get)
+
+    def batch_order(self, models: List[Optional[str]]) -> List[int]:
+        """
+        Indexes of a batch in the order to run them.
+
+        Prompts without a local model (API-bound) go first, then warm models,
+        then cold ones, grouped by model so each is loaded once.
+        """
+        loaded = self.loaded()
+        return sorted(range(len(models)), key=lambda i: (
+            models[i] is not None, models[i] not in loaded, models[i] or ''))
+
+    def record(self, model: str, load_ms: Optional[float]):
+        """Note a completed request: model is now warm; slow loads count as cold."""
+        cold = (load_ms or 0.0) >= COLD_LOAD_MS
+        with self._lock:
+            self._loaded.add(model)
+            stats = self._load_stats.setdefault(model, {'requests': 0, 'cold_loads': 0, 'load_ms': 0.0})
+            stats['requests'] += 1
+            if cold:
+                stats['cold_loads'] += 1
+                stats['load_ms'] += load_ms
+        if cold:
+            print(f"🧊 Cold load: {model} took {load_ms / 1000:.1f}s to load")
+
+    def get_stats(self) -> Dict:
+        """Loaded models and per-model request / cold load counts."""
+        with self._lock:
+            return {
+                'loaded': sorted(self._loaded),
+                'models': {model: dict(stats) for model, stats in self._load_stats.items()},
+                'cold_loads': sum(s['cold_loads'] for s in self._load_stats.values()),
+                'load_ms': sum(s['load_ms'] for s in self._load_stats.values()),
+            }
+
+
+_schedulers: Dict[str, ModelScheduler] = {}
+
+
+def get_model_scheduler(client: Optional[OllamaClient] = None) -> ModelScheduler:
+    """Get the shared ModelScheduler for client's Ollama server (default: the shared client)."""
+    client = client or get_ollama_client()
+    with _shared_clients_lock:
+        scheduler = _schedulers.get(client.base_url)
+        if scheduler is None or scheduler.client is not client:
+            scheduler = ModelScheduler(client)
+            _schedulers[client.base_url] = scheduler
+        return scheduler
+
+
+# Default location of the prompt response cache (shared with usage_stats)
+CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'jett_knowledge.db')
+
+# Cross-process single-flight: a claim older than this (seconds) is treated as
+# abandoned by a crashed process, and waiting processes give up on it
+INFLIGHT_TIMEOUT = 180.0
+# How often a process waiting on another process's generation checks the cache
+INFLIGHT_POLL_INTERVAL = 0.25
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so prompts that differ only in formatting share a cache entry."""
+    return ' '.join(prompt.split())
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of routed LLM responses.
+
+    Entries are keyed on a hash of the normalized prompt, model and temperature,
+    expire after ttl_seconds, and the least recently hit entries are evicted past
+    max_entries. With an embed_fn, misses fall back to the most similar of the
+    max_candidates most recently hit prompts (cosine similarity >=
+    similarity_threshold), so a miss costs the same however big the cache is.
+
+    The llm_response_inflight table lets processes sharing the database claim
+    a key while generating it (claim/release), so others can wait for the
+    answer to land in the cache (wait_for) instead of generating it again.
+    """
+
+    def __init__(
+        self,
+        db_path: str = CACHE_DB_PATH,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        embed_fn: Optional[Callable[[str], Optional[List[float]]]] = None,
+        similarity_threshold: float = 0.95,
+        max_candidates: int = 256
+    ):
+        """
+        Args:
+            db_path: SQLite database holding the llm_response_cache table
+            ttl_seconds: How long a response stays valid
+            max_entries: Entries kept before least recently hit are evicted
+            embed_fn: Text -> embedding vector, enables near-duplicate lookups
+                (e.g. get_ollama_client().embed)
+            similarity_threshold: Minimum cosine similarity for a near-duplicate hit
+            max_candidates: Most recently hit entries compared on an exact-key miss
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_candidates = max_candidates
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._embeddings: Dict[str, Optional[bytes]] = {}
+        self._ensure_table_exists()
+
+    @contextmanager
+    def _get_connection(self):
+        """Get database connection."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            conn.close()
+
+    def _ensure_table_exists(self):
+        """Create llm_response_cache table if it doesn't exist."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    temperature REAL NOT NULL,
+                    prompt TEXT,
+                    response TEXT NOT NULL,
+                    source_provider TEXT,
+                    source_model TEXT,
+                    tokens INTEGER,
+                    api_cost_usd REAL,
+                    complexity_score REAL,
+                    embedding BLOB,
+                    created_at REAL NOT NULL,
+                    last_hit_at REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_response_cache_last_hit
+                ON llm_response_cache(last_hit_at)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_response_cache_model
+                ON llm_response_cache(model, temperature)
+            """)
+            # Near-duplicate candidates: newest hits for one model/temperature
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_response_cache_recent
+                ON llm_response_cache(model, temperature, last_hit_at)
+            """)
+            # Keys some process is generating right now (cross-process single-flight)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS llm_response_inflight (
+                    cache_key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    started_at REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float) -> str:
+        """Cache key for a prompt/model/temperature combination."""
+        payload = f"{model}\x00{temperature:.3f}\x00{normalize_prompt(prompt)}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _embedding(self, prompt: str) -> Optional[bytes]:
+        """Packed float32 embedding of prompt (memoized for the get/put pair)."""
+        if self.embed_fn is None:
+            return None
+        text = normalize_prompt(prompt)
+        if text not in self._embeddings:
+            vector = self.embed_fn(text)
+            if len(self._embeddings) >= 256:
+                self._embeddings.clear()
+            self._embeddings[text] = array('f', vector).tobytes() if vector else None
+        return self._embeddings[text]
+
+    @staticmethod
+    def _vector(data: bytes) -> Tuple[array, float]:
+        """Unpacked embedding and its norm."""
+        vector = array('f')
+        vector.frombytes(data)
+        return vector, math.sqrt(sum(x * x for x in vector))
+
+    @classmethod
+    def _cosine(cls, query: Tuple[array, float], other: bytes) -> float:
+        """Cosine similarity of an unpacked query embedding and a packed one."""
+        va, norm_a = query
+        vb, norm_b = cls._vector(other)
+        if len(va) != len(vb) or not norm_a or not norm_b:
+            return 0.0
+        return sum(x * y for x, y in zip(va, vb)) / (norm_a * norm_b)
+
+    def get(self, prompt: str, model: str, temperature: float) -> Optional[Dict]:
+        """
+        Look up a cached response.
+
+        Returns the cache row as a dict, with 'match' set to 'exact' or
+        'similar' (plus 'similarity'), or None on a miss.
+        """
+        now = time.time()
+        cutoff = now - self.ttl_seconds
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM llm_response_cache
+                WHERE cache_key = ? AND created_at >= ?
+            """, (self.make_key(prompt, model, temperature), cutoff))
+            row = cursor.fetchone()
+            match, similarity = 'exact', 1.0
+
+            if row is None:
+                embedding = self._embedding(prompt)
+                if embedding is not None:
+                    # Only the most recently hit entries are compared, keeping the
+                    # scan bounded as the cache grows
+                    cursor.execute("""
+                        SELECT cache_key, embedding FROM llm_response_cache
+                        WHERE model = ? AND temperature = ? AND created_at >= ?
+                          AND embedding IS NOT NULL
+                        ORDER BY last_hit_at DESC
+                        LIMIT ?
+                    """, (model, temperature, cutoff, self.max_candidates))
+                    query = self._vector(embedding)
+                    best_key, best_score = None, self.similarity_threshold
+                    for candidate in cursor.fetchall():
+                        score = self._cosine(query, candidate['embedding'])
+                        if score >= best_score:
+                            best_key, best_score = candidate['cache_key'], score
+                    if best_key is not None:
+                        cursor.execute("SELECT * FROM llm_response_cache WHERE cache_key = ?",
+                                       (best_key,))
+                        row, match, similarity = cursor.fetchone(), 'similar', best_score
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            cursor.execute("""
+                UPDATE llm_response_cache
+                SET hits = hits + 1, last_hit_at = ?
+                WHERE cache_key = ?
+            """, (now, row['cache_key']))
+
+        if match == 'exact':
+            self.hits += 1
+        else:
+            self.similar_hits += 1
+
+        entry = dict(row)
+        entry.pop('embedding', None)
+        entry['match'] = match
+        entry['similarity'] = similarity
+        return entry
+
+    def put(self, prompt: str, model: str, temperature: float, result: Dict):
+        """Store a successful routed result, evicting expired and excess entries."""
+        now = time.time()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO llm_response_cache (
+                    cache_key, model, temperature, prompt, response,
+                    source_provider, source_model, tokens, api_cost_usd,
+                    complexity_score, embedding, created_at, last_hit_at, hits
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+            """, (
+                self.make_key(prompt, model, temperature),
+                model,
+                temperature,
+                normalize_prompt(prompt)[:500],
+                result['response'],
+                result.get('provider'),
+                result.get('model'),
+                result.get('tokens'),
+                # What the same answer costs from the API: paid, or avoided by routing locally
+                (result.get('cost_usd') or 0.0) + (result.get('savings_usd') or 0.0),
+                result.get('complexity_score'),
+                self._embedding(prompt),
+                now,
+                now
+            ))
+            self._evict(cursor, now)
+
+    def claim(self, key: str) -> Optional[str]:
+        """
+        Mark key as being generated by this caller, for every process sharing the cache.
+
+        Returns an owner token for release(), or None when another caller's
+        claim (younger than INFLIGHT_TIMEOUT) is still held.
+        """
+        owner = f"{os.getpid()}-{os.urandom(6).hex()}"
+        now = time.time()
+        with self._get_connection() as conn:
+            # One statement: insert, or take over only an abandoned claim
+            cursor = conn.execute("""
+                INSERT INTO llm_response_inflight (cache_key, owner, started_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE
+                SET owner = excluded.owner, started_at = excluded.started_at
+                WHERE started_at < ?
+            """, (key, owner, now, now - INFLIGHT_TIMEOUT))
+            return owner if cursor.rowcount == 1 else None
+
+    def release(self, key: str, owner: str):
+        """Drop a claim taken with claim()."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM llm_response_inflight WHERE cache_key = ? AND owner = ?",
+                         (key, owner))
+
+    def wait_for(self, prompt: str, model: str, temperature: float,
+                 timeout: float = INFLIGHT_TIMEOUT) -> Optional[Dict]:
+        """
+        Wait for another process's claimed generation of prompt, then get() it.
+
+        Returns None if the claim is released without a cached answer (the
+        generation failed), goes stale, or timeout passes.
+        """
+        key = self.make_key(prompt, model, temperature)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            now = time.time()
+            with self._get_connection() as conn:
+                row = conn.execute("""
+                    SELECT EXISTS(SELECT 1 FROM llm_response_cache
+                                  WHERE cache_key = ? AND created_at >= ?) AS cached,
+                           EXISTS(SELECT 1 FROM llm_response_inflight
+                                  WHERE cache_key = ? AND started_at >= ?) AS running
+                """, (key, now - self.ttl_seconds, key, now - INFLIGHT_TIMEOUT)).fetchone()
+            if row['cached'] or not row['running']:
+                break
+            time.sleep(INFLIGHT_POLL_INTERVAL)
+        return self.get(prompt, model, temperature)
+
+    def _evict(self, cursor: sqlite3.Cursor, now: float):
+        """Drop expired entries, then the least recently hit beyond max_entries."""
+        cursor.execute("DELETE FROM llm_response_cache WHERE created_at < ?",
+                       (now - self.ttl_seconds,))
+        cursor.execute("SELECT COUNT(*) FROM llm_response_cache")
+        excess = cursor.fetchone()[0] - self.max_entries
+        if excess > 0:
+            cursor.execute("""
+                DELETE FROM llm_response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache
+                    ORDER BY last_hit_at ASC LIMIT ?
+                )
+            """, (excess,))
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM llm_response_cache")
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters for this process plus table totals."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS total_hits
+                FROM llm_response_cache
+            """)
+            row = dict(cursor.fetchone())
+
+        lookups = self.hits + self.similar_hits + self.misses
+        row.update({
+            'hits': self.hits,
+            'similar_hits': self.similar_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.similar_hits) / lookups if lookups else 0.0,
+        })
+        return row
+
+
+class _Flight:
+    """One in-flight generation that identical concurrent requests wait on."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Dict:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared async flight whose leader was cancelled; its followers retry."""
+
+
+class LocalStreamStalled(Exception):
+    """The local model stopped producing output within the stream deadline."""
+
+
+class RoutedStream:
+    """
+    Text chunks of a routed, streaming response.
+
+    Iterate to receive chunks as they arrive; once exhausted, `result` holds
+    the same dict route_and_execute() returns plus ttft_ms and tokens_per_sec.
+    If the stream is closed early, `result` marks it aborted instead.
+    """
+
+    def __init__(self):
+        self._chunks: Optional[Iterator[str]] = None
+        self._received: List[str] = []
+        self._started = time.time()
+        self._first_chunk_at: Optional[float] = None
+        self.provider: Optional[str] = None  # set once the route is decided
+        self.result: Optional[Dict] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        chunk = next(self._chunks)
+        if self._first_chunk_at is None:
+            self._first_chunk_at = time.time()
+        self._received.append(chunk)
+        return chunk
+
+    def close(self):
+        """
+        Stop streaming early.
+
+        An abandoned stream is not logged to the usage tracker or learned
+        from; `result` is set with success=False, aborted=True and the text
+        received so far (unless the stream had already completed).
+        """
+        self._chunks.close()
+        if self.result is None:
+            now = time.time()
+            self.result = {
+                'success': False,
+                'aborted': True,
+                'provider': self.provider,
+                'response': ''.join(self._received),
+                'time_ms': (now - self._started) * 1000,
+                'ttft_ms': ((self._first_chunk_at - self._started) * 1000
+                            if self._first_chunk_at is not None else None),
+                'tokens_per_sec': None,
+                'error': 'Stream closed before completion'
+            }
+
+    def text(self) -> str:
+        """Consume the rest of the stream and return the full response."""
+        return ''.join(self)
+
+
 class LLMRouter:
     """
     Smart LLM Router - routes tasks between local Ollama and Claude API.
     Saves 70%+ on API costs while maintaining quality.
     """
 
-    def __init__(self, usage_tracker=None):
+    def __init__(
+        self,
+        usage_tracker=None,
+        response_cache: Optional[ResponseCache] = None,
+        token_counter: Optional[TokenCounter] = None,
+        context_tokens: int = OLLAMA_NUM_CTX,
+        context_overflow: str = 'trim',
+        routing_policy: Optional[AdaptiveRoutingPolicy] = None,
+        ollama_client: Optional[OllamaClient] = None
+    ):
+        """
+        Args:
+            usage_tracker: UsageTracker to log each routed request to
+            response_cache: ResponseCache consulted before routing
+            token_counter: Token counts for cost and context checks (default: shared)
+            context_tokens: Local model context window (sent to Ollama as num_ctx)
+            context_overflow: 'trim' or 'chunk' prompts too long for the local window
+            routing_policy: Adaptive policy that adjusts the analyzer's decisions
+                from observed latency/failures (see adaptive())
+            ollama_client: Ollama server to use (default: shared client for localhost)
+        """
+        if context_overflow not in CONTEXT_OVERFLOW_POLICIES:
+            raise ValueError(f"context_overflow must be one of {CONTEXT_OVERFLOW_POLICIES}")
+
         self.analyzer = TaskComplexityAnalyzer()
-        self.ollama = OllamaClient()
+        self.ollama = ollama_client or get_ollama_client()
+        self.scheduler = get_model_scheduler(self.ollama)
         self.usage_tracker = usage_tracker
+        self.response_cache = response_cache
+        self.tokens = token_counter or get_token_counter()
+        self.context_tokens = context_tokens
+        self.context_overflow = context_overflow
+        self.routing_policy = routing_policy
+        if routing_policy is not None and routing_policy.local_model is None:
+            routing_policy.local_model = self.ollama.default_model
 
         # Cost estimates (per 1M tokens)
         self.CLAUDE_COST_INPUT = 3.0   # $3 per 1M input tokens
         self.CLAUDE_COST_OUTPUT = 15.0  # $15 per 1M output tokens
         self.LOCAL_COST = 0.0           # Free!
 
+        # Per-provider concurrency limits (threads, and asyncio per event loop)
+        self._limits = {provider: threading.BoundedSemaphore(limit)
+                        for provider, limit in PROVIDER_CONCURRENCY.items()}
+        # Keyed weakly by event loop: routers may serve several loops at once
+        # (asyncio.run() in worker threads), and closed loops drop out
+        self._async_limits = weakref.WeakKeyDictionary()  # loop -> {provider: asyncio.Semaphore}
+
+        # Single-flight: requests identical to one already running wait for its result
+        self._inflight: Dict[str, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+        self._ainflight = weakref.WeakKeyDictionary()  # loop -> {flight key: asyncio.Future}
+        self._loop_state_lock = threading.Lock()
+
+    @classmethod
+    def adaptive(cls, usage_tracker, **kwargs) -> 'LLMRouter':
+        """
+        Router whose routing adapts to the latency and failure history in usage_stats.
+
+        The policy is primed from the tracker's recent rows, then keeps
+        learning from every request this router makes.
+        """
+        policy = AdaptiveRoutingPolicy.from_usage_stats(
+            usage_tracker, local_model=get_ollama_client().default_model)
+        return cls(usage_tracker, routing_policy=policy, **kwargs)
+
     def route_and_execute(
         self,
         prompt: str,
         force_local: bool = False,
         force_api: bool = False,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        temperature: float = 0.7
     ) -> Dict:
         """
         Route prompt to appropriate LLM and execute.
@@ -287,12 +1273,13 @@ class LLMRouter:
             force_local: Force use of local LLM
             force_api: Force use of Claude API
             model: Specific model to use (for local)
+            temperature: Sampling temperature (for local)
 
         Returns:
             Dict with keys:
                 - success: bool
                 - response: str (LLM response)
-                - provider: str ('ollama' or 'claude')
+                - provider: str ('ollama', 'claude', or 'cache' for a response cache hit)
                 - model: str
                 - routing_reason: str
                 - complexity_score: float
@@ -300,68 +1287,718 @@ class LLMRouter:
                 - time_ms: float
                 - cost_usd: float (estimated)
                 - savings_usd: float (estimated savings vs always using Claude)
+                - coalesced: bool (present when this call shared an identical
+                  in-flight request's generation: in this process, or in
+                  another one sharing the response cache database)
+        """
+        result = self._route(prompt, force_local, force_api, model, temperature)
+        self._observe(result)
+
+        # Track usage
+        if self.usage_tracker:
+            self.usage_tracker.log_usage(result['provider'], prompt, result)
+
+        return result
+
+    def route_many(
+        self,
+        prompts: List[str],
+        concurrency: Optional[int] = None,
+        force_local: bool = False,
+        force_api: bool = False,
+        model: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> List[Dict]:
+        """
+        Route and execute many prompts concurrently.
+
+        Requests to each provider are capped by PROVIDER_CONCURRENCY, so a large
+        batch keeps Ollama saturated without queueing past what it can serve.
+        Local prompts are started grouped by the model they will run on, warm
+        models first, so Ollama swaps models as few times as possible.
+        Usage is logged in one batch once every prompt has finished.
+
+        Args:
+            prompts: Prompts to run
+            concurrency: Max prompts in flight overall (default: sum of provider limits)
+            force_local, force_api, model, temperature: As for route_and_execute()
+
+        Returns:
+            One result dict per prompt, in input order. A prompt that raised
+            gets {'success': False, 'error': ...} instead of failing the batch.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not prompts:
+            return []
+
+        def run(index: int) -> Dict:
+            try:
+                return self._route(prompts[index], force_local, force_api, model, temperature)
+            except Exception as e:
+                return self._failed_result(e)
+
+        if force_api:
+            order = list(range(len(prompts)))
+        else:
+            planned = [
+                (model or self.scheduler.pick_model(analysis['complexity_score']))
+                if force_local or analysis['use_local'] else None
+                for analysis in self.analyzer.analyze_many(prompts)
+            ]
+            order = self.scheduler.batch_order(planned)
+
+        workers = min(concurrency or sum(PROVIDER_CONCURRENCY.values()), len(prompts))
+        results: List[Optional[Dict]] = [None] * len(prompts)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, result in zip(order, executor.map(run, order)):
+                results[index] = result
+
+        for result in results:
+            self._observe(result)
+        self._log_batch(prompts, results)
+        return results
+
+    def route_and_stream(
+        self,
+        prompt: str,
+        force_local: bool = False,
+        force_api: bool = False,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        first_token_timeout: float = LOCAL_FIRST_TOKEN_TIMEOUT,
+        stall_timeout: float = LOCAL_STALL_TIMEOUT
+    ) -> RoutedStream:
+        """
+        Route prompt like route_and_execute(), streaming the response.
+
+        Local output is yielded as Ollama produces it. If the local stream
+        errors, or produces nothing for first_token_timeout seconds before the
+        first token / stall_timeout seconds after it, the request fails over
+        to Claude API, which continues from the text already streamed.
+
+        Usage:
+            stream = router.route_and_stream("Summarize ...")
+            for chunk in stream:
+                print(chunk, end='', flush=True)
+            print(stream.result['ttft_ms'])
+
+        Returns:
+            RoutedStream; its result is logged to the usage tracker (with
+            time-to-first-token and tokens/sec) when the stream completes.
+            Closing it early logs nothing and leaves an aborted result.
+        """
+        stream = RoutedStream()
+        stream._chunks = self._stream_chunks(
+            stream, prompt, force_local, force_api, model, temperature,
+            first_token_timeout, stall_timeout
+        )
+        return stream
+
+    def _stream_chunks(self, stream: RoutedStream, prompt: str, force_local: bool,
+                       force_api: bool, model: Optional[str], temperature: float,
+                       first_token_timeout: float, stall_timeout: float):
+        """Generator behind route_and_stream()."""
+        start_time = time.time()
+        first_chunk_at = None
+        result = None
+        generated_tokens, eval_seconds = 0, None
+
+        cache_model = self._cache_model(force_local, force_api, model)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(prompt, cache_model, temperature)
+            if cached is not None:
+                result = self._cached_result(cached, start_time)
+                stream.provider = 'cache'
+                first_chunk_at = time.time()
+                yield result['response']
+
+        if result is None:
+            analysis = self._analyze(prompt, force_local, force_api, model)
+            model = self._local_model(model, analysis)
+            estimated_input_tokens = self.tokens.count(prompt)
+            streamed: List[str] = []
+
+            if analysis['use_local'] and self.ollama.is_available():
+                stream.provider = 'ollama'
+                try:
+                    parts, note = self._fit_local(prompt)
+                    local = {'success': True, 'model': model or self.ollama.default_model,
+                             'tokens': 0, 'input_tokens': 0, 'load_ms': 0.0, 'context_note': note}
+                    eval_ns = 0
+                    for index, part in enumerate(parts):
+                        if index:
+                            streamed.append('\n\n')
+                            yield '\n\n'
+                        for event in self._stream_local(part, model, temperature,
+                                                        first_token_timeout, stall_timeout):
+                            text = event.get('response')
+                            if text:
+                                if first_chunk_at is None:
+                                    first_chunk_at = time.time()
+                                streamed.append(text)
+                                yield text
+                            if event.get('done'):
+                                local['tokens'] += event.get('eval_count', 0)
+                                local['input_tokens'] += event.get('prompt_eval_count', 0)
+                                local['load_ms'] += event.get('load_duration', 0) / 1e6
+                                eval_ns += event.get('eval_duration', 0)
+                                self.scheduler.record(local['model'], event.get('load_duration', 0) / 1e6)
+                    local['response'] = ''.join(streamed)
+                    result = self._ollama_result(local, analysis, estimated_input_tokens, start_time)
+                    generated_tokens, eval_seconds = local['tokens'], eval_ns / 1e9
+
+                except Exception as e:
+                    error = f"stalled: {e}" if isinstance(e, LocalStreamStalled) else str(e)
+                    self._local_failed(analysis, {'error': error})
+                    if streamed:
+                        analysis['reason'] += f" after {len(streamed)} streamed chunks"
+
+            if result is None:
+                stream.provider = 'claude'
+                api_prompt = prompt
+                if streamed:
+                    # Fail over mid-response: ask the API to carry on from the streamed text
+                    api_prompt = (f"{prompt}\n\n[Partial answer so far]\n{''.join(streamed)}\n\n"
+                                  f"[Continue the answer exactly where it stops]")
+                with self._limits['claude']:
+                    result = self._use_claude_api(api_prompt, analysis,
+                                                  self.tokens.count(api_prompt), start_time)
+                if first_chunk_at is None:
+                    first_chunk_at = time.time()
+                yield result['response']
+                result['response'] = ''.join(streamed) + result['response']
+
+            if self.response_cache is not None and result['success']:
+                self.response_cache.put(prompt, cache_model, temperature, result)
+
+        end_time = time.time()
+        result['time_ms'] = (end_time - start_time) * 1000
+        result['ttft_ms'] = (first_chunk_at - start_time) * 1000 if first_chunk_at else None
+        result['tokens_per_sec'] = None
+        if generated_tokens and eval_seconds:
+            # Ollama's own generation rate excludes queueing and prompt processing
+            result['tokens_per_sec'] = generated_tokens / eval_seconds
+        elif first_chunk_at and end_time - first_chunk_at > 0.001 and result['provider'] != 'cache':
+            result['tokens_per_sec'] = self.tokens.count(result['response']) / (end_time - first_chunk_at)
+        stream.result = result
+        self._observe(result)
+
+        # Track usage
+        if self.usage_tracker:
+            self.usage_tracker.log_usage(result['provider'], prompt, result)
+
+    def _stream_local(self, prompt: str, model: Optional[str], temperature: float,
+                      first_token_timeout: float, stall_timeout: float):
+        """
+        Ollama stream events, raising LocalStreamStalled past the deadlines.
+
+        The HTTP stream is read on a worker thread so a silent connection can
+        be abandoned without waiting for the socket timeout. Abandoning it
+        also frees its Ollama concurrency slot, even though the worker may
+        stay blocked on the socket until Ollama finishes or times out.
+        """
+        events: 'queue.Queue' = queue.Queue()
+        stop = threading.Event()
+        finished = object()
+        slot = self._limits['ollama']
+        slot_lock = threading.Lock()
+        held = []  # non-empty while the worker holds the Ollama slot
+
+        def release_slot():
+            # Whichever side finishes first releases: the worker at the end of
+            # the stream, or the consumer when it stops reading
+            with slot_lock:
+                if held:
+                    held.pop()
+                    slot.release()
+
+        def produce():
+            try:
+                slot.acquire()
+                with slot_lock:
+                    held.append(True)
+                if stop.is_set():
+                    return
+                source = self.ollama.stream_events(prompt, model, temperature, self.context_tokens)
+                try:
+                    for event in source:
+                        if stop.is_set():
+                            break
+                        events.put(event)
+                finally:
+                    source.close()
+            except Exception as e:
+                events.put(e)
+            finally:
+                release_slot()
+                events.put(finished)
+
+        threading.Thread(target=produce, name='ollama-stream', daemon=True).start()
+        timeout = first_token_timeout
+        try:
+            while True:
+                try:
+                    item = events.get(timeout=timeout)
+                except queue.Empty:
+                    raise LocalStreamStalled(f"no output for {timeout:g}s")
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                if item.get('response'):
+                    timeout = stall_timeout
+        finally:
+            stop.set()
+            release_slot()
+
+    async def aroute(
+        self,
+        prompt: str,
+        force_local: bool = False,
+        force_api: bool = False,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        log_usage: bool = True
+    ) -> Dict:
+        """
+        Async route_and_execute().
+
+        Local queries go through OllamaClient.aquery() (httpx when installed),
+        limited per provider like route_many().
+
+        Args:
+            log_usage: Log this call to the usage tracker (aroute_many logs in bulk)
         """
         start_time = time.time()
+        key = self._flight_key(prompt, force_local, force_api, model, temperature)
+        flights = self._loop_state(self._ainflight, dict)
+
+        result = None
+        while result is None:
+            flight = flights.get(key)
+            if flight is not None:
+                try:
+                    # shield: a cancelled follower must not cancel the shared generation
+                    result = self._coalesced_result(await asyncio.shield(flight), start_time)
+                except _LeaderCancelled:
+                    pass  # The leader was cancelled, not this call: retry (the first retry leads)
+                continue
+
+            flight = flights[key] = asyncio.get_running_loop().create_future()
+            try:
+                result = await self._aroute_once(prompt, force_local, force_api, model,
+                                                 temperature, start_time)
+                flight.set_result(result)
+            except asyncio.CancelledError:
+                # Cancelling the future would cancel every follower; hand them a retry instead
+                flight.set_exception(_LeaderCancelled())
+                flight.exception()  # mark retrieved when nobody else was waiting
+                raise
+            except BaseException as e:
+                flight.set_exception(e)
+                flight.exception()
+                raise
+            finally:
+                flights.pop(key, None)
+
+        self._observe(result)
+        if log_usage and self.usage_tracker:
+            await asyncio.to_thread(self.usage_tracker.log_usage, result['provider'], prompt, result)
+        return result
+
+    async def _aroute_once(self, prompt: str, force_local: bool, force_api: bool,
+                           model: Optional[str], temperature: float, start_time: float) -> Dict:
+        """
+        aroute() for a prompt not already in flight on this loop, without
+        logging usage. Claims the key across processes like _route_once().
+        """
+        result = None
+        cache_model = self._cache_model(force_local, force_api, model)
+        cache = self.response_cache
+        owner = None
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, prompt, cache_model, temperature)
+            if cached is not None:
+                return self._cached_result(cached, start_time)
+            key = cache.make_key(prompt, cache_model, temperature)
+            owner = await asyncio.to_thread(cache.claim, key)
+            if owner is None:
+                cached = await asyncio.to_thread(cache.wait_for, prompt, cache_model, temperature)
+                if cached is not None:
+                    return self._coalesced_result(self._cached_result(cached, start_time), start_time)
+
+        try:
+            return await self._agenerate(prompt, force_local, force_api, model, temperature,
+                                         start_time, cache_model)
+        finally:
+            if owner is not None:
+                await asyncio.to_thread(cache.release, key, owner)
+
+    async def _agenerate(self, prompt: str, force_local: bool, force_api: bool, model: Optional[str],
+                         temperature: float, start_time: float, cache_model: str) -> Dict:
+        """Async _execute() plus caching of a successful result."""
+        analysis = self._analyze(prompt, force_local, force_api, model)
+        model = await self._alocal_model(model, analysis)
+        estimated_input_tokens = self.tokens.count(prompt)
+
+        result = None
+        if analysis['use_local'] and await self.ollama.ais_available():
+            local = await self._aquery_local(prompt, model, temperature)
+            if local['success']:
+                result = self._ollama_result(local, analysis, estimated_input_tokens, start_time)
+            else:
+                self._local_failed(analysis, local)
+
+        if result is None:
+            async with self._async_limit('claude'):
+                result = self._use_claude_api(prompt, analysis, estimated_input_tokens, start_time)
 
-        # Analyze complexity (unless forced)
+        if self.response_cache is not None and result['success']:
+            await asyncio.to_thread(self.response_cache.put, prompt, cache_model, temperature, result)
+        return result
+
+    async def aroute_many(
+        self,
+        prompts: List[str],
+        force_local: bool = False,
+        force_api: bool = False,
+        model: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> List[Dict]:
+        """Async route_many(): results in input order, usage logged in one batch."""
+        results = await asyncio.gather(
+            *[self.aroute(prompt, force_local, force_api, model, temperature, log_usage=False)
+              for prompt in prompts],
+            return_exceptions=True
+        )
+        results = [self._failed_result(r) if isinstance(r, BaseException) else r for r in results]
+        if self.usage_tracker:
+            await asyncio.to_thread(self._log_batch, prompts, results)
+        return results
+
+    def _async_limit(self, provider: str) -> asyncio.Semaphore:
+        """Per-provider semaphore for the running event loop."""
+        limits = self._loop_state(self._async_limits, lambda: {
+            name: asyncio.Semaphore(limit) for name, limit in PROVIDER_CONCURRENCY.items()
+        })
+        return limits[provider]
+
+    def _loop_state(self, states: weakref.WeakKeyDictionary, factory: Callable):
+        """The running event loop's entry in states, created with factory() on first use."""
+        loop = asyncio.get_running_loop()
+        with self._loop_state_lock:
+            state = states.get(loop)
+            if state is None:
+                state = states[loop] = factory()
+            return state
+
+    def _analyze(self, prompt: str, force_local: bool, force_api: bool,
+                 model: Optional[str] = None) -> Dict:
+        """Routing decision for prompt (unless forced), adjusted by the routing policy."""
         if force_api:
-            analysis = {
+            return {
                 'use_local': False,
                 'confidence': 1.0,
                 'reason': 'Forced to use Claude API',
                 'complexity_score': 1.0
             }
         elif force_local:
-            analysis = {
+            return {
                 'use_local': True,
                 'confidence': 1.0,
                 'reason': 'Forced to use local LLM',
                 'complexity_score': 0.0
             }
-        else:
-            analysis = self.analyzer.analyze(prompt)
+        analysis = self.analyzer.analyze(prompt)
+        if self.routing_policy is not None:
+            analysis = self.routing_policy.choose(analysis, model)
+        return analysis
+
+    def _local_model(self, model: Optional[str], analysis: Dict) -> Optional[str]:
+        """Ollama model for a prompt routed locally: as requested, else policy's, else scheduler's."""
+        if model or not analysis['use_local']:
+            return model
+        return analysis.get('model') or self.scheduler.pick_model(analysis['complexity_score'])
+
+    async def _alocal_model(self, model: Optional[str], analysis: Dict) -> Optional[str]:
+        """Async _local_model(); refreshes the loaded models (/api/ps) off the event loop."""
+        if model or not analysis['use_local'] or analysis.get('model') or not self.scheduler.needs_refresh():
+            return self._local_model(model, analysis)
+        return await asyncio.to_thread(self._local_model, model, analysis)
+
+    def _flight_key(self, prompt: str, force_local: bool, force_api: bool,
+                    model: Optional[str], temperature: float) -> str:
+        """Key under which identical concurrent requests are coalesced."""
+        return ResponseCache.make_key(prompt, self._cache_model(force_local, force_api, model), temperature)
+
+    def _observe(self, result: Dict):
+        """Feed a finished request to the routing policy (coalesced copies add nothing)."""
+        if self.routing_policy is not None and not result.get('coalesced'):
+            self.routing_policy.observe(result)
+
+    def _route(self, prompt: str, force_local: bool, force_api: bool,
+               model: Optional[str], temperature: float = 0.7) -> Dict:
+        """
+        Route and execute one prompt (or serve it from the cache) without logging usage.
 
-        # Estimate token count
-        estimated_input_tokens = len(prompt.split()) * 1.3  # Rough estimate
+        A request identical to one already running in this process (same
+        prompt, routing, model and temperature) waits for that generation
+        instead of starting its own, and gets a copy of its result marked
+        coalesced. With a response cache, requests running in other
+        processes sharing its database are coalesced too (see _route_once).
+        """
+        start_time = time.time()
+        key = self._flight_key(prompt, force_local, force_api, model, temperature)
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            return self._coalesced_result(flight.wait(), start_time)
+
+        try:
+            flight.result = self._route_once(prompt, force_local, force_api, model,
+                                             temperature, start_time)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def _route_once(self, prompt: str, force_local: bool, force_api: bool,
+                    model: Optional[str], temperature: float, start_time: float) -> Dict:
+        """
+        _route() for a prompt not already in flight in this process.
+
+        On a cache miss the key is claimed in the cache database; if another
+        process holds the claim, this waits for its answer to be cached and
+        returns that (marked coalesced), and only generates itself if the
+        other process fails.
+        """
+        cache_model = self._cache_model(force_local, force_api, model)
+        cache = self.response_cache
+        owner = None
+        if cache is not None:
+            cached = cache.get(prompt, cache_model, temperature)
+            if cached is not None:
+                return self._cached_result(cached, start_time)
+            key = cache.make_key(prompt, cache_model, temperature)
+            owner = cache.claim(key)
+            if owner is None:
+                cached = cache.wait_for(prompt, cache_model, temperature)
+                if cached is not None:
+                    return self._coalesced_result(self._cached_result(cached, start_time), start_time)
+
+        try:
+            result = self._execute(prompt, force_local, force_api, model, temperature, start_time)
+            if cache is not None and result['success']:
+                cache.put(prompt, cache_model, temperature, result)
+        finally:
+            if owner is not None:
+                cache.release(key, owner)
+        return result
+
+    def _execute(self, prompt: str, force_local: bool, force_api: bool,
+                 model: Optional[str], temperature: float, start_time: float) -> Dict:
+        """Send prompt to the provider it routes to, falling back to Claude API."""
+        analysis = self._analyze(prompt, force_local, force_api, model)
+        model = self._local_model(model, analysis)
+
+        # Count prompt tokens
+        estimated_input_tokens = self.tokens.count(prompt)
 
         # Try local LLM first if routed there
         if analysis['use_local'] and self.ollama.is_available():
-            result = self.ollama.query(prompt, model=model)
+            result = self._query_local(prompt, model, temperature)
 
             if result['success']:
-                elapsed_ms = (time.time() - start_time) * 1000
-                output_tokens = result.get('tokens', len(result['response'].split()) * 1.3)
+                return self._ollama_result(result, analysis, estimated_input_tokens, start_time)
+            self._local_failed(analysis, result)
 
-                # Calculate savings (what it would have cost with Claude)
-                claude_cost = (estimated_input_tokens * self.CLAUDE_COST_INPUT / 1_000_000 +
-                              output_tokens * self.CLAUDE_COST_OUTPUT / 1_000_000)
+        # Use Claude API (either routed here or fallback)
+        with self._limits['claude']:
+            return self._use_claude_api(prompt, analysis, estimated_input_tokens, start_time)
 
-                final_result = {
-                    'success': True,
-                    'response': result['response'],
-                    'provider': 'ollama',
-                    'model': result['model'],
-                    'routing_reason': analysis['reason'],
-                    'complexity_score': analysis['complexity_score'],
-                    'tokens': int(estimated_input_tokens + output_tokens),
-                    'time_ms': elapsed_ms,
-                    'cost_usd': 0.0,
-                    'savings_usd': claude_cost
-                }
+    def estimate_cost(self, prompt: str, output_tokens: int = 0) -> Dict:
+        """
+        Pre-flight token count and Claude API cost for prompt.
 
-                # Track usage
-                if self.usage_tracker:
-                    self.usage_tracker.log_usage('ollama', prompt, final_result)
+        Args:
+            prompt: Prompt to send
+            output_tokens: Expected response length in tokens
 
-                return final_result
-            else:
-                # Local LLM failed, fallback to Claude API
-                print(f"⚠️  Local LLM failed: {result['error']}, falling back to Claude API")
-                analysis['use_local'] = False
-                analysis['reason'] = f"Local LLM failed ({result['error']}), using Claude API"
+        Returns:
+            Dict with input_tokens, output_tokens, claude_cost_usd and
+            fits_local_context (False = would be trimmed/chunked for Ollama)
+        """
+        input_tokens = self.tokens.count(prompt)
+        return {
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'claude_cost_usd': self._claude_cost(input_tokens, output_tokens),
+            'fits_local_context': input_tokens <= self._local_prompt_budget(),
+        }
 
-        # Use Claude API (either routed here or fallback)
-        return self._use_claude_api(prompt, analysis, estimated_input_tokens, start_time)
+    def _claude_cost(self, input_tokens: float, output_tokens: float) -> float:
+        return (input_tokens * self.CLAUDE_COST_INPUT / 1_000_000 +
+                output_tokens * self.CLAUDE_COST_OUTPUT / 1_000_000)
+
+    def _local_prompt_budget(self) -> int:
+        """Prompt tokens that fit the local context window with room for a response."""
+        return max(1, self.context_tokens - OUTPUT_TOKEN_RESERVE)
+
+    def _fit_local(self, prompt: str) -> Tuple[List[str], Optional[str]]:
+        """Prompt parts that fit the local context window, plus a note if it was changed."""
+        budget = self._local_prompt_budget()
+        if self.tokens.count(prompt) <= budget:
+            return [prompt], None
+        if self.context_overflow == 'chunk':
+            parts = self.tokens.chunk(prompt, budget)
+            return parts, f"split into {len(parts)} chunks for {self.context_tokens}-token context"
+        trimmed, _ = self.tokens.trim(prompt, budget)
+        return [trimmed], f"trimmed to {budget} tokens for {self.context_tokens}-token context"
+
+    @staticmethod
+    def _merge_local(results: List[Dict], note: Optional[str]) -> Dict:
+        """Combine the local results for each prompt part into one."""
+        failed = next((r for r in results if not r['success']), None)
+        if failed is not None:
+            return failed
+        merged = dict(results[0])
+        if len(results) > 1:
+            merged['response'] = '\n\n'.join(r['response'] for r in results)
+            for key in ('tokens', 'input_tokens', 'load_ms', 'time_ms'):
+                merged[key] = sum(r.get(key) or 0 for r in results)
+        merged['context_note'] = note
+        return merged
+
+    def _query_local(self, prompt: str, model: Optional[str], temperature: float) -> Dict:
+        """Query Ollama with prompt fitted to the context window."""
+        parts, note = self._fit_local(prompt)
+        results = []
+        for part in parts:
+            with self._limits['ollama']:
+                result = self.ollama.query(part, model=model, temperature=temperature,
+                                           num_ctx=self.context_tokens)
+            if result['success']:
+                self.scheduler.record(result['model'], result.get('load_ms'))
+            results.append(result)
+            if not result['success']:
+                break
+        return self._merge_local(results, note)
+
+    async def _aquery_local(self, prompt: str, model: Optional[str], temperature: float) -> Dict:
+        """Async _query_local(); chunks run concurrently within the Ollama limit."""
+        parts, note = self._fit_local(prompt)
+
+        async def run(part: str) -> Dict:
+            async with self._async_limit('ollama'):
+                result = await self.ollama.aquery(part, model=model, temperature=temperature,
+                                                  num_ctx=self.context_tokens)
+            if result['success']:
+                self.scheduler.record(result['model'], result.get('load_ms'))
+            return result
+
+        return self._merge_local(list(await asyncio.gather(*[run(part) for part in parts])), note)
+
+    def _cache_model(self, force_local: bool, force_api: bool, model: Optional[str]) -> str:
+        """Model part of the response cache key (includes how the prompt was routed)."""
+        route = 'api' if force_api else 'local' if force_local else 'auto'
+        return f"{route}:{model or self.ollama.default_model}"
+
+    @staticmethod
+    def _coalesced_result(result: Dict, start_time: float) -> Dict:
+        """A waiting caller's copy of the in-flight request's result."""
+        coalesced = dict(result)
+        coalesced.update({
+            'coalesced': True,
+            'routing_reason': f"{result.get('routing_reason')} (coalesced with in-flight request)",
+            'time_ms': (time.time() - start_time) * 1000,
+            'cost_usd': 0.0,
+            # Sharing the generation avoided paying for it again
+            'savings_usd': (result.get('cost_usd') or 0.0) + (result.get('savings_usd') or 0.0),
+        })
+        return coalesced
+
+    @staticmethod
+    def _cached_result(cached: Dict, start_time: float) -> Dict:
+        """Build the routed result for a response cache hit."""
+        return {
+            'success': True,
+            'response': cached['response'],
+            'provider': 'cache',
+            'model': cached['source_model'],
+            'routing_reason': f"Cache hit ({cached['match']}, originally {cached['source_provider']})",
+            'complexity_score': cached['complexity_score'],
+            'tokens': cached['tokens'],
+            'time_ms': (time.time() - start_time) * 1000,
+            'cost_usd': 0.0,
+            # A hit avoids the full API cost of the answer
+            'savings_usd': cached['api_cost_usd'] or 0.0
+        }
+
+    def _ollama_result(self, result: Dict, analysis: Dict,
+                       estimated_input_tokens: float, start_time: float) -> Dict:
+        """Build the routed result for a successful local query."""
+        elapsed_ms = (time.time() - start_time) * 1000
+        # Prefer Ollama's own counts; fall back to the local tokenizer
+        output_tokens = result.get('tokens') or self.tokens.count(result['response'])
+        input_tokens = result.get('input_tokens') or estimated_input_tokens
+
+        # Calculate savings (what Claude would have charged for the full prompt)
+        claude_cost = self._claude_cost(estimated_input_tokens, output_tokens)
+
+        reason = analysis['reason']
+        if result.get('context_note'):
+            reason = f"{reason} ({result['context_note']})"
+
+        return {
+            'success': True,
+            'response': result['response'],
+            'provider': 'ollama',
+            'model': result['model'],
+            'routing_reason': reason,
+            'complexity_score': analysis['complexity_score'],
+            'tokens': int(input_tokens + output_tokens),
+            'time_ms': elapsed_ms,
+            'load_ms': result.get('load_ms'),
+            'cost_usd': 0.0,
+            'savings_usd': claude_cost
+        }
+
+    @staticmethod
+    def _local_failed(analysis: Dict, result: Dict):
+        """Local LLM failed, fallback to Claude API."""
+        print(f"⚠️  Local LLM failed: {result['error']}, falling back to Claude API")
+        analysis['use_local'] = False
+        analysis['reason'] = f"Local LLM failed ({result['error']}), using Claude API"
+
+    @staticmethod
+    def _failed_result(error: BaseException) -> Dict:
+        """Result for a batch prompt that raised."""
+        return {
+            'success': False,
+            'response': None,
+            'provider': None,
+            'error': str(error)
+        }
+
+    def _log_batch(self, prompts: List[str], results: List[Dict]):
+        """Log a batch of routed results in one write."""
+        if not self.usage_tracker:
+            return
+        self.usage_tracker.log_usage_many([
+            (result['provider'], prompt, result)
+            for prompt, result in zip(prompts, results)
+            if result.get('provider')
+        ])
 
     def _use_claude_api(self, prompt: str, analysis: Dict,
                        estimated_input_tokens: float, start_time: float) -> Dict:
@@ -377,12 +2014,11 @@ class LLMRouter:
 
         # Simulate Claude response
         simulated_response = f"[CLAUDE API] This is a simulated response to: {prompt[:100]}..."
-        output_tokens = len(simulated_response.split()) * 1.3
+        output_tokens = self.tokens.count(simulated_response)
 
-        cost = (estimated_input_tokens * self.CLAUDE_COST_INPUT / 1_000_000 +
-                output_tokens * self.CLAUDE_COST_OUTPUT / 1_000_000)
+        cost = self._claude_cost(estimated_input_tokens, output_tokens)
 
-        result = {
+        return {
             'success': True,
             'response': simulated_response,
             'provider': 'claude',
@@ -395,17 +2031,16 @@ class LLMRouter:
             'savings_usd': 0.0  # No savings when using Claude
         }
 
-        # Track usage
-        if self.usage_tracker:
-            self.usage_tracker.log_usage('claude', prompt, result)
-
-        return result
-
     def get_routing_stats(self) -> Dict:
         """Get routing statistics."""
-        if self.usage_tracker:
-            return self.usage_tracker.get_stats()
-        return {}
+        stats = self.usage_tracker.get_stats() if self.usage_tracker else {}
+        if self.response_cache is not None:
+            stats['response_cache'] = self.response_cache.get_stats()
+        stats['token_counter'] = self.tokens.get_stats()
+        if self.routing_policy is not None:
+            stats['routing_policy'] = self.routing_policy.get_stats()
+        stats['local_models'] = self.scheduler.get_stats()
+        return stats
 
 
 # Convenience functions for direct use
@@ -420,7 +2055,7 @@ def query_local_llm(prompt: str, model: str = "llama3.1:8b") -> str:
     Returns:
         LLM response text
     """
-    ollama = OllamaClient()
+    ollama = get_ollama_client()
     result = ollama.query(prompt, model=model)
 
     if result['success']:
@@ -440,13 +2075,13 @@ def stream_local_llm(prompt: str, model: str = "llama3.1:8b"):
     Yields:
         Response chunks
     """
-    ollama = OllamaClient()
+    ollama = get_ollama_client()
     yield from ollama.stream(prompt, model=model)
 
 
 def check_ollama_available() -> bool:
     """Check if Ollama is running and available."""
-    ollama = OllamaClient()
+    ollama = get_ollama_client()
     return ollama.is_available()
 
 
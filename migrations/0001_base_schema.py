@@ -0,0 +1,84 @@
+"""
+Core knowledge base tables: athletes, content ideas, research findings, tasks.
+Matches the schema init_db.py used to create.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS athletes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            sport TEXT NOT NULL,
+            team TEXT,
+            contract_value REAL,
+            contract_year INTEGER,
+            deal_type TEXT,
+            key_details TEXT,
+            analysis_notes TEXT,
+            last_updated TIMESTAMP NOT NULL,
+            source_file TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS content_ideas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            category TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'draft',
+            content TEXT NOT NULL,
+            created_date TIMESTAMP NOT NULL,
+            scheduled_date TIMESTAMP,
+            published_date TIMESTAMP,
+            platform TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS research_findings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic TEXT NOT NULL,
+            category TEXT NOT NULL,
+            findings TEXT NOT NULL,
+            sources TEXT,
+            created_date TIMESTAMP NOT NULL,
+            tags TEXT
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            category TEXT NOT NULL,
+            priority TEXT NOT NULL DEFAULT 'medium',
+            status TEXT NOT NULL DEFAULT 'pending',
+            created_date TIMESTAMP NOT NULL,
+            completed_date TIMESTAMP,
+            notes TEXT
+        )
+    """)
+
+    # Athletes indexes
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_athletes_sport ON athletes(sport)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_athletes_team ON athletes(team)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_athletes_deal_type ON athletes(deal_type)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_athletes_contract_value ON athletes(contract_value)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_athletes_name_lower ON athletes(LOWER(name))")
+
+    # Content ideas indexes
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_category ON content_ideas(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_status ON content_ideas(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_platform ON content_ideas(platform)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_scheduled_date ON content_ideas(scheduled_date)")
+
+    # Research findings indexes
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_research_category ON research_findings(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_research_created_date ON research_findings(created_date)")
+
+    # Tasks indexes
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created_date ON tasks(created_date)")
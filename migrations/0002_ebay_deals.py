@@ -0,0 +1,28 @@
+"""
+eBay deals tracking table (formerly add_ebay_table.py).
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ebay_deals (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          card_name TEXT NOT NULL,
+          listing_url TEXT,
+          current_price REAL,
+          market_value REAL,
+          discount_percent REAL,
+          deal_score REAL,
+          seller_name TEXT,
+          seller_feedback REAL,
+          photo_count INTEGER,
+          listing_age_days INTEGER,
+          date_found TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+          status TEXT DEFAULT 'new',
+          notes TEXT
+        )
+    """)
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ebay_deals_score ON ebay_deals(deal_score DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ebay_deals_status ON ebay_deals(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ebay_deals_date ON ebay_deals(date_found DESC)")
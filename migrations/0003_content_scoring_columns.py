@@ -0,0 +1,15 @@
+"""
+Quality scoring, source and usage tracking columns on content_ideas
+(formerly scripts/extend-content-schema.py).
+"""
+
+from schema_migrations import add_column
+
+
+def upgrade(conn):
+    add_column(conn, 'content_ideas', 'quality_score', "INTEGER DEFAULT 7")
+    add_column(conn, 'content_ideas', 'source', "TEXT")
+
+    # Used by automation/content_pool_manager.py for cooldown and recycling
+    add_column(conn, 'content_ideas', 'last_used', "TIMESTAMP")
+    add_column(conn, 'content_ideas', 'usage_count', "INTEGER DEFAULT 0")
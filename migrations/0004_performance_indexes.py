@@ -0,0 +1,24 @@
+"""
+Indexes for the content generator and research bulk-insert lookups
+(formerly automation/add-performance-indexes.py).
+"""
+
+
+def upgrade(conn):
+    # Quality score filtering
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_quality_score ON content_ideas(quality_score)")
+
+    # Generator pattern: category + status + quality_score
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_content_composite
+        ON content_ideas(category, status, quality_score DESC)
+    """)
+
+    # Source lookups from research scripts
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_source ON content_ideas(source)")
+
+    # Recent content sorting
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_created_desc ON content_ideas(created_date DESC)")
+
+    # Conflict checks in JettDB.add_research_many()
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_research_topic ON research_findings(topic, category)")
@@ -0,0 +1,18 @@
+"""
+Indexed topic_key column on content_ideas for duplicate checks.
+Building the index computes the key for every existing row.
+
+The SQL is frozen here: topic_key strips the ' - LOW/HIGH/MEDIUM' suffixes
+that jett_db.TOPIC_PRIORITY_SUFFIXES held when this migration was written.
+"""
+
+from schema_migrations import column_names
+
+
+def upgrade(conn):
+    if 'topic_key' not in column_names(conn, 'content_ideas'):
+        conn.execute("""
+            ALTER TABLE content_ideas ADD COLUMN topic_key TEXT GENERATED ALWAYS AS
+            (REPLACE(REPLACE(REPLACE(topic, ' - LOW', ''), ' - HIGH', ''), ' - MEDIUM', '')) VIRTUAL
+        """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_content_topic_key ON content_ideas(topic_key)")
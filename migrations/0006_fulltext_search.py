@@ -0,0 +1,81 @@
+"""
+FTS5 full-text indexes for athletes, content ideas and research findings.
+Triggers keep them in sync; the rebuild indexes rows that already exist.
+"""
+
+
+def upgrade(conn):
+    # athletes
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS athletes_fts USING fts5(
+            name, key_details, analysis_notes, content='athletes', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS athletes_fts_ai AFTER INSERT ON athletes BEGIN
+            INSERT INTO athletes_fts(rowid, name, key_details, analysis_notes) VALUES (new.id, new.name, new.key_details, new.analysis_notes);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS athletes_fts_ad AFTER DELETE ON athletes BEGIN
+            INSERT INTO athletes_fts(athletes_fts, rowid, name, key_details, analysis_notes) VALUES ('delete', old.id, old.name, old.key_details, old.analysis_notes);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS athletes_fts_au AFTER UPDATE OF name, key_details, analysis_notes ON athletes BEGIN
+            INSERT INTO athletes_fts(athletes_fts, rowid, name, key_details, analysis_notes) VALUES ('delete', old.id, old.name, old.key_details, old.analysis_notes);
+            INSERT INTO athletes_fts(rowid, name, key_details, analysis_notes) VALUES (new.id, new.name, new.key_details, new.analysis_notes);
+        END
+    """)
+    conn.execute("INSERT INTO athletes_fts(athletes_fts) VALUES ('rebuild')")
+
+    # content_ideas
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS content_ideas_fts USING fts5(
+            topic, content, content='content_ideas', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS content_ideas_fts_ai AFTER INSERT ON content_ideas BEGIN
+            INSERT INTO content_ideas_fts(rowid, topic, content) VALUES (new.id, new.topic, new.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS content_ideas_fts_ad AFTER DELETE ON content_ideas BEGIN
+            INSERT INTO content_ideas_fts(content_ideas_fts, rowid, topic, content) VALUES ('delete', old.id, old.topic, old.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS content_ideas_fts_au AFTER UPDATE OF topic, content ON content_ideas BEGIN
+            INSERT INTO content_ideas_fts(content_ideas_fts, rowid, topic, content) VALUES ('delete', old.id, old.topic, old.content);
+            INSERT INTO content_ideas_fts(rowid, topic, content) VALUES (new.id, new.topic, new.content);
+        END
+    """)
+    conn.execute("INSERT INTO content_ideas_fts(content_ideas_fts) VALUES ('rebuild')")
+
+    # research_findings
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS research_findings_fts USING fts5(
+            topic, findings, tags, content='research_findings', content_rowid='id',
+            tokenize='porter unicode61', prefix='2 3'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS research_findings_fts_ai AFTER INSERT ON research_findings BEGIN
+            INSERT INTO research_findings_fts(rowid, topic, findings, tags) VALUES (new.id, new.topic, new.findings, new.tags);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS research_findings_fts_ad AFTER DELETE ON research_findings BEGIN
+            INSERT INTO research_findings_fts(research_findings_fts, rowid, topic, findings, tags) VALUES ('delete', old.id, old.topic, old.findings, old.tags);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS research_findings_fts_au AFTER UPDATE OF topic, findings, tags ON research_findings BEGIN
+            INSERT INTO research_findings_fts(research_findings_fts, rowid, topic, findings, tags) VALUES ('delete', old.id, old.topic, old.findings, old.tags);
+            INSERT INTO research_findings_fts(rowid, topic, findings, tags) VALUES (new.id, new.topic, new.findings, new.tags);
+        END
+    """)
+    conn.execute("INSERT INTO research_findings_fts(research_findings_fts) VALUES ('rebuild')")
@@ -0,0 +1,137 @@
+"""
+Trigger-maintained row counters backing JettDB.get_stats().
+Counters are seeded from the existing rows in the same transaction.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stat_counters (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+    """)
+
+    # athletes: total and per-sport counts
+    conn.execute("DELETE FROM stat_counters WHERE scope = 'athletes' OR scope LIKE 'athletes.%'")
+    conn.execute("INSERT INTO stat_counters (scope, key, value) SELECT 'athletes', '*', COUNT(*) FROM athletes")
+    conn.execute("""
+        INSERT INTO stat_counters (scope, key, value)
+            SELECT 'athletes.sport', COALESCE(sport, ''), COUNT(*) FROM athletes
+            GROUP BY COALESCE(sport, '')
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS athletes_stats_ai AFTER INSERT ON athletes BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('athletes', '*', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('athletes.sport', COALESCE(new.sport, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS athletes_stats_ad AFTER DELETE ON athletes BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('athletes', '*', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('athletes.sport', COALESCE(old.sport, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS athletes_stats_au_sport AFTER UPDATE OF sport ON athletes BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('athletes.sport', COALESCE(old.sport, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('athletes.sport', COALESCE(new.sport, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+
+    # content_ideas: total and per-status counts
+    conn.execute("DELETE FROM stat_counters WHERE scope = 'content_ideas' OR scope LIKE 'content_ideas.%'")
+    conn.execute("INSERT INTO stat_counters (scope, key, value) SELECT 'content_ideas', '*', COUNT(*) FROM content_ideas")
+    conn.execute("""
+        INSERT INTO stat_counters (scope, key, value)
+            SELECT 'content_ideas.status', COALESCE(status, ''), COUNT(*) FROM content_ideas
+            GROUP BY COALESCE(status, '')
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS content_ideas_stats_ai AFTER INSERT ON content_ideas BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('content_ideas', '*', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('content_ideas.status', COALESCE(new.status, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS content_ideas_stats_ad AFTER DELETE ON content_ideas BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('content_ideas', '*', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('content_ideas.status', COALESCE(old.status, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS content_ideas_stats_au_status AFTER UPDATE OF status ON content_ideas BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('content_ideas.status', COALESCE(old.status, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('content_ideas.status', COALESCE(new.status, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+
+    # research_findings: total
+    conn.execute("DELETE FROM stat_counters WHERE scope = 'research_findings' OR scope LIKE 'research_findings.%'")
+    conn.execute("INSERT INTO stat_counters (scope, key, value) SELECT 'research_findings', '*', COUNT(*) FROM research_findings")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS research_findings_stats_ai AFTER INSERT ON research_findings BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('research_findings', '*', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS research_findings_stats_ad AFTER DELETE ON research_findings BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('research_findings', '*', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+        END
+    """)
+
+    # tasks: total and per-status counts
+    conn.execute("DELETE FROM stat_counters WHERE scope = 'tasks' OR scope LIKE 'tasks.%'")
+    conn.execute("INSERT INTO stat_counters (scope, key, value) SELECT 'tasks', '*', COUNT(*) FROM tasks")
+    conn.execute("""
+        INSERT INTO stat_counters (scope, key, value)
+            SELECT 'tasks.status', COALESCE(status, ''), COUNT(*) FROM tasks
+            GROUP BY COALESCE(status, '')
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('tasks', '*', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('tasks.status', COALESCE(new.status, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('tasks', '*', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('tasks.status', COALESCE(old.status, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_au_status AFTER UPDATE OF status ON tasks BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('tasks.status', COALESCE(old.status, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('tasks.status', COALESCE(new.status, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+
+    # ebay_deals: total and per-status counts
+    conn.execute("DELETE FROM stat_counters WHERE scope = 'ebay_deals' OR scope LIKE 'ebay_deals.%'")
+    conn.execute("INSERT INTO stat_counters (scope, key, value) SELECT 'ebay_deals', '*', COUNT(*) FROM ebay_deals")
+    conn.execute("""
+        INSERT INTO stat_counters (scope, key, value)
+            SELECT 'ebay_deals.status', COALESCE(status, ''), COUNT(*) FROM ebay_deals
+            GROUP BY COALESCE(status, '')
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS ebay_deals_stats_ai AFTER INSERT ON ebay_deals BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('ebay_deals', '*', 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('ebay_deals.status', COALESCE(new.status, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS ebay_deals_stats_ad AFTER DELETE ON ebay_deals BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('ebay_deals', '*', -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('ebay_deals.status', COALESCE(old.status, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS ebay_deals_stats_au_status AFTER UPDATE OF status ON ebay_deals BEGIN
+            INSERT INTO stat_counters (scope, key, value) VALUES ('ebay_deals.status', COALESCE(old.status, ''), -1) ON CONFLICT(scope, key) DO UPDATE SET value = value + -1;
+            INSERT INTO stat_counters (scope, key, value) VALUES ('ebay_deals.status', COALESCE(new.status, ''), 1) ON CONFLICT(scope, key) DO UPDATE SET value = value + 1;
+        END
+    """)
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Routing Policy - Adaptive provider choice learned from usage_stats
+Keeps latency, failure and cost estimates per complexity bucket and routes
+each prompt to the provider/model with the lowest expected latency + cost
+"""
+
+import argparse
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Complexity scores are grouped into this many equal-width buckets
+COMPLEXITY_BUCKETS = 5
+
+# Weight of the newest observation in each moving average
+EWMA_ALPHA = 0.2
+
+# Observations an arm needs in a bucket before its estimates override the analyzer
+MIN_SAMPLES = 5
+
+# Above this complexity the analyzer's choice of Claude API is kept for quality
+MAX_LOCAL_COMPLEXITY = 0.6
+
+# Dollar value of one second of latency, used to trade latency against API cost
+LATENCY_USD_PER_SEC = float(os.environ.get('JETT_ROUTER_LATENCY_USD_PER_SEC', 0.001))
+
+# Local model circuit breaker: consecutive failures that open it, and seconds
+# between probe requests while it is open
+BREAKER_FAILURES = 3
+PROBE_INTERVAL = 60.0
+
+# usage_stats rows loaded at startup
+HISTORY_ROWS = 5000
+
+# routing_reason prefix LLMRouter logs when a local attempt fell back to Claude API
+LOCAL_FAILED_MARKER = 'Local LLM failed'
+
+API = 'claude'
+LOCAL = 'ollama'
+
+
+def complexity_bucket(complexity_score: Optional[float]) -> int:
+    """Bucket index for a complexity score (0-1)."""
+    score = min(max(complexity_score or 0.0, 0.0), 1.0)
+    return min(int(score * COMPLEXITY_BUCKETS), COMPLEXITY_BUCKETS - 1)
+
+
+def _timestamp(value) -> Optional[float]:
+    """Epoch seconds from a usage_stats timestamp (or None)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class ArmStats:
+    """Moving averages for one provider/model in one bucket."""
+
+    __slots__ = ('samples', 'latency_ms', 'failed_ms', 'failure_rate', 'cost_usd')
+
+    def __init__(self):
+        self.samples = 0
+        self.latency_ms: Optional[float] = None
+        self.failed_ms: Optional[float] = None
+        self.failure_rate = 0.0
+        self.cost_usd: Optional[float] = None
+
+    @staticmethod
+    def _ewma(current: Optional[float], value: float) -> float:
+        return value if current is None else current + EWMA_ALPHA * (value - current)
+
+    def update(self, time_ms: Optional[float], cost_usd: Optional[float], failed: bool):
+        self.samples += 1
+        self.failure_rate = self._ewma(self.failure_rate if self.samples > 1 else None,
+                                       1.0 if failed else 0.0)
+        if time_ms is not None:
+            if failed:
+                self.failed_ms = self._ewma(self.failed_ms, time_ms)
+            else:
+                self.latency_ms = self._ewma(self.latency_ms, time_ms)
+        if not failed:
+            self.cost_usd = self._ewma(self.cost_usd, cost_usd or 0.0)
+
+    def to_dict(self) -> Dict:
+        return {
+            'samples': self.samples,
+            'latency_ms': self.latency_ms,
+            'failed_ms': self.failed_ms,
+            'failure_rate': self.failure_rate,
+            'cost_usd': self.cost_usd or 0.0,
+        }
+
+
+class ModelHealth:
+    """Circuit breaker state for one local model."""
+
+    __slots__ = ('consecutive_failures', 'last_attempt')
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.last_attempt = 0.0
+
+    @property
+    def tripped(self) -> bool:
+        return self.consecutive_failures >= BREAKER_FAILURES
+
+
+class AdaptiveRoutingPolicy:
+    """
+    Provider/model choice from observed latency, failures and cost.
+
+    Each routed result (or usage_stats row) updates the estimates for its
+    complexity bucket. choose() then compares, per bucket:
+
+        local:  (1 - f) * latency + f * (time to fail + API latency), plus f * API cost
+        API:    API latency, plus API cost
+
+    with latency valued at LATENCY_USD_PER_SEC. Until both arms have
+    MIN_SAMPLES observations in a bucket the analyzer's decision stands, and
+    prompts above MAX_LOCAL_COMPLEXITY are never moved off the API.
+
+    A local model whose last BREAKER_FAILURES attempts failed (timeouts,
+    errors) gets no traffic except one probe every PROBE_INTERVAL seconds.
+    """
+
+    def __init__(self, local_model: Optional[str] = None,
+                 latency_usd_per_sec: float = LATENCY_USD_PER_SEC):
+        """
+        Args:
+            local_model: Ollama model that fallback rows (which don't name it) are charged to
+            latency_usd_per_sec: Dollar value of one second of latency
+        """
+        self.local_model = local_model
+        self.latency_usd_per_sec = latency_usd_per_sec
+        self._arms: Dict[Tuple[int, str, Optional[str]], ArmStats] = {}
+        self._health: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+        self.observations = 0
+        self.overrides = 0
+
+    @classmethod
+    def from_usage_stats(cls, usage_tracker, limit: int = HISTORY_ROWS, **kwargs) -> 'AdaptiveRoutingPolicy':
+        """Policy primed with the most recent usage_stats rows."""
+        policy = cls(**kwargs)
+        for row in usage_tracker.get_routing_history(limit=limit):
+            policy.observe(row)
+        return policy
+
+    def _arm(self, bucket: int, provider: str, model: Optional[str]) -> ArmStats:
+        key = (bucket, provider, model if provider == LOCAL else None)
+        arm = self._arms.get(key)
+        if arm is None:
+            arm = self._arms[key] = ArmStats()
+        return arm
+
+    def _model_health(self, model: str) -> ModelHealth:
+        health = self._health.get(model)
+        if health is None:
+            health = self._health[model] = ModelHealth()
+        return health
+
+    def observe(self, result: Dict, now: Optional[float] = None):
+        """
+        Learn from one routed request.
+
+        Args:
+            result: LLMRouter result dict or usage_stats row (provider, model,
+                routing_reason, complexity_score, time_ms, cost_usd, success)
+            now: Time of the request (default: the row's timestamp, else now)
+        """
+        provider = result.get('provider')
+        if provider not in (LOCAL, API):
+            return  # cache hits and failed batch entries say nothing about providers
+        bucket = complexity_bucket(result.get('complexity_score'))
+        now = now or _timestamp(result.get('timestamp')) or time.time()
+        reason = result.get('routing_reason') or ''
+
+        with self._lock:
+            self.observations += 1
+            if provider == API and reason.startswith(LOCAL_FAILED_MARKER):
+                # The local attempt failed before this API call; time_ms covers both
+                if self.local_model:
+                    self._arm(bucket, LOCAL, self.local_model).update(result.get('time_ms'), 0.0, True)
+                    self._record_attempt(self.local_model, failed=True, now=now)
+                return
+
+            failed = not result.get('success', True)
+            self._arm(bucket, provider, result.get('model')).update(
+                result.get('time_ms'), result.get('cost_usd'), failed)
+            if provider == LOCAL and result.get('model'):
+                self._record_attempt(result['model'], failed=failed, now=now)
+
+    def _record_attempt(self, model: str, failed: bool, now: float):
+        health = self._model_health(model)
+        health.last_attempt = max(health.last_attempt, now)
+        health.consecutive_failures = health.consecutive_failures + 1 if failed else 0
+
+    def _available(self, model: str, now: float) -> bool:
+        """False while the model's breaker is open and no probe is due."""
+        health = self._health.get(model)
+        if health is None or not health.tripped:
+            return True
+        if now - health.last_attempt >= PROBE_INTERVAL:
+            # Let one request through to see whether the model has recovered
+            health.last_attempt = now
+            return True
+        return False
+
+    def expected_cost(self, bucket: int, provider: str, model: Optional[str] = None) -> Optional[float]:
+        """Expected dollar cost (API spend + valued latency) of one request, or None if unknown."""
+        with self._lock:
+            return self._expected_cost(bucket, provider, model)
+
+    def _expected_cost(self, bucket: int, provider: str, model: Optional[str]) -> Optional[float]:
+        api = self._arms.get((bucket, API, None))
+        if api is None or api.samples < MIN_SAMPLES or api.latency_ms is None:
+            return None
+        api_cost = api.latency_ms / 1000 * self.latency_usd_per_sec + (api.cost_usd or 0.0)
+        if provider == API:
+            return api_cost
+
+        local = self._arms.get((bucket, LOCAL, model))
+        if local is None or local.samples < MIN_SAMPLES:
+            return None
+        f = local.failure_rate
+        success_ms = local.latency_ms if local.latency_ms is not None else local.failed_ms or 0.0
+        failed_ms = local.failed_ms if local.failed_ms is not None else success_ms
+        return ((1 - f) * success_ms / 1000 * self.latency_usd_per_sec +
+                f * (failed_ms / 1000 * self.latency_usd_per_sec + api_cost))
+
+    def choose(self, analysis: Dict, model: Optional[str] = None, now: Optional[float] = None) -> Dict:
+        """
+        Adjust an analyzer decision with the learned estimates.
+
+        Args:
+            analysis: TaskComplexityAnalyzer.analyze() result
+            model: Local model the caller asked for (default: best known)
+            now: Current time (replay passes the row's timestamp)
+
+        Returns:
+            A copy of analysis; use_local and reason change when the policy
+            overrides the analyzer, and 'model' names the local model to use.
+        """
+        now = now or time.time()
+        decision = dict(analysis)
+        bucket = complexity_bucket(analysis.get('complexity_score'))
+        if not analysis['use_local'] and analysis.get('complexity_score', 0) >= MAX_LOCAL_COMPLEXITY:
+            return decision
+
+        with self._lock:
+            if model:
+                candidates = [model]
+            else:
+                candidates = sorted({key[2] for key in self._arms if key[0] == bucket and key[1] == LOCAL} |
+                                    ({self.local_model} if self.local_model else set()))
+            healthy = [m for m in candidates if self._available(m, now)]
+            if candidates and not healthy:
+                if analysis['use_local']:
+                    self.overrides += 1
+                    decision['use_local'] = False
+                    decision['reason'] = (f"Adaptive: local model {', '.join(candidates)} failing "
+                                          f"(last {BREAKER_FAILURES}+ attempts), using Claude API")
+                return decision
+
+            api_cost = self._expected_cost(bucket, API, None)
+            local_costs = [(cost, m) for m in healthy
+                           for cost in [self._expected_cost(bucket, LOCAL, m)] if cost is not None]
+
+        if api_cost is None or not local_costs:
+            return decision  # not enough history to second-guess the analyzer
+
+        local_cost, best_model = min(local_costs)
+        use_local = local_cost <= api_cost
+        decision['model'] = best_model
+        if use_local != analysis['use_local']:
+            with self._lock:
+                self.overrides += 1
+            decision['use_local'] = use_local
+            target = f"local {best_model}" if use_local else "Claude API"
+            decision['reason'] = (f"Adaptive: {target} expected cheaper for complexity bucket {bucket} "
+                                  f"(${min(local_cost, api_cost):.5f} vs ${max(local_cost, api_cost):.5f})")
+        return decision
+
+    def get_stats(self) -> Dict:
+        """Estimates per bucket/provider/model and circuit breaker state."""
+        with self._lock:
+            return {
+                'observations': self.observations,
+                'overrides': self.overrides,
+                'arms': [
+                    {'bucket': bucket, 'provider': provider, 'model': model, **arm.to_dict()}
+                    for (bucket, provider, model), arm in sorted(self._arms.items(), key=str)
+                ],
+                'tripped_models': sorted(m for m, h in self._health.items() if h.tripped),
+            }
+
+
+def replay(rows: Iterable[Dict], policy: AdaptiveRoutingPolicy) -> Dict:
+    """
+    Re-route historical usage_stats rows with policy and compare to what happened.
+
+    Rows are replayed in order. Where the policy picks the route that was
+    logged, the logged outcome is used; otherwise the outcome is estimated
+    from what the policy had learned so far. The policy then learns from the
+    logged row, as it would have online.
+
+    Returns:
+        {'logged': totals, 'adaptive': totals, 'requests': n, 'changed': n}
+        where totals has cost_usd, latency_ms, local and failures.
+    """
+    totals = {name: {'cost_usd': 0.0, 'latency_ms': 0.0, 'local': 0, 'failures': 0.0}
+              for name in ('logged', 'adaptive')}
+    requests = changed = 0
+
+    for row in rows:
+        provider = row.get('provider')
+        if provider not in (LOCAL, API):
+            continue
+        reason = row.get('routing_reason') or ''
+        now = _timestamp(row.get('timestamp')) or time.time()
+        logged_local = provider == LOCAL or reason.startswith(LOCAL_FAILED_MARKER)
+        failed_local = provider == API and logged_local
+        time_ms = row.get('time_ms') or 0.0
+        cost = row.get('cost_usd') or 0.0
+
+        requests += 1
+        logged = totals['logged']
+        logged['cost_usd'] += cost
+        logged['latency_ms'] += time_ms
+        logged['local'] += logged_local
+        logged['failures'] += failed_local
+
+        outcome = (cost, time_ms, 1.0 if failed_local else 0.0)
+        if not reason.startswith('Forced'):
+            analysis = {'use_local': logged_local, 'complexity_score': row.get('complexity_score') or 0.0,
+                        'reason': reason}
+            decision = policy.choose(analysis, now=now)
+            if decision['use_local'] != logged_local:
+                changed += 1
+                outcome = _estimated_outcome(policy, row, decision) or outcome
+            logged_local = decision['use_local']
+
+        adaptive = totals['adaptive']
+        adaptive['cost_usd'] += outcome[0]
+        adaptive['latency_ms'] += outcome[1]
+        adaptive['local'] += logged_local
+        adaptive['failures'] += outcome[2]
+
+        policy.observe(row, now=now)
+
+    return {'requests': requests, 'changed': changed, **totals}
+
+
+def _estimated_outcome(policy: AdaptiveRoutingPolicy, row: Dict,
+                       decision: Dict) -> Optional[Tuple[float, float, float]]:
+    """(cost_usd, latency_ms, expected local failures) for the route the policy picked."""
+    bucket = complexity_bucket(row.get('complexity_score'))
+    with policy._lock:
+        api = policy._arms.get((bucket, API, None))
+        if api is None or api.latency_ms is None:
+            return None
+        if not decision['use_local']:
+            return api.cost_usd or 0.0, api.latency_ms, 0.0
+        local = policy._arms.get((bucket, LOCAL, decision.get('model') or policy.local_model))
+        if local is None or local.latency_ms is None:
+            return None
+        f = local.failure_rate
+        failed_ms = local.failed_ms if local.failed_ms is not None else local.latency_ms
+        return (f * (api.cost_usd or 0.0),
+                (1 - f) * local.latency_ms + f * (failed_ms + api.latency_ms),
+                f)
+
+
+def print_replay(summary: Dict):
+    """Print a replay() comparison."""
+    from usage_tracker import format_cost
+
+    requests = summary['requests']
+    print(f"\nReplayed {requests} requests, adaptive routing changed {summary['changed']}\n")
+    if not requests:
+        return
+    print(f"{'Policy':<10} {'Cost':>12} {'Avg Latency':>13} {'Local %':>9} {'Local Failures':>16}")
+    print("-" * 64)
+    for name in ('logged', 'adaptive'):
+        t = summary[name]
+        print(f"{name:<10} {format_cost(t['cost_usd']):>12} {t['latency_ms'] / requests:>11.0f}ms "
+              f"{t['local'] / requests * 100:>8.1f}% {t['failures']:>16.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    from usage_tracker import DB_PATH, UsageTracker
+
+    parser = argparse.ArgumentParser(description="Adaptive routing policy tools")
+    parser.add_argument('--db', default=DB_PATH, help="Database with usage_stats")
+    parser.add_argument('--replay', action='store_true',
+                        help="Re-route logged requests and compare adaptive vs logged routing")
+    parser.add_argument('--days', type=int, default=30, help="History to replay")
+    parser.add_argument('--local-model', default='llama3.1:8b',
+                        help="Ollama model that local fallbacks are charged to")
+    parser.add_argument('--latency-usd-per-sec', type=float, default=LATENCY_USD_PER_SEC,
+                        help="Dollar value of one second of latency")
+    args = parser.parse_args(argv)
+
+    tracker = UsageTracker(args.db)
+    policy = AdaptiveRoutingPolicy(local_model=args.local_model,
+                                   latency_usd_per_sec=args.latency_usd_per_sec)
+    if args.replay:
+        print_replay(replay(tracker.get_routing_history(days=args.days), policy))
+        return
+
+    for row in tracker.get_routing_history(limit=HISTORY_ROWS):
+        policy.observe(row)
+    stats = policy.get_stats()
+    print(f"\nLearned from {stats['observations']} requests")
+    print(f"{'Bucket':>6} {'Provider':<8} {'Model':<16} {'N':>6} {'Latency':>10} {'Fail %':>7} {'Cost':>12}")
+    for arm in stats['arms']:
+        latency = f"{arm['latency_ms']:.0f}ms" if arm['latency_ms'] is not None else '-'
+        print(f"{arm['bucket']:>6} {arm['provider']:<8} {arm['model'] or '-':<16} {arm['samples']:>6} "
+              f"{latency:>10} {arm['failure_rate'] * 100:>6.1f}% {arm['cost_usd']:>12.6f}")
+    if stats['tripped_models']:
+        print(f"\n⚠️  Circuit open for: {', '.join(stats['tripped_models'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations for Jett Knowledge Base
+Versioned, idempotent schema upgrades for jett_knowledge.db.
+
+Migrations live in migrations/NNNN_name.py and define upgrade(conn).
+Applied versions are recorded in the schema_version table, so running
+upgrade again only applies what is missing. Each migration runs in its
+own transaction against the live database - nothing is deleted or recreated.
+
+Usage:
+    python schema_migrations.py             # apply pending migrations
+    python schema_migrations.py --status    # show applied/pending versions
+    python schema_migrations.py --plan      # EXPLAIN QUERY PLAN before/after pending migrations
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from jett_db import DB_PATH, JettDB
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+MIGRATION_FILE_RE = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+class Migration:
+    """One migration file."""
+
+    def __init__(self, version: int, name: str, path: str):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def description(self) -> str:
+        """First line of the migration's docstring."""
+        doc = (self.module.__doc__ or '').strip()
+        return doc.splitlines()[0] if doc else self.name
+
+    @property
+    def module(self):
+        """Load the migration module on first use."""
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f"migrations.m{self.version:04d}", self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    def apply(self, conn: sqlite3.Connection):
+        """Run the migration's upgrade(conn)."""
+        self.module.upgrade(conn)
+
+
+# ==================== HELPERS FOR MIGRATIONS ====================
+
+def column_names(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Column names of table, including generated columns."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")]
+
+
+def add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> bool:
+    """
+    Add a column if it is not already there.
+
+    Returns:
+        True if the column was added
+    """
+    if column in column_names(conn, table):
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+# ==================== RUNNER ====================
+
+def load_migrations(migrations_dir: str = MIGRATIONS_DIR) -> List[Migration]:
+    """All migrations in version order."""
+    migrations = []
+    for filename in sorted(os.listdir(migrations_dir)):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2),
+                                        os.path.join(migrations_dir, filename)))
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {migrations_dir}")
+    return migrations
+
+
+def connect(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Open a connection in autocommit mode so migrations control their own transactions."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 30000")
+    return conn
+
+
+def ensure_version_table(conn: sqlite3.Connection):
+    """Create the schema_version table if it doesn't exist."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL
+        )
+    """)
+
+
+def applied_versions(conn: sqlite3.Connection) -> Dict[int, str]:
+    """Applied migration versions -> applied_at timestamp."""
+    ensure_version_table(conn)
+    return {row['version']: row['applied_at']
+            for row in conn.execute("SELECT version, applied_at FROM schema_version")}
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a fresh database)."""
+    return max(applied_versions(conn), default=0)
+
+
+def pending_migrations(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """Migrations not yet applied, up to target if given."""
+    applied = applied_versions(conn)
+    return [m for m in load_migrations()
+            if m.version not in applied and (target is None or m.version <= target)]
+
+
+def upgrade(db_path: str = DB_PATH, target: Optional[int] = None, verbose: bool = True) -> List[int]:
+    """
+    Apply pending migrations in order.
+
+    Each migration and its schema_version row commit together, so an
+    interrupted upgrade resumes from the last completed migration.
+    Readers keep working under WAL while a migration runs.
+
+    Args:
+        db_path: Database to upgrade (created if missing)
+        target: Stop after this version (default: latest)
+        verbose: Print progress
+
+    Returns:
+        Versions applied by this run
+    """
+    conn = connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        applied = []
+        for migration in pending_migrations(conn, target):
+            if verbose:
+                print(f"Applying {migration.version:04d}_{migration.name}: {migration.description}")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                migration.apply(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                    (migration.version, migration.name, datetime.now().isoformat())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(migration.version)
+
+        if verbose:
+            if applied:
+                print(f"✓ Database at version {current_version(conn)} ({len(applied)} migrations applied)")
+            else:
+                print(f"✓ Database already at version {current_version(conn)}")
+        return applied
+    finally:
+        conn.close()
+
+
+# ==================== QUERY PLANS ====================
+
+def hot_queries(conn: sqlite3.Connection, db_path: str) -> List[Tuple[str, str, List]]:
+    """
+    The JettDB queries the pipelines run most, built the way JettDB would
+    build them against conn's current schema: (label, sql, params).
+    """
+    # Fresh instance so schema detection (FTS tables, topic_key) sees conn as it is now
+    db = JettDB(db_path)
+
+    queries = [
+        ("topic_exists",
+         f"SELECT EXISTS(SELECT 1 FROM content_ideas WHERE {db._topic_key(conn)} = ?)",
+         ["Bitcoin Quote - Satoshi"]),
+        ("get_content_by_status",
+         "SELECT * FROM content_ideas WHERE status = ? ORDER BY quality_score DESC, created_date DESC",
+         ["draft"]),
+        ("get_content_by_category",
+         "SELECT * FROM content_ideas WHERE status LIKE ? AND category LIKE ? AND quality_score >= ? "
+         "ORDER BY quality_score DESC, created_date DESC",
+         ["%draft%", "%bitcoin%", 7]),
+        ("search_research(category)",
+         "SELECT * FROM research_findings WHERE category = ? ORDER BY created_date DESC",
+         ["sports"]),
+        ("get_deals_by_score",
+         "SELECT * FROM ebay_deals WHERE deal_score >= ? AND status = 'new' "
+         "ORDER BY deal_score DESC, date_found DESC",
+         [70.0]),
+    ]
+
+    for label, source, table, columns in [
+        ("search_research(query)", 'research', 'research_findings', ['topic', 'findings']),
+        ("search_content(keyword)", 'content', 'content_ideas', ['topic', 'content']),
+    ]:
+        clause, params = db._keyword_filter(conn, source, "nil deal", columns)
+        queries.append((label, f"SELECT * FROM {table} WHERE 1=1{clause} ORDER BY created_date DESC", params))
+
+    return queries
+
+
+def explain(conn: sqlite3.Connection, db_path: str) -> Dict[str, List[str]]:
+    """EXPLAIN QUERY PLAN details for each hot query."""
+    plans = {}
+    for label, sql, params in hot_queries(conn, db_path):
+        try:
+            plans[label] = [row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        except sqlite3.OperationalError as e:
+            plans[label] = [f"(not available: {e})"]
+    return plans
+
+
+def show_plan(db_path: str = DB_PATH):
+    """
+    Print query plans for the hot queries now and after pending migrations.
+
+    The pending migrations are applied inside a transaction that is rolled
+    back, so the database is left unchanged.
+    """
+    conn = connect(db_path)
+    try:
+        before = explain(conn, db_path)
+        pending = pending_migrations(conn)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for migration in pending:
+                migration.apply(conn)
+            after = explain(conn, db_path)
+        finally:
+            conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+    print(f"Pending migrations: {', '.join(f'{m.version:04d}_{m.name}' for m in pending) or 'none'}")
+    for label in before:
+        print(f"\n{label}")
+        print("  before: " + "\n          ".join(before[label]))
+        if after[label] != before[label]:
+            print("  after:  " + "\n          ".join(after[label]))
+        else:
+            print("  after:  (unchanged)")
+
+
+def show_status(db_path: str = DB_PATH):
+    """Print applied and pending migrations."""
+    conn = connect(db_path)
+    try:
+        applied = applied_versions(conn)
+        for migration in load_migrations():
+            when = applied.get(migration.version)
+            marker = f"applied {when[:19]}" if when else "pending"
+            print(f"  {migration.version:04d}_{migration.name:<28} {marker}")
+        print(f"\nCurrent version: {current_version(conn)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Jett knowledge base schema migrations')
+    parser.add_argument('--db', default=DB_PATH, help='Database path')
+    parser.add_argument('--target', type=int, help='Upgrade only up to this version')
+    parser.add_argument('--status', action='store_true', help='Show applied and pending migrations')
+    parser.add_argument('--plan', action='store_true',
+                        help='Show EXPLAIN QUERY PLAN for hot queries before/after pending migrations')
+    args = parser.parse_args()
+
+    if args.status:
+        show_status(args.db)
+    elif args.plan:
+        show_plan(args.db)
+    else:
+        upgrade(args.db, target=args.target)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Routing overhead benchmark for TaskComplexityAnalyzer
+
+Times analyze() and analyze_many() on long prompts against the original
+per-keyword scan, and checks both give identical routing decisions.
+
+Usage:
+    python scripts/benchmark-router-overhead.py [--words 10000] [--prompts 50]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from llm_router import TaskComplexityAnalyzer
+
+
+def legacy_scores(prompt: str):
+    """Original scoring: one substring test per keyword, one search per DB pattern."""
+    prompt_lower = prompt.lower()
+    complex_score = sum(1 for keyword in TaskComplexityAnalyzer.COMPLEX_INDICATORS
+                        if keyword in prompt_lower)
+    simple_score = sum(1 for keyword in TaskComplexityAnalyzer.SIMPLE_INDICATORS
+                       if keyword in prompt_lower)
+    is_db_query = any(re.search(pattern, prompt_lower)
+                      for pattern in TaskComplexityAnalyzer.DB_QUERY_PATTERNS)
+    return complex_score, simple_score, is_db_query
+
+
+def legacy_analyze(prompt: str):
+    complex_score, simple_score, is_db_query = legacy_scores(prompt)
+    return TaskComplexityAnalyzer._decide(complex_score, simple_score, is_db_query,
+                                          len(prompt.split()))
+
+
+def make_prompts(count: int, words: int, seed: int = 7):
+    """Transcript-like prompts with a sprinkling of indicator keywords."""
+    rng = random.Random(seed)
+    filler = ("the contract team said player season deal money market fans league "
+              "night game after before really think about numbers value").split()
+    keywords = (TaskComplexityAnalyzer.COMPLEX_INDICATORS +
+                TaskComplexityAnalyzer.SIMPLE_INDICATORS +
+                ['athletes with', 'how many', 'contracts over', 'database'])
+    prompts = []
+    for _ in range(count):
+        body = [rng.choice(filler) for _ in range(words)]
+        for _ in range(rng.randint(0, 6)):
+            body[rng.randrange(words)] = rng.choice(keywords)
+        prompts.append(' '.join(body).capitalize())
+    return prompts
+
+
+def per_prompt_us(fn, prompts, repeat: int = 3) -> float:
+    """Best-of-repeat average microseconds per prompt."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(prompts)
+        best = min(best, time.perf_counter() - start)
+    return best / len(prompts) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--words', type=int, default=10_000, help="Words per prompt")
+    parser.add_argument('--prompts', type=int, default=50, help="Prompts per run")
+    args = parser.parse_args()
+
+    prompts = make_prompts(args.prompts, args.words)
+    prompts += ["Summarize my notes on Juan Soto",
+                "Analyze the strategic implications of NIL deals",
+                "What athletes have contracts over $10M?",
+                "Draft a Twitter thread about Shedeur Sanders"]
+
+    # Same decisions as the original scan
+    expected = [legacy_analyze(p) for p in prompts]
+    assert [TaskComplexityAnalyzer.analyze(p) for p in prompts] == expected
+    assert TaskComplexityAnalyzer.analyze_many(prompts) == expected
+
+    TaskComplexityAnalyzer._get_matchers()  # compile outside the timings
+    results = {
+        'legacy (per-keyword scan)': per_prompt_us(lambda ps: [legacy_analyze(p) for p in ps], prompts),
+        'analyze()': per_prompt_us(lambda ps: [TaskComplexityAnalyzer.analyze(p) for p in ps], prompts),
+        'analyze_many()': per_prompt_us(TaskComplexityAnalyzer.analyze_many, prompts),
+    }
+
+    print(f"Routing overhead, {args.prompts} prompts x {args.words:,} words (identical decisions)")
+    print("-" * 60)
+    for name, us in results.items():
+        print(f"{name:<30} {us:>12,.1f} µs/prompt")
+
+
+if __name__ == "__main__":
+    main()
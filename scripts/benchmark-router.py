@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency benchmarks for LLMRouter
+
+Runs the router against a stand-in Ollama server (an in-process HTTP stub
+with configurable latency, token rate, parallelism and error injection) and
+measures routing overhead, requests/sec at several concurrency levels,
+streaming time-to-first-token, and fallback latency when the local model
+fails or stalls. Results are written as JSON so runs can be compared
+between commits.
+
+Usage:
+    python scripts/benchmark-router.py [--requests 64] [--output results.json]
+    python scripts/benchmark-router.py --compare baseline.json [--output new.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from llm_router import LLMRouter, OllamaClient, TaskComplexityAnalyzer
+from token_counter import HeuristicTokenizer, TokenCounter
+
+STUB_MODEL = 'llama3.1:8b'
+
+
+class StubOllama:
+    """
+    Minimal Ollama stand-in: /api/tags, /api/ps and /api/generate.
+
+    Generation waits `latency` seconds (prompt processing), then emits
+    `response_tokens` tokens at `tokens_per_sec`. At most `parallel`
+    generations run at once, like OLLAMA_NUM_PARALLEL. A fraction
+    `error_rate` of generations fail with HTTP 500, and with
+    `stall_after` set, streams go silent after that many tokens.
+    Settings can be changed between runs.
+    """
+
+    def __init__(self, latency: float = 0.05, tokens_per_sec: float = 400.0,
+                 response_tokens: int = 16, parallel: int = 4, error_rate: float = 0.0,
+                 stall_after: Optional[int] = None, seed: int = 7):
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.response_tokens = response_tokens
+        self.error_rate = error_rate
+        self.stall_after = stall_after
+        self.slots = threading.BoundedSemaphore(parallel)
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubOllama':
+        threading.Thread(target=self._server.serve_forever, name='stub-ollama', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def configure(self, **settings):
+        for name, value in settings.items():
+            setattr(self, name, value)
+
+    def _fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            return self._rng.random() < self.error_rate
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # Small writes (headers, then body or chunk) must not wait on Nagle's algorithm
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self._send_json(200, {'models': [{'name': STUB_MODEL}]})
+                elif self.path == '/api/ps':
+                    self._send_json(200, {'models': [{'name': STUB_MODEL, 'model': STUB_MODEL}]})
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if self.path != '/api/generate':
+                    self._send_json(404, {'error': 'not found'})
+                    return
+                if stub._fail():
+                    self._send_json(500, {'error': 'injected failure'})
+                    return
+
+                with stub.slots:
+                    time.sleep(stub.latency)
+                    if body.get('stream'):
+                        self._stream(body)
+                    else:
+                        time.sleep(stub.response_tokens / stub.tokens_per_sec)
+                        self._send_json(200, dict(self._final(body), response='tok ' * stub.response_tokens))
+
+            def _final(self, body: Dict) -> Dict:
+                return {
+                    'model': body.get('model'),
+                    'done': True,
+                    'eval_count': stub.response_tokens,
+                    'prompt_eval_count': len(body.get('prompt', '').split()),
+                    'eval_duration': int(stub.response_tokens / stub.tokens_per_sec * 1e9),
+                    'load_duration': 0,
+                }
+
+            def _stream(self, body: Dict):
+                # NDJSON with chunked transfer encoding, one chunk per event, as Ollama sends it
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for index in range(stub.response_tokens):
+                        if stub.stall_after is not None and index == stub.stall_after:
+                            time.sleep(3600)
+                        time.sleep(1 / stub.tokens_per_sec)
+                        self._chunk(json.dumps({'response': 'tok ', 'done': False}).encode() + b'\n')
+                    self._chunk(json.dumps(self._final(body)).encode() + b'\n')
+                    self._chunk(b'')
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True  # the router gave up on this stream
+
+            def _chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def percentiles(values: List[float]) -> Dict:
+    """p50/p95/max of a list of measurements (ms)."""
+    ordered = sorted(values)
+    if not ordered:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+
+    def rank(pct: float) -> float:
+        return ordered[max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))]
+
+    return {'p50': rank(50), 'p95': rank(95), 'max': ordered[-1]}
+
+
+def make_prompts(count: int, tag: str) -> List[str]:
+    """Distinct local-routed prompts (distinct so requests aren't coalesced)."""
+    return [f"Summarize my notes on player {tag}-{i}" for i in range(count)]
+
+
+def make_router(stub: StubOllama) -> LLMRouter:
+    """Router pointed at the stub, without usage logging or response cache."""
+    client = OllamaClient(stub.url, pool_size=32)
+    return LLMRouter(token_counter=TokenCounter(HeuristicTokenizer()), ollama_client=client)
+
+
+def bench_overhead(stub: StubOllama, requests: int) -> Dict:
+    """Time spent in the router itself: analysis, and a round-trip to an instant server."""
+    prompts = make_prompts(requests, 'overhead')
+    TaskComplexityAnalyzer.analyze(prompts[0])
+    start = time.perf_counter()
+    for prompt in prompts:
+        TaskComplexityAnalyzer.analyze(prompt)
+    analyze_us = (time.perf_counter() - start) / len(prompts) * 1e6
+
+    stub.configure(latency=0.0, tokens_per_sec=1e9)
+    router = make_router(stub)
+    router.route_and_execute(prompts[0])  # connect + health check outside the timing
+    start = time.perf_counter()
+    for prompt in prompts[1:]:
+        router.route_and_execute(prompt)
+    route_ms = (time.perf_counter() - start) / max(1, len(prompts) - 1) * 1000
+    router.ollama.close()
+    return {'analyze_us': analyze_us, 'route_round_trip_ms': route_ms}
+
+
+def bench_throughput(stub: StubOllama, requests: int, levels: List[int]) -> Dict:
+    """Requests/sec and latency from route_many() at each concurrency level."""
+    stub.configure(latency=0.05, tokens_per_sec=400.0)
+    results = {}
+    for concurrency in levels:
+        router = make_router(stub)
+        prompts = make_prompts(requests, f"c{concurrency}")
+        start = time.perf_counter()
+        routed = router.route_many(prompts, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        router.ollama.close()
+        results[str(concurrency)] = {
+            'requests_per_sec': len(prompts) / elapsed,
+            'latency_ms': percentiles([r['time_ms'] for r in routed if r.get('time_ms') is not None]),
+            'failed': sum(1 for r in routed if not r.get('success')),
+        }
+    return results
+
+
+def bench_streaming(stub: StubOllama, requests: int) -> Dict:
+    """Time-to-first-token and token rate from route_and_stream()."""
+    stub.configure(latency=0.05, tokens_per_sec=400.0)
+    router = make_router(stub)
+    ttft, totals, rates = [], [], []
+    for prompt in make_prompts(requests, 'stream'):
+        stream = router.route_and_stream(prompt)
+        for _ in stream:
+            pass
+        ttft.append(stream.result['ttft_ms'])
+        totals.append(stream.result['time_ms'])
+        if stream.result.get('tokens_per_sec'):
+            rates.append(stream.result['tokens_per_sec'])
+    router.ollama.close()
+    return {
+        'ttft_ms': percentiles(ttft),
+        'total_ms': percentiles(totals),
+        'tokens_per_sec': sum(rates) / len(rates) if rates else None,
+    }
+
+
+def bench_fallback(stub: StubOllama, requests: int, stall_timeout: float) -> Dict:
+    """Latency to reach the API when the local model errors, or stalls mid-stream."""
+    stub.configure(latency=0.05, error_rate=1.0)
+    router = make_router(stub)
+    # Re-probe after every failure so each request tries the local model first
+    router.ollama.UNHEALTHY_RETRY = 0.0
+    errors = []
+    for prompt in make_prompts(requests, 'error'):
+        result = router.route_and_execute(prompt)
+        errors.append(result['time_ms'])
+    router.ollama.close()
+
+    stub.configure(error_rate=0.0, stall_after=4)
+    router = make_router(stub)
+    stalls = []
+    for prompt in make_prompts(max(1, requests // 4), 'stall'):
+        stream = router.route_and_stream(prompt, stall_timeout=stall_timeout)
+        for _ in stream:
+            pass
+        stalls.append(stream.result['time_ms'])
+    router.ollama.close()
+    stub.configure(stall_after=None)
+
+    return {
+        'error_fallback_ms': percentiles(errors),
+        'stall_fallback_ms': percentiles(stalls),
+        'stall_timeout_s': stall_timeout,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def flatten(results: Dict, prefix: str = '') -> Dict[str, float]:
+    """Numeric leaves of a results dict as {'a.b.c': value}."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def print_comparison(baseline: Dict, current: Dict):
+    """Per-metric change from a previous results file."""
+    old, new = flatten(baseline['results']), flatten(current['results'])
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp', '?')[:19]})")
+    print(f"{'Metric':<42} {'Before':>12} {'After':>12} {'Change':>9}")
+    print("-" * 78)
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else '-'
+        print(f"{name:<42} {before:>12.2f} {after:>12.2f} {change:>9}")
+    print("\n(requests_per_sec and tokens_per_sec: higher is better; everything else: lower)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=64, help="Requests per measurement")
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help="Concurrency levels for throughput")
+    parser.add_argument('--parallel', type=int, default=4, help="Generations the stub serves at once")
+    parser.add_argument('--stall-timeout', type=float, default=0.5, help="Stall timeout for the failover run")
+    parser.add_argument('--output', help="Write results JSON here")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    stub = StubOllama(parallel=args.parallel).start()
+    try:
+        levels = [int(level) for level in args.concurrency.split(',')]
+        results = {
+            'overhead': bench_overhead(stub, args.requests),
+            'throughput': bench_throughput(stub, args.requests, levels),
+            'streaming': bench_streaming(stub, max(1, args.requests // 4)),
+            'fallback': bench_fallback(stub, max(1, args.requests // 4), args.stall_timeout),
+        }
+    finally:
+        stub.stop()
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'config': vars(args),
+        'results': results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
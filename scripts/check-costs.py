@@ -1,88 +1,59 @@
 #!/usr/bin/env python3
-"""Quick token usage and cost checker"""
+"""Quick token usage and cost checker (reads the usage_stats rollups)"""
 
-import sqlite3
 import os
-from datetime import datetime, timedelta
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from usage_tracker import UsageTracker
 
 DB_PATH = os.path.expanduser("~/clawd/data/jett_knowledge.db")
+DAYS = 7
 
 def main():
     if not os.path.exists(DB_PATH):
         print(f"❌ Database not found at {DB_PATH}")
         return
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    tracker = UsageTracker(DB_PATH, buffered=False)
 
-    print("📊 Token Usage & Costs (Last 7 Days)")
+    print(f"📊 Token Usage & Costs (Last {DAYS} Days)")
     print("=" * 42)
     print()
 
     # Daily breakdown
     print("Daily Breakdown:")
-    cursor.execute("""
-        SELECT
-            DATE(timestamp) as date,
-            provider,
-            SUM(tokens) as tokens,
-            ROUND(SUM(cost_usd), 4) as cost
-        FROM usage_stats
-        WHERE timestamp >= datetime('now', '-7 days')
-        GROUP BY DATE(timestamp), provider
-        ORDER BY date DESC, provider
-    """)
-    
-    results = cursor.fetchall()
+    results = sorted(tracker.get_daily_summary(DAYS), key=lambda r: (r['date'], r['provider']), reverse=True)
     if results:
         print(f"{'Date':<12} {'Provider':<10} {'Tokens':>10} {'Cost (USD)':>12}")
         print("-" * 46)
         for row in results:
-            print(f"{row[0]:<12} {row[1]:<10} {row[2]:>10} ${row[3]:>11}")
+            print(f"{row['date']:<12} {row['provider']:<10} {row['tokens'] or 0:>10} ${round(row['cost'] or 0, 4):>11}")
     else:
-        print("  No data for last 7 days")
+        print(f"  No data for last {DAYS} days")
+
+    stats = tracker.get_stats(DAYS)
 
     print()
     print("Weekly Total:")
-    cursor.execute("""
-        SELECT
-            SUM(tokens) as total_tokens,
-            ROUND(SUM(cost_usd), 2) as total_cost
-        FROM usage_stats
-        WHERE timestamp >= datetime('now', '-7 days')
-    """)
-    
-    total = cursor.fetchone()
-    if total and total[0]:
-        print(f"  Tokens: {total[0]:,} | Cost: ${total[1]}")
+    if stats['total_requests']:
+        total_tokens = sum(p['total_tokens'] for p in stats['providers'].values())
+        print(f"  Tokens: {total_tokens:,} | Cost: ${round(stats['total_cost'], 2)}")
     else:
-        print("  No usage in last 7 days")
+        print(f"  No usage in last {DAYS} days")
 
     print()
-    print("Provider Breakdown (Last 7 Days):")
-    cursor.execute("""
-        SELECT
-            provider,
-            COUNT(*) as calls,
-            SUM(tokens) as total_tokens,
-            ROUND(SUM(cost_usd), 2) as total_cost
-        FROM usage_stats
-        WHERE timestamp >= datetime('now', '-7 days')
-        GROUP BY provider
-        ORDER BY total_cost DESC
-    """)
-    
-    results = cursor.fetchall()
-    if results:
+    print(f"Provider Breakdown (Last {DAYS} Days):")
+    providers = sorted(stats['providers'].items(), key=lambda item: item[1]['total_cost'], reverse=True)
+    if providers:
         print(f"{'Provider':<10} {'Calls':>8} {'Tokens':>12} {'Cost (USD)':>12}")
         print("-" * 44)
-        for row in results:
-            print(f"{row[0]:<10} {row[1]:>8} {row[2]:>12} ${row[3]:>11}")
+        for provider, p in providers:
+            print(f"{provider:<10} {p['count']:>8} {p['total_tokens']:>12} ${round(p['total_cost'], 2):>11}")
     else:
         print("  No data")
 
-    conn.close()
-
     print()
     print("💡 Tip: Run 'cat ~/clawd/automation/SCRIPT-STATUS.json' to verify automation token usage")
 
@@ -16,34 +16,13 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from jett_db import get_db
-from collections import defaultdict
 
 def find_duplicates():
     """Find all duplicate topics in the database."""
     db = get_db()
 
-    with db.get_connection() as conn:
-        cursor = conn.cursor()
-
-        # Get all content with same topic (excluding priority suffixes)
-        cursor.execute("""
-            SELECT id, topic, status, quality_score, created_date, published_date, category
-            FROM content_ideas
-            WHERE status IN ('draft', 'published')
-            ORDER BY topic, quality_score DESC, created_date ASC
-        """)
-
-        # Group by normalized topic (remove priority suffixes)
-        topics = defaultdict(list)
-        for row in cursor.fetchall():
-            # Normalize topic by removing priority suffixes
-            normalized_topic = row['topic'].replace(' - LOW', '').replace(' - HIGH', '').replace(' - MEDIUM', '')
-            topics[normalized_topic].append(dict(row))
-
-        # Find topics with multiple entries
-        duplicates = {topic: entries for topic, entries in topics.items() if len(entries) > 1}
-
-        return duplicates
+    # Grouped by normalized topic (priority suffixes removed) via the topic_key index
+    return db.get_duplicate_topics(statuses=('draft', 'published'))
 
 def fix_duplicates(dry_run=True):
     """Fix duplicate content by marking extras as published."""
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test dashboard/server.py
+/api/usage revalidation (ETag, 304), gzip and HEAD against a throwaway database
+"""
+
+import gzip
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard'))
+
+import server  # noqa: E402  (dashboard/server.py)
+from usage_tracker import UsageTracker  # noqa: E402
+
+
+def _get(url: str, method: str = 'GET', **headers):
+    """(status, headers, body) of a request; 304s don't raise."""
+    request = urllib.request.Request(url, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b''
+
+
+def test_usage_api():
+    """ETag / If-None-Match, gzip, HEAD and refresh on new usage."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        writer = UsageTracker(db_path, buffered=False)
+        writer.log_usage_many([('ollama', f"prompt {i}", {'response': 'ok', 'model': f"model-{i % 5}",
+                                                            'time_ms': 100.0 + i, 'tokens': 10})
+                               for i in range(40)])
+
+        feed = server.UsageFeed(UsageTracker(db_path, buffered=False, retention_days=None), poll_interval=0.05)
+        feed.start()
+        server.DashboardRequestHandler.feed = feed
+        server.DashboardRequestHandler.log_message = lambda *args: None
+        httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), server.DashboardRequestHandler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{httpd.server_address[1]}/api/usage?days=7"
+
+        try:
+            status, headers, body = _get(url, **{'Accept-Encoding': 'gzip'})
+            assert status == 200 and headers['Content-Encoding'] == 'gzip'
+            payload = json.loads(gzip.decompress(body))
+            assert payload['stats']['total_requests'] == 40 and len(payload['latency']) == 5
+            etag = headers['ETag']
+            print(f"✓ gzip response ({len(body)} bytes), ETag {etag}")
+
+            status, headers, body = _get(url, **{'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+            assert status == 304 and body == b'' and headers['ETag'] == etag
+            print("✓ If-None-Match answered with 304")
+
+            status, headers, body = _get(url)
+            assert status == 200 and 'Content-Encoding' not in headers
+            assert json.loads(body)['stats']['total_requests'] == 40
+            assert headers['ETag'] != etag  # identity and gzip variants differ
+            print("✓ Identity response without Accept-Encoding")
+
+            status, headers, body = _get(url, method='HEAD')
+            assert status == 200 and body == b'' and int(headers['Content-Length']) > 0
+            print("✓ HEAD /api/usage")
+
+            # New usage changes the ETag once the feed has seen it
+            writer.log_usage('claude', "new prompt", {'response': 'ok', 'cost_usd': 0.01})
+            for _ in range(100):
+                if feed.last_id == 41:
+                    break
+                threading.Event().wait(0.02)
+            status, headers, body = _get(url, **{'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+            assert status == 200 and headers['ETag'] != etag
+            assert json.loads(gzip.decompress(body))['stats']['total_requests'] == 41
+            print("✓ New usage invalidates the ETag")
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            feed.stop()
+            server.DashboardRequestHandler.feed = None
+
+
+class FlakyTracker:
+    """get_usage_since() fails with an unexpected error once, then returns one event."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_last_usage_id(self):
+        return 0
+
+    def get_usage_since(self, after_id, limit=1000):
+        self.calls += 1
+        if self.calls == 1:
+            raise ValueError("unexpected row format")
+        return [{'id': 1, 'provider': 'ollama'}] if after_id < 1 else []
+
+
+def test_feed_survives_errors():
+    """A poll raising any exception is logged and polling carries on."""
+    feed = server.UsageFeed(FlakyTracker(), poll_interval=0.01)
+    feed.start()
+    try:
+        events = feed.events_after(0, timeout=2)
+        assert [event['id'] for event in events] == [1]
+    finally:
+        feed.stop()
+    print("✓ Feed keeps polling after an unexpected error")
+
+
+def test_resume_behind_recent_events():
+    """A Last-Event-ID older than the in-memory window is backfilled without gaps."""
+    recent_events = server.RECENT_EVENTS
+    server.RECENT_EVENTS = 10
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        writer = UsageTracker(db_path, buffered=False)
+        usage = [('ollama', f"prompt {i}", {'response': 'ok', 'model': 'm', 'tokens': 10}) for i in range(30)]
+        writer.log_usage_many(usage)
+
+        feed = server.UsageFeed(UsageTracker(db_path, buffered=False, retention_days=None), poll_interval=0.01)
+        feed.start()
+        try:
+            writer.log_usage_many(usage[:25])
+            for _ in range(200):
+                if feed.last_id == 55:
+                    break
+                threading.Event().wait(0.01)
+            assert [event['id'] for event in feed.recent] == list(range(46, 56))
+
+            seen, last_id = [], 5
+            while last_id < 55:
+                events = feed.events_after(last_id, timeout=1)
+                assert events
+                seen.extend(event['id'] for event in events)
+                last_id = events[-1]['id']
+            assert seen == list(range(6, 56))
+            assert feed.events_after(55, timeout=0.05) == []
+        finally:
+            feed.stop()
+            server.RECENT_EVENTS = recent_events
+    print("✓ Resuming 50 events behind a 10-event window backfills every event")
+
+
+if __name__ == "__main__":
+    test_usage_api()
+    test_feed_survives_errors()
+    test_resume_behind_recent_events()
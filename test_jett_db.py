@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Test JettDB core
+Pooled connections, transaction() scopes, bulk inserts, full-text search,
+topic_key dedupe and iter_* paging against a throwaway database
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+from jett_db import JettDB, Record, fts_query, normalize_topic
+from schema_migrations import upgrade
+
+
+def _research_count(db: JettDB) -> int:
+    with db.get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM research_findings").fetchone()[0]
+
+
+def test_pooled_connections():
+    """Pooled mode keeps one tuned connection per thread until close()."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett.db')
+        upgrade(db_path, verbose=False)
+        db = JettDB(db_path, pooled=True)
+
+        with db.get_connection() as first:
+            pass
+        with db.get_connection() as again:
+            assert again is first
+            assert again.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        others = []
+
+        def worker():
+            with db.get_connection() as conn:
+                others.append(conn)
+                conn.execute("SELECT 1").fetchone()  # usable from its own thread
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(conn) for conn in others + [first]}) == 4
+        assert len(db._pool) == 4
+        print("✓ One pooled connection per thread, reused across calls")
+
+        db.close()
+        assert db._pool == []
+        with db.get_connection() as reopened:
+            assert reopened is not first
+        db.close()
+        print("✓ close() drops the pool; the next call reconnects")
+
+        # Unpooled mode opens and closes a connection per call
+        plain = JettDB(db_path)
+        with plain.get_connection() as conn_a:
+            pass
+        with plain.get_connection() as conn_b:
+            assert conn_b is not conn_a
+        assert plain._pool == []
+
+
+def test_transaction_scope():
+    """transaction() commits once, rolls back on error and joins when nested."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett.db')
+        upgrade(db_path, verbose=False)
+
+        for pooled in (False, True):
+            db = JettDB(db_path, pooled=pooled)
+            with db.get_connection() as conn:
+                conn.execute("DELETE FROM research_findings")
+
+            try:
+                with db.transaction():
+                    db.add_research("Rolled back A", "test", "text")
+                    db.add_research("Rolled back B", "test", "text")
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+            assert _research_count(db) == 0
+            print(f"✓ Exception rolls back every write (pooled={pooled})")
+
+            with db.transaction() as outer:
+                db.add_research("Outer", "test", "text")
+                with db.transaction() as inner:
+                    assert inner is outer
+                    db.add_research("Inner", "test", "text")
+                with db.get_connection() as conn:
+                    assert conn is outer
+                # A second connection can't see the open transaction yet
+                assert _research_count(JettDB(db_path)) == 0
+            assert _research_count(db) == 2
+            print(f"✓ Nested transaction() joins the outer one (pooled={pooled})")
+
+            # An error in a nested block rolls back the whole outer transaction
+            try:
+                with db.transaction():
+                    db.add_research("Outer again", "test", "text")
+                    with db.transaction():
+                        raise ValueError("inner failure")
+            except ValueError:
+                pass
+            assert _research_count(db) == 2
+            db.close()
+
+
+def test_bulk_inserts():
+    """add_*_many return ids in input order and honour each conflict policy."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett.db')
+        upgrade(db_path, verbose=False)
+        db = JettDB(db_path, pooled=True)
+
+        # More distinct topics than one lookup chunk (SQL_PARAM_CHUNK)
+        records = [{'topic': f"Finding {i}", 'category': 'bitcoin', 'findings': f"v1 {i}",
+                    'sources': ['https://example.com'], 'tags': ['a', 'b']} for i in range(1200)]
+        ids = db.add_research_many(records)
+        assert ids == sorted(ids) and len(set(ids)) == 1200
+        assert db.get_research(ids[700])['topic'] == "Finding 700"
+        assert db.get_research(ids[0])['sources'] == ['https://example.com']
+        print("✓ 1200 findings inserted, ids in input order")
+
+        assert db.add_research_many(records[:10]) == [None] * 10
+        # Same topic in another category is a new row
+        assert None not in db.add_research_many([dict(records[0], category='sports')])
+        print("✓ 'skip' leaves existing (topic, category) rows alone")
+
+        updated = [dict(record, findings="v2") for record in records[:3]]
+        assert db.add_research_many(updated, on_conflict='update') == ids[:3]
+        assert db.get_research(ids[2])['findings'] == "v2"
+        print("✓ 'update' rewrites existing rows in place")
+
+        try:
+            db.add_research_many([{'topic': "Brand new", 'category': 'x', 'findings': 'f'},
+                                  records[5]], on_conflict='fail')
+            assert False, "expected IntegrityError"
+        except sqlite3.IntegrityError:
+            pass
+        assert not db.search_research(category='x')
+        print("✓ 'fail' raises before writing anything")
+
+        # Duplicates inside one batch: the first copy is inserted, later ones resolve to it
+        batch = [{'topic': "Dup - HIGH", 'category': 'c', 'content': 'first'},
+                 {'topic': "Dup - LOW", 'category': 'c', 'content': 'second'},
+                 {'topic': "Other", 'category': 'c', 'content': 'x'}]
+        skipped = db.add_content_ideas_many(batch)
+        assert skipped[0] is not None and skipped[1] is None and skipped[2] is not None
+        merged = db.add_content_ideas_many(batch, on_conflict='update')
+        assert merged[0] == merged[1] == skipped[0]
+        assert db.get_content_idea(skipped[0])['content'] == 'second'
+        print("✓ In-batch duplicates collapse onto one row")
+
+        try:
+            db.add_research_many(records[:1], on_conflict='replace')
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        db.close()
+
+
+def test_fulltext_search():
+    """FTS5 triggers track writes; keyword search falls back to LIKE without the index."""
+    assert fts_query("NIL de") == '"NIL de"*'
+    assert fts_query("NIL deals", prefix=False) == '"NIL deals"'
+    assert fts_query("?!") is None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett.db')
+        upgrade(db_path, verbose=False)
+        db = JettDB(db_path)
+
+        nil = db.add_research("NIL Market Size", "sports", "NIL deals grew 30% in 2024")
+        mention = db.add_research("College budgets", "sports", "Schools cite NIL once")
+        db.add_research("Bitcoin ETF flows", "bitcoin", "Inflows slowed")
+        assert {r['id'] for r in db.search_research(query="nil")} == {nil, mention}
+        assert [r['id'] for r in db.search_research(query="nil de")] == [nil]  # prefix
+        assert [r['id'] for r in db.search_research(query="nil", category="bitcoin")] == []
+
+        ranked = db.search_ranked('research', 'nil', limit=5)
+        assert [r['id'] for r in ranked] == [nil, mention]  # topic match weighted higher
+        assert ranked[0]['highlighted'] == "[NIL] Market Size"
+        assert db.search_ranked('research', '...') == []
+        print("✓ Keyword and ranked search served by FTS5")
+
+        # Triggers keep the index in sync with updates and deletes
+        with db.get_connection() as conn:
+            conn.execute("UPDATE research_findings SET findings = 'Renamed to NCAA' WHERE id = ?", (mention,))
+            conn.execute("DELETE FROM research_findings WHERE id = ?", (nil,))
+        assert db.search_research(query="nil") == []
+        assert [r['id'] for r in db.search_research(query="ncaa")] == [mention]
+
+        idea = db.add_content_idea("Satoshi quote card", "bitcoin_quotes", "Quote of the day")
+        assert [r['id'] for r in db.search_content(keyword="satoshi")] == [idea]
+        db.close()
+        print("✓ FTS triggers follow inserts, updates and deletes")
+
+        # A database migrated before the FTS indexes uses LIKE scans
+        old_path = os.path.join(tmp, 'old.db')
+        upgrade(old_path, target=5, verbose=False)
+        old = JettDB(old_path)
+        old.add_research("NIL Market Size", "sports", "NIL deals grew")
+        with old.get_connection() as conn:
+            assert not old._fts_tables(conn)
+        assert len(old.search_research(query="nil deals")) == 1
+        print("✓ LIKE fallback without FTS tables")
+
+
+def test_topic_key():
+    """Dedupe checks match topics without priority suffixes, with or without topic_key."""
+    assert normalize_topic("Bitcoin Quote - Satoshi - HIGH") == "Bitcoin Quote - Satoshi"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for target, expected in ((None, 'topic_key'), (4, 'REPLACE(')):
+            db_path = os.path.join(tmp, f"jett-{target}.db")
+            upgrade(db_path, target=target, verbose=False)
+            db = JettDB(db_path)
+
+            db.add_content_idea("Bitcoin Quote - Satoshi - HIGH", "bitcoin_quotes", "a")
+            assert db.add_content_idea("Bitcoin Quote - Satoshi - LOW", "bitcoin_quotes", "b") is None
+            db.add_content_idea("Bitcoin Quote - Satoshi - LOW", "bitcoin_quotes", "b",
+                                skip_duplicate_check=True)
+            db.add_content_idea("Halving - Explained", "bitcoin", "c")
+            with db.get_connection() as conn:
+                assert db._topic_key(conn).startswith(expected)
+
+            assert db.topic_exists("Bitcoin Quote - Satoshi")
+            assert db.topic_exists("Halving - Explained - MEDIUM")
+            assert not db.topic_exists("Halving")  # real ' - ' parts are kept
+            assert db.topics_exist(["Bitcoin Quote - Satoshi - MEDIUM", "Unknown"]) == {
+                "Bitcoin Quote - Satoshi - MEDIUM": True, "Unknown": False}
+
+            duplicates = db.get_duplicate_topics()
+            assert list(duplicates) == ["Bitcoin Quote - Satoshi"]
+            assert len(duplicates["Bitcoin Quote - Satoshi"]) == 2
+            db.close()
+            print(f"✓ Suffix-free dedupe via {expected.rstrip('(')}")
+
+        # The generated column agrees with normalize_topic() and is indexed
+        db = JettDB(os.path.join(tmp, "jett-None.db"))
+        with db.get_connection() as conn:
+            for row in conn.execute("SELECT topic, topic_key FROM content_ideas"):
+                assert row['topic_key'] == normalize_topic(row['topic'])
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT 1 FROM content_ideas WHERE topic_key = ?", ("x",)
+            ).fetchall()
+        assert 'idx_content_topic_key' in plan[0]['detail']
+        print("✓ topic_key matches normalize_topic() and uses its index")
+
+
+def test_iter_rows():
+    """iter_* page by id across batches, filter dates in SQL and yield each row format."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett.db')
+        upgrade(db_path, verbose=False)
+        db = JettDB(db_path)
+        ids = db.add_research_many([
+            {'topic': f"Finding {i}", 'category': 'bitcoin' if i % 2 else 'sports',
+             'findings': 'text', 'sources': [f"https://example.com/{i}"], 'tags': ['btc', str(i)]}
+            for i in range(23)
+        ])
+        with db.get_connection() as conn:
+            conn.executemany("UPDATE research_findings SET created_date = ? WHERE id = ?",
+                             [(f"2026-01-{i + 1:02d}T12:00:00", row_id) for i, row_id in enumerate(ids)])
+
+        # Paging: batch boundaries don't drop or repeat rows, in either direction
+        assert [r['id'] for r in db.iter_research(batch_size=5)] == ids
+        assert [r['id'] for r in db.iter_research(batch_size=5, newest_first=True)] == ids[::-1]
+        assert [r['id'] for r in db.iter_research(after_id=ids[9], limit=7, batch_size=3)] == ids[10:17]
+        assert [r['id'] for r in db.iter_research(after_id=ids[9], newest_first=True,
+                                                  batch_size=4)] == ids[:9][::-1]
+        assert list(db.iter_research(after_id=ids[-1])) == []
+        print("✓ after_id / limit / newest_first paging across batches")
+
+        # Resuming from the last id seen reads the rest exactly once
+        seen = [r['id'] for r in db.iter_research(limit=10, batch_size=4)]
+        seen += [r['id'] for r in db.iter_research(after_id=seen[-1], batch_size=4)]
+        assert seen == ids
+
+        # since is inclusive, until exclusive, combined with column filters
+        window = list(db.iter_research(since="2026-01-05", until="2026-01-10T12:00:00", batch_size=2))
+        assert [r['id'] for r in window] == ids[4:9]
+        bitcoin = list(db.iter_research(category='bitcoin', since="2026-01-10", batch_size=2))
+        assert [r['id'] for r in bitcoin] == ids[9:23:2]
+        print("✓ since/until filtering in SQL")
+
+        # Row formats
+        first = next(db.iter_research())
+        assert first['sources'] == ["https://example.com/0"] and first['tags'] == ['btc', '0']
+        raw = next(db.iter_research(row_format='tuple'))
+        assert isinstance(raw, tuple) and raw[0] == ids[0] and '["https://example.com/0"]' in raw
+        record = next(db.iter_research(row_format='record'))
+        assert isinstance(record, Record) and record.id == ids[0]
+        try:
+            next(db.iter_research(row_format='json'))
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        print("✓ dict, tuple and record rows")
+
+        # Records keep sources/tags encoded until accessed, and are read-only
+        assert record._sources == '["https://example.com/0"]' and record._tags == 'btc,0'
+        assert record.sources == ["https://example.com/0"] and record.tags == ['btc', '0']
+        assert record._asdict()['topic'] == "Finding 0"
+        assert not hasattr(record, '__dict__')
+        try:
+            record.topic = "changed"
+            assert False, "expected AttributeError"
+        except AttributeError:
+            pass
+        assert type(next(db.iter_research(row_format='record', after_id=ids[5]))) is type(record)
+        print("✓ Records decode research sources/tags lazily")
+
+
+if __name__ == "__main__":
+    test_pooled_connections()
+    test_transaction_scope()
+    test_bulk_inserts()
+    test_fulltext_search()
+    test_topic_key()
+    test_iter_rows()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test AsyncJettDB
+Concurrent writes and reads against a throwaway database
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+
+from jett_db_async import AsyncJettDB
+from schema_migrations import upgrade
+
+
+async def _exercise(db_path: str):
+    async with AsyncJettDB(db_path) as db:
+        # Concurrent writes are grouped into far fewer commits
+        ids = await asyncio.gather(*[
+            db.add_research(f"Finding {i}", "sports", f"Contract detail {i}") for i in range(300)
+        ])
+        assert sorted(ids) == list(range(1, 301))
+        assert db.stats['commits'] < 300
+        print(f"✓ 300 writes in {db.stats['commits']} commits")
+
+        # A failing write only fails its own caller
+        results = await asyncio.gather(
+            db.add_athlete("Test Player", "Football"),
+            db.add_athlete("Test Player", "Football"),
+            db.add_task("Follow up", "research"),
+            return_exceptions=True
+        )
+        assert isinstance(results[1], sqlite3.IntegrityError)
+        assert isinstance(results[0], int) and isinstance(results[2], int)
+        print("✓ Failed write isolated from its group")
+
+        # Reads run on the pool while writes continue
+        stats, found, _ = await asyncio.gather(
+            db.get_stats(),
+            db.search_research(query="contract detail 7"),
+            db.add_research("Late finding", "sports", "More detail"),
+        )
+        assert stats['total_research'] >= 300
+        assert found
+        rows = [row async for row in db.iter_research(category="sports", batch_size=64)]
+        assert len(rows) == 301
+        print("✓ Concurrent reads and async iteration")
+
+
+async def _write_from_closed_loop(db: AsyncJettDB):
+    """Queue a write from a loop that closes before the write is committed."""
+    def abandoned_caller():
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(db.add_task("Abandoned", "research"))
+        loop.call_soon(loop.stop)
+        loop.run_forever()  # runs the task up to its await, so the write is queued
+        task.cancel()
+        loop.close()
+
+    gate = threading.Event()
+    # Hold the writer so the abandoned write is still queued when its loop closes
+    blocker = asyncio.ensure_future(db._write(lambda: gate.wait(5)))
+    await asyncio.sleep(0.05)
+    await asyncio.to_thread(abandoned_caller)
+    gate.set()
+    await blocker
+
+
+def test_writer_survives_closed_loop():
+    """A caller whose event loop has closed doesn't stop the writer thread."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett_knowledge.db')
+        upgrade(db_path, verbose=False)
+
+        async def run():
+            async with AsyncJettDB(db_path) as db:
+                await _write_from_closed_loop(db)
+                task_id = await asyncio.wait_for(db.add_task("Still working", "research"), timeout=5)
+                assert isinstance(task_id, int) and db._writer.is_alive()
+        asyncio.run(run())
+        print("✓ Writer keeps running after a caller's loop closed")
+
+
+def test_async_jett_db():
+    """Run the async facade against a migrated temp database."""
+    print("=" * 60)
+    print("Testing AsyncJettDB")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett_knowledge.db')
+        upgrade(db_path, verbose=False)
+        asyncio.run(_exercise(db_path))
+
+    print("\n✅ AsyncJettDB working")
+
+
+if __name__ == "__main__":
+    test_async_jett_db()
+    test_writer_survives_closed_loop()
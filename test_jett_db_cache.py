@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test JettDB read cache
+Hits, invalidation on writes and LRU eviction against a throwaway database
+"""
+
+import os
+import tempfile
+
+from jett_db import JettDB
+from schema_migrations import upgrade
+
+
+def test_query_cache():
+    """Cached reads stay correct across writes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cache.db')
+        upgrade(db_path, verbose=False)
+        db = JettDB(db_path, pooled=True, cache_size=3, cache_ttl=None)
+
+        # Repeated reads are served from memory
+        db.add_research("Contract A", "sports", "Details")
+        first = db.search_research(category="sports")
+        first[0]['topic'] = "mutated by caller"
+        again = db.search_research(category="sports")
+        assert again[0]['topic'] == "Contract A"
+        assert db.cache_stats()['hits'] == 1
+        print("✓ Repeat read served from cache")
+
+        # Writes through JettDB invalidate tables they touch, and only those
+        db.get_all_athletes()
+        db.add_research("Contract B", "sports", "Details")
+        assert len(db.search_research(category="sports")) == 2
+        hits = db.cache_stats()['hits']
+        db.get_all_athletes()
+        assert db.cache_stats()['hits'] == hits + 1
+        print("✓ Writes invalidate only their table")
+
+        # Raw writes through get_connection() invalidate everything
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM research_findings")
+        assert db.search_research(category="sports") == []
+        print("✓ Raw writes invalidate the cache")
+
+        # Least recently used entries are evicted past max_entries
+        for category in ("a", "b", "c", "d"):
+            db.search_research(category=category)
+        stats = db.cache_stats()
+        assert stats['entries'] == 3 and stats['evictions'] >= 1
+        print(f"✓ LRU eviction ({stats})")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    test_query_cache()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test JettDB query profiling
+Samples, slow-query log and the per-method report against a throwaway database
+"""
+
+import os
+import tempfile
+
+from jett_db import JettDB, profile_report
+from schema_migrations import upgrade
+
+
+def test_query_profiler():
+    """Statements are attributed to their method and slow ones keep a plan."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'profile.db')
+        upgrade(db_path, verbose=False)
+        db = JettDB(db_path, pooled=True)
+        db.enable_profiling(slow_query_ms=0)
+
+        db.add_research("Contract A", "sports", "Details")
+        for _ in range(5):
+            db.search_research(category="sports")
+        with db.get_connection() as conn:
+            conn.execute("SELECT COUNT(*) FROM athletes").fetchone()
+        db.close()
+
+        report = profile_report(db_path)
+        methods = {m['method']: m for m in report['methods']}
+        assert methods['search_research']['calls'] == 5
+        assert methods['search_research']['avg_rows'] == 1
+        assert methods['add_research']['calls'] >= 1
+        assert any(name.startswith('test_jett_db_profile.py:') for name in methods)
+        print(f"✓ Per-method percentiles ({methods['search_research']})")
+
+        planned = [q for q in report['slow'] if q['method'] == 'search_research']
+        assert planned and 'research_findings' in planned[0]['query_plan']
+        print("✓ Slow statements logged with EXPLAIN QUERY PLAN")
+
+
+if __name__ == "__main__":
+    test_query_profiler()
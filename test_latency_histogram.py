@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test LatencyHistogram
+Percentile accuracy, merging and the serialized form
+"""
+
+import random
+
+from latency_histogram import LatencyHistogram
+
+
+def _exact(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+
+def test_percentiles_within_bucket_error():
+    """Percentiles stay within ~4.5% of the exact sample percentiles."""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6, 1.2) for _ in range(20000)]
+    histogram = LatencyHistogram.of(values + [None])
+    assert histogram.total == len(values)
+    for p in (50, 90, 99):
+        exact = _exact(values, p)
+        assert abs(histogram.percentile(p) - exact) / exact < 0.045, p
+    assert LatencyHistogram().percentile(50) is None
+    print(f"✓ Percentiles within bucket error: {histogram.percentiles()}")
+
+
+def test_merge_and_bytes_round_trip():
+    """Merged hourly histograms equal one histogram of all samples and survive to_bytes()."""
+    rng = random.Random(11)
+    hours = [[rng.uniform(50, 5000) for _ in range(500)] for _ in range(24)]
+    merged = LatencyHistogram()
+    for values in hours:
+        merged.merge(LatencyHistogram.from_bytes(LatencyHistogram.of(values).to_bytes()))
+    whole = LatencyHistogram.of(v for values in hours for v in values)
+    assert merged.counts == whole.counts
+    assert merged.percentiles() == whole.percentiles()
+    assert len(merged.to_bytes()) == 5 * len(merged.counts)
+    assert LatencyHistogram.from_bytes(None).total == 0
+    print(f"✓ 24 hourly histograms merged ({len(merged.to_bytes())} bytes)")
+
+
+if __name__ == "__main__":
+    test_percentiles_within_bucket_error()
+    test_merge_and_bytes_round_trip()
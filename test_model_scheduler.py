@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test ModelScheduler
+Warm-model preference, batch ordering and cold load accounting
+"""
+
+from llm_router import COLD_LOAD_MS, ModelScheduler
+
+
+class StubOllama:
+    """/api/ps stand-in with a settable list of loaded models."""
+
+    default_model = 'small'
+    base_url = 'http://stub-ollama-scheduler'
+
+    def __init__(self, loaded):
+        self.loaded = loaded
+
+    def loaded_models(self):
+        return self.loaded
+
+
+def test_pick_model_and_batch_order():
+    """Warm models that cover the complexity win; batches run grouped, warm first."""
+    client = StubOllama(['large'])
+    scheduler = ModelScheduler(client, {'small': 0.4, 'medium': 0.6, 'large': 0.8})
+
+    assert scheduler.pick_model(0.3) == 'large'   # warm and good enough
+    assert scheduler.pick_model(0.9) == 'large'   # nothing covers it: most capable
+    client.loaded = ['small']
+    assert scheduler.loaded(refresh=True) == {'small'}
+    assert scheduler.pick_model(0.3) == 'small'
+    assert scheduler.pick_model(0.5) == 'large'   # default too weak, nothing warm covers it
+    print("✓ Warm model preferred when its quality covers the prompt")
+
+    models = ['medium', None, 'small', 'medium', None, 'small']
+    order = scheduler.batch_order(models)
+    assert [models[i] for i in order] == [None, None, 'small', 'small', 'medium', 'medium']
+    print("✓ Batch order: API-bound, warm, then cold, grouped by model")
+
+    # Unreachable /api/ps keeps the last known set
+    client.loaded = None
+    assert scheduler.loaded(refresh=True) == {'small'}
+
+
+def test_cold_load_accounting():
+    """Slow loads are counted as cold loads, and the model is then considered warm."""
+    scheduler = ModelScheduler(StubOllama([]), {'small': 0.4, 'large': 0.8})
+    scheduler.record('large', COLD_LOAD_MS * 4)
+    scheduler.record('large', 5.0)
+    scheduler.record('small', None)
+    stats = scheduler.get_stats()
+    assert stats['loaded'] == ['large', 'small']
+    assert stats['models']['large'] == {'requests': 2, 'cold_loads': 1, 'load_ms': COLD_LOAD_MS * 4}
+    assert stats['cold_loads'] == 1
+    print(f"✓ Cold loads counted ({stats['cold_loads']}, {stats['load_ms']:.0f}ms)")
+
+
+if __name__ == "__main__":
+    test_pick_model_and_batch_order()
+    test_cold_load_accounting()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test OllamaClient
+Cached health state and pooled keep-alive connections against a stub server
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm_router import OllamaClient
+
+
+class StubServer:
+    """Minimal Ollama API: counts /api/tags probes and the client ports seen."""
+
+    def __init__(self):
+        self.tags_calls = 0
+        self.client_ports = set()
+        self.status = 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                stub.client_ports.add(self.client_address[1])
+                if self.path == '/api/tags':
+                    stub.tags_calls += 1
+                self._send(stub.status, {'models': []})
+
+            def do_POST(self):
+                stub.client_ports.add(self.client_address[1])
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self._send(stub.status, {'response': 'ok', 'eval_count': 1})
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_health_cached_within_ttl():
+    """is_available() probes once per TTL; failures re-probe after UNHEALTHY_RETRY."""
+    stub = StubServer()
+    client = OllamaClient(base_url=stub.url)
+    client.HEALTH_TTL = 0.3
+    client.UNHEALTHY_RETRY = 0.1
+    try:
+        assert client.is_available()
+        for _ in range(20):
+            assert client.is_available()
+        assert stub.tags_calls == 1
+        print("✓ 21 is_available() calls, 1 probe within HEALTH_TTL")
+
+        time.sleep(0.35)
+        assert client.is_available()
+        assert stub.tags_calls == 2
+        assert client.is_available(refresh=True) and stub.tags_calls == 3
+        print("✓ Re-probed once the TTL expired (and on refresh=True)")
+
+        # Failed probes are cached for the shorter UNHEALTHY_RETRY
+        stub.status = 500
+        assert not client.is_available(refresh=True)
+        assert not client.is_available()
+        assert stub.tags_calls == 4
+        stub.status = 200
+        time.sleep(0.15)
+        assert client.is_available()
+        assert stub.tags_calls == 5
+        print("✓ Unhealthy state re-probed after UNHEALTHY_RETRY")
+
+        # A successful query refreshes the health state without a probe
+        client.mark_unhealthy()
+        assert client.query("hi")['success']
+        assert client.is_available()
+        assert stub.tags_calls == 5
+        print("✓ Successful queries refresh the cached health")
+    finally:
+        client.close()
+        stub.stop()
+
+
+def test_pooled_session_reuses_connections():
+    """Sequential requests share one keep-alive connection until close()."""
+    stub = StubServer()
+    client = OllamaClient(base_url=stub.url)
+    try:
+        session = client.session
+        for _ in range(5):
+            assert client.query("hi")['success']
+            assert client.is_available(refresh=True)
+        assert client.session is session
+        assert len(stub.client_ports) == 1
+        print("✓ 10 requests over 1 pooled connection")
+
+        client.close()
+        assert client.session is not session
+        assert client.is_available(refresh=True)
+        assert len(stub.client_ports) == 2
+        print("✓ close() drops the pool; the next request reconnects")
+
+        # An unreachable server is reported unavailable, not raised
+        client.close()
+        stub.stop()
+        assert not client.is_available(refresh=True)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    test_health_cached_within_ttl()
+    test_pooled_session_reuses_connections()
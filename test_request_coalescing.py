@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing
+Identical concurrent prompts share one generation: across threads, event
+loops and (through the response cache database) processes
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from llm_router import LLMRouter, ResponseCache
+from usage_tracker import UsageTracker
+
+
+class SlowOllama:
+    """Answers every prompt locally after a delay, counting generations."""
+
+    default_model = 'stub-model'
+    base_url = 'http://stub-ollama-coalesce'
+
+    def __init__(self, delay: float = 0.3):
+        self.delay = delay
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        return True
+
+    def loaded_models(self):
+        return [self.default_model]
+
+    async def ais_available(self):
+        return True
+
+    def _answer(self, prompt, model):
+        return {'success': True, 'response': f"answer to {prompt}", 'model': model or self.default_model,
+                'tokens': 3, 'input_tokens': 5, 'load_ms': 0.0, 'time_ms': self.delay * 1000, 'error': None}
+
+    def query(self, prompt, model=None, temperature=0.7, num_ctx=None):
+        with self._lock:
+            self.queries += 1
+        time.sleep(self.delay)
+        return self._answer(prompt, model)
+
+    async def aquery(self, prompt, model=None, temperature=0.7, num_ctx=None):
+        self.queries += 1
+        await asyncio.sleep(self.delay)
+        return self._answer(prompt, model)
+
+
+class FailingRouter(LLMRouter):
+    """Generation that fails after a delay."""
+
+    def __init__(self):
+        super().__init__(ollama_client=SlowOllama())
+        self.attempts = 0
+
+    def _execute(self, prompt, force_local, force_api, model, temperature, start_time):
+        self.attempts += 1
+        time.sleep(0.2)
+        raise RuntimeError("provider exploded")
+
+
+def _run_threads(count: int, target) -> list:
+    """Run target() on count threads started together; results (or exceptions) in order."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index: int):
+        barrier.wait()
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_threads_share_one_generation():
+    """N threads with the same prompt: 1 generation, N usage rows, N-1 marked coalesced."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        tracker = UsageTracker(db_path, buffered=False)
+        ollama = SlowOllama()
+        router = LLMRouter(tracker, ollama_client=ollama)
+
+        results = _run_threads(6, lambda: router.route_and_execute("Summarize my notes", force_local=True))
+        assert ollama.queries == 1
+        assert all(r['success'] and r['response'] == "answer to Summarize my notes" for r in results)
+        assert sum(1 for r in results if r.get('coalesced')) == 5
+        assert all(r['cost_usd'] == 0.0 for r in results)
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT provider, coalesced FROM usage_stats ORDER BY id").fetchall()
+        conn.close()
+        assert len(rows) == 6 and sorted(c for _, c in rows) == [0, 1, 1, 1, 1, 1]
+        assert {provider for provider, _ in rows} == {'ollama'}
+        assert tracker.get_stats(days=1)['coalesced_requests'] == 5
+        print("✓ 6 threads, 1 generation, 6 usage rows (5 coalesced)")
+
+        # Different prompts are not coalesced
+        ollama.delay = 0.05
+        _run_threads(3, lambda: router.route_and_execute(f"prompt {threading.get_ident()}", force_local=True))
+        assert ollama.queries == 4
+
+
+def test_leader_error_reaches_every_waiter():
+    """If the generation raises, every waiting caller re-raises the same error."""
+    router = FailingRouter()
+    results = _run_threads(5, lambda: router.route_and_execute("doomed prompt", force_local=True))
+    assert router.attempts == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "provider exploded" for r in results)
+    assert router._inflight == {}
+    print("✓ Leader exception re-raised in all 5 callers")
+
+
+def test_cancelled_async_leader():
+    """Cancelling the leading aroute() call doesn't cancel the calls waiting on it."""
+    ollama = SlowOllama(delay=0.2)
+    ollama.base_url = 'http://stub-ollama-coalesce-async'
+    router = LLMRouter(ollama_client=ollama)
+
+    async def main():
+        leader = asyncio.create_task(router.aroute("shared prompt", force_local=True, log_usage=False))
+        await asyncio.sleep(0.05)
+        followers = [asyncio.create_task(router.aroute("shared prompt", force_local=True, log_usage=False))
+                     for _ in range(3)]
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        return results
+
+    results = asyncio.run(main())
+    assert ollama.queries == 2
+    assert all(r['success'] for r in results)
+    # One follower took over and generated; the others coalesced onto it
+    assert [bool(r.get('coalesced')) for r in results].count(False) == 1
+    print("✓ Cancelled leader: followers retried, one new generation")
+
+
+def test_coalescing_across_processes():
+    """Routers sharing a cache database (as separate processes do) generate a prompt once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'cache.db')
+        ollama = SlowOllama(delay=0.5)
+        ollama.base_url = 'http://stub-ollama-coalesce-procs'
+        # One router per "process": nothing shared but the database file
+        routers = [LLMRouter(response_cache=ResponseCache(cache_path), ollama_client=ollama) for _ in range(3)]
+        counter = iter(range(3))
+        lock = threading.Lock()
+
+        def route():
+            with lock:
+                router = routers[next(counter)]
+            return router.route_and_execute("Cron job prompt", force_local=True)
+
+        results = _run_threads(3, route)
+        assert ollama.queries == 1
+        leaders = [r for r in results if not r.get('coalesced')]
+        assert len(leaders) == 1 and leaders[0]['provider'] == 'ollama'
+        waiters = [r for r in results if r.get('coalesced')]
+        assert all(r['provider'] == 'cache' and r['response'] == leaders[0]['response'] for r in waiters)
+        conn = sqlite3.connect(cache_path)
+        assert conn.execute("SELECT COUNT(*) FROM llm_response_inflight").fetchone()[0] == 0
+        conn.close()
+        print("✓ 3 routers on one cache database, 1 generation")
+
+
+def test_inflight_claims():
+    """Claims block other callers until released or stale; failed leaders don't strand waiters."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.db'))
+        key = cache.make_key("p", 'm', 0.7)
+        owner = cache.claim(key)
+        assert owner is not None and cache.claim(key) is None
+        cache.release(key, "someone-else")
+        assert cache.claim(key) is None
+        cache.release(key, owner)
+        assert cache.claim(key) is not None
+        print("✓ One claim per key until its owner releases it")
+
+        # A released claim without a cached answer ends the wait with a miss
+        owner = cache.claim(cache.make_key("q", 'm', 0.7))
+        threading.Timer(0.3, cache.release, (cache.make_key("q", 'm', 0.7), owner)).start()
+        started = time.monotonic()
+        assert cache.wait_for("q", 'm', 0.7, timeout=5) is None
+        assert 0.25 < time.monotonic() - started < 2
+        print("✓ Waiters stop when the leader gives up")
+
+        # Claims left behind by a crashed process go stale
+        conn = sqlite3.connect(cache.db_path)
+        conn.execute("UPDATE llm_response_inflight SET started_at = started_at - 3600")
+        conn.commit()
+        conn.close()
+        assert cache.wait_for("p", 'm', 0.7, timeout=5) is None
+        assert cache.claim(key) is not None
+        print("✓ Stale claims are taken over")
+
+
+if __name__ == "__main__":
+    test_threads_share_one_generation()
+    test_leader_error_reaches_every_waiter()
+    test_cancelled_async_leader()
+    test_coalescing_across_processes()
+    test_inflight_claims()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test ResponseCache
+Exact and near-duplicate hits, TTL expiry, eviction and cache hits in usage_stats
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from llm_router import LLMRouter, ResponseCache
+from usage_tracker import UsageTracker
+
+
+RESULT = {'success': True, 'response': 'cached answer', 'provider': 'ollama', 'model': 'stub-model',
+          'tokens': 12, 'cost_usd': 0.0, 'savings_usd': 0.002, 'complexity_score': 0.2}
+
+
+class StubOllama:
+    """Answers every prompt locally and counts the generations."""
+
+    default_model = 'stub-model'
+    base_url = 'http://stub-ollama-cache'
+
+    def __init__(self):
+        self.queries = 0
+
+    def is_available(self):
+        return True
+
+    def loaded_models(self):
+        return [self.default_model]
+
+    def query(self, prompt, model=None, temperature=0.7, num_ctx=None):
+        self.queries += 1
+        return {'success': True, 'response': f"answer {self.queries}", 'model': model or self.default_model,
+                'tokens': 3, 'input_tokens': 5, 'load_ms': 0.0, 'time_ms': 1.0, 'error': None}
+
+
+def _age_entries(db_path: str, seconds: float):
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE llm_response_cache SET created_at = created_at - ?", (seconds,))
+    conn.commit()
+    conn.close()
+
+
+def test_exact_hits_and_expiry():
+    """Whitespace-normalized prompts hit; other models/temperatures and expired entries miss."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cache.db')
+        cache = ResponseCache(db_path, ttl_seconds=3600)
+
+        cache.put("What is  NIL?\n", 'local:m', 0.7, RESULT)
+        hit = cache.get("What is NIL?", 'local:m', 0.7)
+        assert hit['response'] == 'cached answer' and hit['match'] == 'exact'
+        assert hit['source_provider'] == 'ollama' and abs(hit['api_cost_usd'] - 0.002) < 1e-12
+        assert cache.get("What is NIL?", 'local:other', 0.7) is None
+        assert cache.get("What is NIL?", 'local:m', 0.2) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+        print("✓ Exact hits keyed on normalized prompt, model and temperature")
+
+        _age_entries(db_path, 3601)
+        assert cache.get("What is NIL?", 'local:m', 0.7) is None
+        cache.put("fresh", 'local:m', 0.7, RESULT)  # puts drop expired rows
+        assert cache.get_stats()['entries'] == 1
+        print("✓ Entries expire after ttl_seconds")
+
+
+def test_size_eviction():
+    """Past max_entries the least recently hit entries are evicted."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.db'), max_entries=3)
+        for i in range(3):
+            cache.put(f"prompt {i}", 'm', 0.7, RESULT)
+        assert cache.get("prompt 0", 'm', 0.7) is not None  # now the most recently hit
+        cache.put("prompt 3", 'm', 0.7, RESULT)
+        cache.put("prompt 4", 'm', 0.7, RESULT)
+        kept = [i for i in range(5) if cache.get(f"prompt {i}", 'm', 0.7) is not None]
+        assert kept == [0, 3, 4]
+        print("✓ Least recently hit entries evicted past max_entries")
+
+
+def test_similarity_threshold():
+    """Near-duplicates hit at or above similarity_threshold, among the newest max_candidates."""
+    vectors = {
+        "bitcoin price today": [1.0, 0.0, 0.0],
+        "btc price today": [0.98, 0.2, 0.0],      # cosine ~0.98
+        "bitcoin price history": [0.8, 0.6, 0.0],  # cosine 0.8
+        "unrelated": [0.0, 0.0, 1.0],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.db'), embed_fn=lambda text: vectors.get(text),
+                              similarity_threshold=0.95, max_candidates=2)
+        cache.put("bitcoin price today", 'm', 0.7, RESULT)
+
+        similar = cache.get("btc price today", 'm', 0.7)
+        assert similar['match'] == 'similar' and 0.95 <= similar['similarity'] < 1.0
+        assert cache.get("bitcoin price history", 'm', 0.7) is None
+        assert cache.get("btc price today", 'other', 0.7) is None
+        assert cache.get("no embedding", 'm', 0.7) is None
+        assert cache.similar_hits == 1
+        print(f"✓ Similar prompt hit at {similar['similarity']:.3f}, 0.8 rejected")
+
+        # Only the most recently hit entries are compared
+        cache.put("unrelated", 'm', 0.7, RESULT)
+        cache.put("bitcoin price history", 'm', 0.7, RESULT)
+        cache.get("unrelated", 'm', 0.7)
+        cache.get("bitcoin price history", 'm', 0.7)
+        assert cache.get("btc price today", 'm', 0.7) is None
+        cache.get("bitcoin price today", 'm', 0.7)
+        assert cache.get("btc price today", 'm', 0.7)['match'] == 'similar'
+        print("✓ Near-duplicate scan bounded to max_candidates")
+
+
+def test_router_logs_cache_hits():
+    """Routed cache hits skip the model and are logged with provider 'cache'."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        tracker = UsageTracker(db_path, buffered=False)
+        ollama = StubOllama()
+        router = LLMRouter(tracker, response_cache=ResponseCache(db_path), ollama_client=ollama)
+
+        first = router.route_and_execute("What is a haiku?", force_local=True)
+        second = router.route_and_execute("What  is a haiku?", force_local=True)
+        assert ollama.queries == 1
+        assert first['provider'] == 'ollama' and second['provider'] == 'cache'
+        assert second['response'] == first['response'] and second['cost_usd'] == 0.0
+        assert second['savings_usd'] == first['savings_usd'] > 0
+
+        conn = sqlite3.connect(db_path)
+        providers = [row[0] for row in conn.execute("SELECT provider FROM usage_stats ORDER BY id")]
+        conn.close()
+        assert providers == ['ollama', 'cache']
+        assert tracker.get_stats(days=1)['providers']['cache']['count'] == 1
+        print("✓ Cache hit logged to usage_stats with provider 'cache'")
+
+
+if __name__ == "__main__":
+    test_exact_hits_and_expiry()
+    test_size_eviction()
+    test_similarity_threshold()
+    test_router_logs_cache_hits()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test LLMRouter.route_and_stream
+Completed and abandoned streams against an in-process Ollama stand-in
+"""
+
+import os
+import tempfile
+import threading
+
+from llm_router import PROVIDER_CONCURRENCY, LLMRouter
+from usage_tracker import UsageTracker
+
+
+class StubOllama:
+    """Streams a fixed response, word by word."""
+
+    default_model = 'stub-model'
+    base_url = 'http://stub-ollama'
+
+    def is_available(self):
+        return True
+
+    def loaded_models(self):
+        return [self.default_model]
+
+    def stream_events(self, prompt, model=None, temperature=0.7, num_ctx=None):
+        for word in ('one ', 'two ', 'three'):
+            yield {'response': word}
+        yield {'done': True, 'eval_count': 3, 'eval_duration': 3_000_000}
+
+
+def test_stream_result():
+    """Exhausted streams log a result; closed ones leave an aborted result and log nothing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _check_stream_result(UsageTracker(os.path.join(tmp, 'usage.db'), buffered=False))
+
+
+def _check_stream_result(tracker: UsageTracker):
+    router = LLMRouter(usage_tracker=tracker, ollama_client=StubOllama())
+
+    stream = router.route_and_stream("Summarize my notes", force_local=True)
+    assert stream.text() == 'one two three'
+    assert stream.result['provider'] == 'ollama' and stream.result['success']
+    assert stream.result['ttft_ms'] is not None and not stream.result.get('aborted')
+    assert tracker.get_stats(days=1)['total_requests'] == 1
+    print("✓ Completed stream logged with TTFT")
+
+    stream = router.route_and_stream("Summarize my other notes", force_local=True)
+    assert next(stream) == 'one '
+    stream.close()
+    assert stream.result['aborted'] and not stream.result['success']
+    assert stream.result['provider'] == 'ollama' and stream.result['response'] == 'one '
+    assert tracker.get_stats(days=1)['total_requests'] == 1
+    print("✓ Closed stream: aborted result, nothing logged")
+
+
+class StallingOllama(StubOllama):
+    """Sends one word, then goes silent until released (a hung connection)."""
+
+    base_url = 'http://stub-ollama-stall'
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def stream_events(self, prompt, model=None, temperature=0.7, num_ctx=None):
+        try:
+            yield {'response': 'one '}
+            self.release.wait(10)
+            yield {'done': True, 'eval_count': 1, 'eval_duration': 1_000_000}
+        finally:
+            self.finished.set()
+
+
+def test_stall_failover_frees_ollama_slot():
+    """A stalled local stream fails over to the API without keeping its Ollama slot."""
+    ollama = StallingOllama()
+    router = LLMRouter(ollama_client=ollama)
+    try:
+        stream = router.route_and_stream("Summarize my notes", force_local=True, stall_timeout=0.1)
+        text = stream.text()
+        assert text.startswith('one ') and stream.result['provider'] == 'claude'
+        assert 'stalled' in stream.result['routing_reason']
+
+        # The worker is still blocked reading Ollama, but its slot is free again
+        assert not ollama.finished.is_set()
+        slot = router._limits['ollama']
+        for _ in range(PROVIDER_CONCURRENCY['ollama']):
+            assert slot.acquire(blocking=False)
+        for _ in range(PROVIDER_CONCURRENCY['ollama']):
+            slot.release()
+        print("✓ Stall failover released the Ollama slot")
+    finally:
+        ollama.release.set()
+    assert ollama.finished.wait(5)
+    # The abandoned worker finishing later doesn't release the slot a second time
+    for _ in range(PROVIDER_CONCURRENCY['ollama']):
+        assert slot.acquire(blocking=False)
+    assert not slot.acquire(blocking=False)
+
+
+if __name__ == "__main__":
+    test_stream_result()
+    test_stall_failover_frees_ollama_slot()
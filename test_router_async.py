@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test LLMRouter.aroute
+Coalescing and concurrency limits per event loop, with loops in several
+threads; no blocking model scheduling calls on the event loop
+"""
+
+import asyncio
+import gc
+import threading
+
+from llm_router import LLMRouter
+
+
+class StubOllama:
+    default_model = 'stub-model'
+    base_url = 'http://stub-ollama-async'
+
+    def is_available(self):
+        return True
+
+    def loaded_models(self):
+        return [self.default_model]
+
+
+class SlowRouter(LLMRouter):
+    """aroute() with a fixed, slow generation in place of real providers."""
+
+    def __init__(self):
+        super().__init__(ollama_client=StubOllama())
+        self.generations = []
+        self.started = threading.Barrier(2)
+
+    async def _aroute_once(self, prompt, force_local, force_api, model, temperature, start_time):
+        self.generations.append(prompt)
+        async with self._async_limit('ollama'):
+            await asyncio.sleep(0.2)
+        return {'provider': 'ollama', 'response': prompt, 'success': True, 'cost_usd': 0.0,
+                'savings_usd': 0.0, 'routing_reason': 'stub', 'time_ms': 200.0}
+
+
+def test_two_event_loops():
+    """Routers used from two loops at once keep each loop's in-flight and semaphore state."""
+    router = SlowRouter()
+    results = {}
+
+    def worker(name: str):
+        async def main():
+            # Both loops have requests in flight before either finishes
+            await asyncio.to_thread(router.started.wait)
+            return await asyncio.gather(*(router.aroute("same prompt", log_usage=False) for _ in range(3)))
+        results[name] = asyncio.run(main())
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One generation per loop; the other two requests in each loop coalesced onto it
+    assert router.generations == ["same prompt", "same prompt"]
+    for name, loop_results in results.items():
+        assert [bool(r.get('coalesced')) for r in loop_results] == [False, True, True], name
+    print("✓ Each loop coalesces its own identical requests")
+
+    # Loops are held weakly: finished asyncio.run() loops drop out
+    gc.collect()
+    assert len(router._ainflight) == 0 and len(router._async_limits) == 0
+    print("✓ Per-loop state released with the loop")
+
+
+class ProbedOllama(StubOllama):
+    """Records the thread each /api/ps probe runs on."""
+
+    base_url = 'http://stub-ollama-probe'
+
+    def __init__(self):
+        self.probe_threads = []
+
+    async def ais_available(self):
+        return True
+
+    def loaded_models(self):
+        self.probe_threads.append(threading.get_ident())
+        return [self.default_model]
+
+    async def aquery(self, prompt, model=None, temperature=0.7, num_ctx=None):
+        return {'success': True, 'response': 'ok', 'model': model, 'tokens': 1,
+                'input_tokens': 1, 'load_ms': 0.0, 'time_ms': 1.0, 'error': None}
+
+
+def test_scheduler_probe_off_event_loop():
+    """aroute() refreshes the loaded-model list in a worker thread, not on the loop."""
+    ollama = ProbedOllama()
+    router = LLMRouter(ollama_client=ollama)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        result = await router.aroute("Summarize my notes", log_usage=False)
+        cached = await router.aroute("Summarize my other notes", log_usage=False)
+        return loop_thread, result, cached
+
+    loop_thread, result, cached = asyncio.run(main())
+    assert result['provider'] == 'ollama' and cached['provider'] == 'ollama'
+    assert len(ollama.probe_threads) == 1  # second call used the cached /api/ps answer
+    assert loop_thread not in ollama.probe_threads
+    print("✓ /api/ps probed once, off the event loop")
+
+
+if __name__ == "__main__":
+    test_two_event_loops()
+    test_scheduler_probe_off_event_loop()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test AdaptiveRoutingPolicy
+Learning from usage_stats history, overrides, circuit breaker and replay
+"""
+
+import os
+import tempfile
+
+from routing_policy import (BREAKER_FAILURES, MIN_SAMPLES, PROBE_INTERVAL,
+                            AdaptiveRoutingPolicy, replay)
+from usage_tracker import UsageTracker
+
+LOCAL_MODEL = 'llama3.1:8b'
+
+
+def _history(tracker: UsageTracker, n: int = 2 * MIN_SAMPLES):
+    """Local: fast and free. API: slow and paid. Both around complexity 0.45."""
+    events = []
+    for i in range(n):
+        events.append(('ollama', f"local {i}", {
+            'response': 'ok', 'model': LOCAL_MODEL, 'complexity_score': 0.45,
+            'time_ms': 300.0, 'cost_usd': 0.0, 'success': True, 'routing_reason': 'Simple task detected'}))
+        events.append(('claude', f"api {i}", {
+            'response': 'ok', 'model': 'claude-sonnet', 'complexity_score': 0.45,
+            'time_ms': 4000.0, 'cost_usd': 0.02, 'success': True, 'routing_reason': 'Borderline'}))
+    tracker.log_usage_many(events)
+
+
+def test_policy_learns_from_history():
+    """A policy primed from usage_stats moves borderline prompts to the cheaper local model."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = UsageTracker(os.path.join(tmp, 'usage.db'), buffered=False)
+
+        # No history: the analyzer's decision stands
+        empty = AdaptiveRoutingPolicy.from_usage_stats(tracker, local_model=LOCAL_MODEL)
+        analysis = {'use_local': False, 'complexity_score': 0.45, 'reason': 'Borderline'}
+        assert empty.choose(analysis)['use_local'] is False
+        print("✓ No history, analyzer decision kept")
+
+        _history(tracker)
+        policy = AdaptiveRoutingPolicy.from_usage_stats(tracker, local_model=LOCAL_MODEL)
+        assert policy.get_stats()['observations'] == 4 * MIN_SAMPLES
+        decision = policy.choose(analysis)
+        assert decision['use_local'] is True and decision['model'] == LOCAL_MODEL
+        assert decision['reason'].startswith('Adaptive:')
+        assert analysis['use_local'] is False  # caller's dict untouched
+        assert policy.get_stats()['overrides'] == 1
+        print(f"✓ Learned override: {decision['reason']}")
+
+        # Complex prompts stay on the API whatever the estimates say
+        complex_analysis = {'use_local': False, 'complexity_score': 0.9, 'reason': 'Complex'}
+        assert policy.choose(complex_analysis)['use_local'] is False
+        print("✓ High complexity never moved off the API")
+
+        # Replaying the history counts the overrides it would have made
+        summary = replay(tracker.get_routing_history(),
+                         AdaptiveRoutingPolicy(local_model=LOCAL_MODEL))
+        assert summary['requests'] == 4 * MIN_SAMPLES and summary['changed'] > 0
+        assert summary['adaptive']['cost_usd'] < summary['logged']['cost_usd']
+        print(f"✓ Replay: {summary['changed']} of {summary['requests']} rerouted, cheaper")
+
+
+def test_circuit_breaker():
+    """Consecutive local failures divert traffic to the API, with periodic probes."""
+    policy = AdaptiveRoutingPolicy(local_model=LOCAL_MODEL)
+    now = 1_000_000.0
+    for i in range(BREAKER_FAILURES):
+        policy.observe({'provider': 'ollama', 'model': LOCAL_MODEL, 'complexity_score': 0.1,
+                        'time_ms': 30000.0, 'success': False}, now=now + i)
+    assert policy.get_stats()['tripped_models'] == [LOCAL_MODEL]
+
+    analysis = {'use_local': True, 'complexity_score': 0.1, 'reason': 'Simple task detected'}
+    assert policy.choose(analysis, now=now + BREAKER_FAILURES)['use_local'] is False
+    print("✓ Breaker open: local traffic sent to the API")
+
+    probe_time = now + BREAKER_FAILURES + PROBE_INTERVAL
+    assert policy.choose(analysis, now=probe_time)['use_local'] is True
+    assert policy.choose(analysis, now=probe_time + 1)['use_local'] is False
+    print("✓ One probe per PROBE_INTERVAL")
+
+    policy.observe({'provider': 'ollama', 'model': LOCAL_MODEL, 'complexity_score': 0.1,
+                    'time_ms': 200.0, 'success': True}, now=probe_time + 2)
+    assert policy.get_stats()['tripped_models'] == []
+    assert policy.choose(analysis, now=probe_time + 3)['use_local'] is True
+    print("✓ Successful probe closes the breaker")
+
+
+if __name__ == "__main__":
+    test_policy_learns_from_history()
+    test_circuit_breaker()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test schema migrations
+Builds a throwaway database, upgrades it, and checks the JettDB fast paths
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from jett_db import JettDB
+from schema_migrations import upgrade, load_migrations, current_version, connect
+
+
+def test_schema_migrations():
+    """Upgrade a fresh database twice and exercise the migrated schema."""
+    print("=" * 60)
+    print("Testing Schema Migrations")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'jett_knowledge.db')
+
+        # Test 1: Fresh upgrade applies every migration
+        applied = upgrade(db_path, verbose=False)
+        latest = load_migrations()[-1].version
+        assert applied == [m.version for m in load_migrations()]
+        print(f"✓ Applied {len(applied)} migrations")
+
+        # Test 2: Running again is a no-op
+        assert upgrade(db_path, verbose=False) == []
+        conn = connect(db_path)
+        assert current_version(conn) == latest
+        conn.close()
+        print(f"✓ Idempotent at version {latest}")
+
+        db = JettDB(db_path)
+
+        # Test 3: topic_key dedupe uses the index
+        db.add_content_idea("Bitcoin Quote - Satoshi - HIGH", "bitcoin_quotes", "Quote card")
+        assert db.topic_exists("Bitcoin Quote - Satoshi - LOW")
+        assert db.topics_exist(["Bitcoin Quote - Satoshi", "Unknown"]) == {
+            "Bitcoin Quote - Satoshi": True, "Unknown": False}
+        with db.get_connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT 1 FROM content_ideas WHERE topic_key = ?", ("x",)
+            ).fetchall()
+        assert 'idx_content_topic_key' in plan[0]['detail']
+        print("✓ topic_exists served by idx_content_topic_key")
+
+        # Test 4: FTS triggers keep keyword search in sync
+        research_id = db.add_research("NIL Market Size", "sports-business", "NIL deals grew 30% in 2024")
+        assert [r['id'] for r in db.search_research(query="nil deal")] == [research_id]
+        ranked = db.search_ranked('research', 'nil', limit=5)
+        assert ranked and '[NIL]' in ranked[0]['snippet']
+        print("✓ Full-text search returns ranked snippets")
+
+        # Test 5: Bulk inserts skip reruns
+        records = [{'topic': f"Finding {i}", 'category': 'bitcoin', 'findings': 'text'} for i in range(50)]
+        first = db.add_research_many(records)
+        assert None not in first
+        assert db.add_research_many(records) == [None] * 50
+        try:
+            db.add_research_many(records[:1], on_conflict='fail')
+            assert False, "expected IntegrityError"
+        except sqlite3.IntegrityError:
+            pass
+        print("✓ Bulk insert conflict policies")
+
+        # Test 6: Counter-backed stats match a direct count
+        task_id = db.add_task("Check stats", "testing")
+        db.update_task_status(task_id, "completed")
+        stats = db.get_stats()
+        with db.get_connection() as conn:
+            assert stats['total_research'] == conn.execute(
+                "SELECT COUNT(*) FROM research_findings").fetchone()[0]
+        assert stats['completed_tasks'] == 1 and stats['pending_tasks'] == 0
+        assert stats['draft_content'] == 1
+        assert db.get_stats(max_age=60) == stats
+        print("✓ get_stats served from stat_counters")
+
+        db.close()
+
+    print("\n✅ Schema migrations working")
+
+
+if __name__ == "__main__":
+    test_schema_migrations()
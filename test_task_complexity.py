@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test TaskComplexityAnalyzer
+Batch classification must agree with analyzing each prompt on its own
+"""
+
+from llm_router import TaskComplexityAnalyzer
+
+
+PROMPTS = [
+    "Summarize my notes on Juan Soto",
+    "Analyze the strategic implications of NIL deals on college sports recruiting",
+    "What athletes have contracts over $10M?",
+    "Find athletes with contracts over $5M",
+    "",
+    "hello",
+    # lower() changes the length of these, shifting offsets in a joined batch
+    "İİİİİİİİİİ hello",
+    "analyze ...",
+    "summarize list",
+    "ÉVALUER la stratégie — Ꭰ ß ǅ, then compare and evaluate",
+    "SELECT * FROM athletes\0 how many",
+    "word " * 150,
+]
+
+
+def test_analyze_many_matches_analyze():
+    """analyze_many(ps) == [analyze(p) for p in ps], including non-ASCII input."""
+    expected = [TaskComplexityAnalyzer.analyze(p) for p in PROMPTS]
+    assert TaskComplexityAnalyzer.analyze_many(PROMPTS) == expected
+    print(f"✓ {len(PROMPTS)} prompts classified the same in a batch")
+
+    # Order within the batch doesn't matter either
+    reordered = PROMPTS[::-1]
+    assert TaskComplexityAnalyzer.analyze_many(reordered) == expected[::-1]
+    assert TaskComplexityAnalyzer.analyze_many([]) == []
+    print("✓ Reversed and empty batches")
+
+
+if __name__ == "__main__":
+    test_analyze_many_matches_analyze()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test TokenCounter
+Heuristic counts agree with encode(), trim/chunk stay within budget, cache
+counters, custom tokenizer backends
+"""
+
+import random
+
+from token_counter import HeuristicTokenizer, TokenCounter, Tokenizer
+
+
+SAMPLES = [
+    "",
+    "hello",
+    "Summarize my notes on Juan Soto",
+    "   leading and trailing spaces   ",
+    "def f(x):\n    return {'a': [1, 2, 3]}  # comment\n",
+    '{"key": "value", "nested": {"list": [1, 22, 333, 4444, 55555]}}',
+    "supercalifragilisticexpialidocious antidisestablishmentarianism",
+    "don't won't they're I'll we've",
+    "snake_case__name ___ ===> !!! ??? ...",
+    "Ünïcödé wörds, 日本語のテキスト, emoji 🎉🎉 and tabs\t\t\tend",
+    "1234567890 3.14159 $10,000,000",
+]
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    alphabet = "abcdefghij KLMNOP 0123456789 _-.,;:!?(){}[]\n\t'\"éü日🎉"
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def test_heuristic_count_matches_encode():
+    """count() is the fast path of len(encode()); decode(encode()) round-trips."""
+    tokenizer = HeuristicTokenizer()
+    rng = random.Random(7)
+    texts = SAMPLES + [_random_text(rng, rng.randint(1, 400)) for _ in range(300)]
+    for text in texts:
+        tokens = tokenizer.encode(text)
+        assert tokenizer.count(text) == len(tokens), text
+        assert tokenizer.decode(tokens) == text
+    print(f"✓ count() == len(encode()) on {len(texts)} texts")
+
+
+def test_trim_and_chunk_within_budget():
+    """trim() and chunk() never exceed max_tokens and keep the text."""
+    counter = TokenCounter(HeuristicTokenizer())
+    text = ' '.join(SAMPLES) * 20
+
+    trimmed, was_trimmed = counter.trim(text, 50)
+    assert was_trimmed and counter.count(trimmed) <= 50 and text.startswith(trimmed)
+    assert counter.trim("short", 50) == ("short", False)
+    print("✓ trim() keeps the start within budget")
+
+    for max_tokens, overlap in ((64, 0), (64, 16), (7, 3)):
+        chunks = counter.chunk(text, max_tokens, overlap)
+        assert all(counter.count(chunk) <= max_tokens for chunk in chunks)
+        if overlap == 0:
+            assert ''.join(chunks) == text
+    assert counter.chunk("short", 10) == ["short"]
+    print("✓ chunk() pieces within budget, no-overlap chunks rejoin to the text")
+
+
+def test_count_cache():
+    """Repeated counts are cache hits; the cache is bounded."""
+    counter = TokenCounter(HeuristicTokenizer(), cache_size=2)
+    assert counter.count(None) == 0 and counter.count("") == 0
+    first = counter.count("one two three")
+    assert counter.count("one two three") == first
+    counter.count("a")
+    counter.count("b")
+    stats = counter.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3 and stats['entries'] == 2
+    print(f"✓ Cache counters ({stats})")
+
+
+def test_custom_tokenizer():
+    """Backends must implement encode/decode; count() comes from the base class."""
+    class CharTokenizer(Tokenizer):
+        name = 'chars'
+
+        def encode(self, text):
+            return list(text)
+
+        def decode(self, tokens):
+            return ''.join(tokens)
+
+    class EncodeOnly(Tokenizer):
+        def encode(self, text):
+            return list(text)
+
+    for abstract in (Tokenizer, EncodeOnly):
+        try:
+            abstract()
+            assert False, f"{abstract.__name__} should not be instantiable"
+        except TypeError:
+            pass
+
+    counter = TokenCounter(CharTokenizer())
+    assert counter.count("hello") == 5
+    assert counter.trim("hello world", 5)[0] == "hello"
+    print("✓ Custom backends plug in; incomplete ones are rejected")
+
+
+if __name__ == "__main__":
+    test_heuristic_count_matches_encode()
+    test_trim_and_chunk_within_budget()
+    test_count_cache()
+    test_custom_tokenizer()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Test UsageTracker
+Rollups against raw aggregates, several writers on one database, buffered
+writes, spill-file replay and retention
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from usage_tracker import USAGE_COLUMNS, UsageTracker, iter_usage_archive
+
+
+def _row(timestamp: str, provider: str = 'ollama', **values) -> tuple:
+    """usage_stats row (USAGE_COLUMNS order) with a chosen timestamp."""
+    row = dict.fromkeys(USAGE_COLUMNS)
+    row.update(timestamp=timestamp, provider=provider, prompt='p', success=1, **values)
+    return tuple(row[column] for column in USAGE_COLUMNS)
+
+
+def _raw_count(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM usage_stats").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _rollup_count(db_path: str, table: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COALESCE(SUM(count), 0) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_concurrent_writers():
+    """Trackers writing one database at once roll each row up exactly once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        UsageTracker(db_path, buffered=False)
+
+        def write(worker: int):
+            tracker = UsageTracker(db_path, buffered=False)
+            for i in range(50):
+                tracker.log_usage_many([
+                    ('ollama', f"w{worker} p{i} e{j}", {'response': 'ok', 'time_ms': 10.0 + j})
+                    for j in range(3)
+                ])
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        tracker = UsageTracker(db_path, buffered=False)
+        assert tracker.get_last_usage_id() == 900
+        assert _rollup_count(db_path, 'usage_rollup_daily') == 900
+        assert _rollup_count(db_path, 'usage_rollup_hourly') == 900
+        assert tracker.get_stats(days=1)['total_requests'] == 900
+        print("✓ 6 concurrent writers, 900 rows, 900 rolled up")
+
+
+def test_rollups_match_raw():
+    """get_stats / get_daily_summary over rollups equal raw aggregates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        tracker = UsageTracker(db_path, buffered=False)
+        now = datetime.now()
+        rows = [
+            _row((now - timedelta(hours=i * 7, minutes=i)).isoformat(),
+                 provider=('ollama', 'claude')[i % 2], model=('a', 'b', None)[i % 3],
+                 tokens=i, cost_usd=i / 1000, time_ms=float(i), complexity_score=(i % 10) / 10)
+            for i in range(120)
+        ]
+        tracker._write_rows(rows)
+
+        stats = tracker.get_stats(days=7)
+        conn = sqlite3.connect(db_path)
+        raw = dict(((provider, (count, tokens, cost, avg_time))
+                    for provider, count, tokens, cost, avg_time in conn.execute("""
+                        SELECT provider, COUNT(*), SUM(tokens), SUM(cost_usd), AVG(time_ms)
+                        FROM usage_stats WHERE timestamp >= ? GROUP BY provider
+                    """, (stats['start_date'],))))
+        for provider, (count, tokens, cost, avg_time) in raw.items():
+            pstats = stats['providers'][provider]
+            assert pstats['count'] == count and pstats['total_tokens'] == tokens
+            assert abs(pstats['total_cost'] - cost) < 1e-9
+            assert abs(pstats['avg_time_ms'] - avg_time) < 1e-6
+        print(f"✓ get_stats matches raw rows ({stats['total_requests']} requests)")
+
+        daily = {(r['date'], r['provider']): r['count'] for r in tracker.get_daily_summary(days=7)}
+        raw_daily = {(date, provider): count for date, provider, count in conn.execute("""
+            SELECT DATE(timestamp), provider, COUNT(*)
+            FROM usage_stats WHERE timestamp >= ? GROUP BY 1, 2
+        """, (stats['start_date'],))}
+        conn.close()
+        assert daily == raw_daily
+        print("✓ get_daily_summary matches raw rows")
+
+
+def test_buffered_flush_and_close():
+    """Buffered events reach the database on flush (and reads) and on close."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        tracker = UsageTracker(db_path, flush_every=1000, flush_interval=60)
+
+        for i in range(250):
+            tracker.log_usage('ollama', f"prompt {i}", {'response': 'ok', 'time_ms': 5.0})
+        assert _raw_count(db_path) == 0  # still queued: batch and interval not reached
+        assert tracker.get_stats(days=1)['total_requests'] == 250  # reads flush first
+        print("✓ Reads see queued events")
+
+        tracker.log_usage_many([('claude', f"more {i}", {'response': 'ok'}) for i in range(100)])
+        tracker.close()
+        assert _raw_count(db_path) == 350
+        assert _rollup_count(db_path, 'usage_rollup_daily') == 350
+        assert not tracker._writer.is_alive()
+        print("✓ close() drains the queue and stops the writer")
+
+
+class LockableTracker(UsageTracker):
+    """UsageTracker whose database can be made to look locked."""
+
+    locked = False
+
+    @contextmanager
+    def _get_connection(self):
+        if self.locked:
+            raise sqlite3.OperationalError("database is locked")
+        with super()._get_connection() as conn:
+            yield conn
+
+
+def test_spill_replay():
+    """Batches that hit a locked database spill to JSONL and are replayed later."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        spill_path = os.path.join(tmp, 'usage-spill.jsonl')
+        tracker = LockableTracker(db_path, buffered=False, spill_path=spill_path)
+
+        tracker.locked = True
+        tracker.log_usage_many([('ollama', f"spilled {i}", {'response': 'ok'}) for i in range(5)])
+        with open(spill_path) as f:
+            assert len(f.readlines()) == 5
+        tracker.locked = False
+        assert _raw_count(db_path) == 0
+        print("✓ Locked database: rows spilled")
+
+        tracker.log_usage('claude', "after unlock", {'response': 'ok'})
+        assert _raw_count(db_path) == 6
+        assert _rollup_count(db_path, 'usage_rollup_daily') == 6
+        assert not os.path.exists(spill_path)
+        print("✓ Spilled rows replayed with the next write, spill file removed")
+
+
+def _existing_database(db_path: str):
+    """A database that predates UsageTracker (auto_vacuum NONE), like jett_knowledge.db."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE research_findings (id INTEGER PRIMARY KEY, topic TEXT)")
+    conn.commit()
+    conn.close()
+
+
+def _auto_vacuum(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_retention_keeps_rollups():
+    """clear_old_data archives and deletes raw rows; reports over the rollups keep their totals."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        _existing_database(db_path)
+        tracker = UsageTracker(db_path, buffered=False)
+        now = datetime.now()
+        timestamps = [now - timedelta(hours=i * 3, minutes=i * 7 % 60) for i in range(80)]  # 10 days
+        tracker._write_rows([_row(ts.isoformat(), time_ms=float(i), tokens=1) for i, ts in enumerate(timestamps)])
+
+        before = tracker.get_stats(days=365)
+        result = tracker.clear_old_data(days=5)
+        cutoff = datetime.fromisoformat(result['cutoff_date'])
+        old = sum(1 for ts in timestamps if ts < cutoff)
+        assert result['deleted_count'] == old == sum(result['archived'].values()) > 0
+        assert _raw_count(db_path) == len(timestamps) - old
+        assert len(list(iter_usage_archive(tracker.archive_dir))) == old
+        print(f"✓ {old} rows archived by month and deleted")
+
+        after = tracker.get_stats(days=365)
+        assert after['total_requests'] == before['total_requests'] == len(timestamps)
+        assert after['providers']['ollama']['total_tokens'] == len(timestamps)
+        assert after['providers']['ollama']['p50_time_ms'] == before['providers']['ollama']['p50_time_ms']
+        print("✓ Rollups and latency histograms keep deleted history")
+
+        # A window starting in a pruned hour counts that whole hour from the hourly rollup
+        week = tracker.get_stats(days=7)
+        hour = datetime.fromisoformat(week['start_date']).replace(minute=0, second=0, microsecond=0)
+        assert week['total_requests'] == sum(1 for ts in timestamps if ts >= hour)
+        print("✓ Pruned first hour falls back to the hourly rollup")
+
+        # Explicit clear_old_data() converts the database to incremental auto_vacuum
+        assert _auto_vacuum(db_path) == 2
+        print("✓ Database converted to incremental auto_vacuum")
+
+
+def test_automatic_retention_never_converts():
+    """The writer's daily pass deletes old rows but leaves auto_vacuum conversion to clear_old_data."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        _existing_database(db_path)
+        UsageTracker(db_path, buffered=False)._write_rows(
+            [_row((datetime.now() - timedelta(days=200 + i)).isoformat()) for i in range(10)])
+
+        tracker = UsageTracker(db_path, retention_days=90)
+        tracker.log_usage('ollama', "new", {'response': 'ok'})
+        tracker.flush()  # the writer applies retention after this batch...
+        tracker.close()  # ...and finishes it before stopping
+        assert _raw_count(db_path) == 1
+        assert _auto_vacuum(db_path) == 0
+        print("✓ Automatic retention ran without a full VACUUM")
+
+
+def test_concurrent_retention():
+    """Trackers running retention at once archive and delete each old row exactly once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'usage.db')
+        archive_dir = os.path.join(tmp, 'archive')
+        now = datetime.now()
+        UsageTracker(db_path, buffered=False)._write_rows(
+            [_row((now - timedelta(days=100, minutes=i)).isoformat()) for i in range(3000)]
+            + [_row(now.isoformat())])
+
+        results = []
+
+        def retain():
+            tracker = UsageTracker(db_path, buffered=False, archive_dir=archive_dir)
+            results.append(tracker.clear_old_data(days=90, chunk_size=50, vacuum=False))
+
+        threads = [threading.Thread(target=retain) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        archived_ids = [row['id'] for row in iter_usage_archive(archive_dir)]
+        assert sum(r['deleted_count'] for r in results) == 3000
+        assert len(archived_ids) == len(set(archived_ids)) == 3000
+        assert _raw_count(db_path) == 1
+        print("✓ 4 concurrent retention passes, 3000 rows archived once each")
+
+
+if __name__ == "__main__":
+    test_concurrent_writers()
+    test_rollups_match_raw()
+    test_buffered_flush_and_close()
+    test_spill_replay()
+    test_retention_keeps_rollups()
+    test_automatic_retention_never_converts()
+    test_concurrent_retention()
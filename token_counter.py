@@ -0,0 +1,285 @@
+"""
+Token Counter - Local token counts for cost estimates and context limits
+Pluggable tokenizer backends with an LRU cache of counts
+"""
+
+import hashlib
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+# BPE vocabulary (HuggingFace tokenizer.json) used when present and `tokenizers` is installed
+TOKENIZER_DATA_PATH = os.path.join(os.path.dirname(__file__), 'data', 'tokenizer.json')
+
+# Counts remembered by the shared TokenCounter
+COUNT_CACHE_SIZE = 4096
+
+
+class Tokenizer(ABC):
+    """Tokenizer backend: encode text to tokens and back."""
+
+    name = 'base'
+
+    @abstractmethod
+    def encode(self, text: str) -> list:
+        """Tokens of text."""
+
+    @abstractmethod
+    def decode(self, tokens: list) -> str:
+        """Text of tokens (inverse of encode)."""
+
+    def count(self, text: str) -> int:
+        return len(self.encode(text))
+
+
+class HeuristicTokenizer(Tokenizer):
+    """
+    Dependency-free approximation of a BPE tokenizer.
+
+    Splits text the way GPT-style pre-tokenizers do (words with their leading
+    space, 1-3 digit groups, punctuation runs, whitespace), then charges long
+    words and symbol runs by length. Much closer than words * 1.3 on code and
+    JSON, where punctuation is most of the tokens.
+    """
+
+    name = 'heuristic'
+
+    PIECE_RE = re.compile(
+        r"'(?:[sdmt]|ll|ve|re)"      # contractions
+        r"| ?[^\W\d_]+"              # words (with leading space)
+        r"| ?\d{1,3}"                # numbers, 3 digits per token
+        r"| ?[^\s\w]+|_+"            # punctuation / symbol runs
+        r"|\s+"                      # whitespace
+    )
+    # Characters per token when a long piece is split
+    WORD_CHARS = 4
+    SYMBOL_CHARS = 2
+    SPACE_CHARS = 8
+
+    def _size(self, piece: str) -> int:
+        """Characters per token for one pre-token."""
+        if piece.isspace():
+            return self.SPACE_CHARS
+        head = piece.lstrip(' ')[:1]
+        if head.isalpha():
+            # Common words are a single token; long or rare ones split up
+            return len(piece) if len(piece) <= 7 else self.WORD_CHARS
+        if head.isdigit() or (head == "'" and piece[1:].isalpha()):
+            return len(piece)
+        return self.SYMBOL_CHARS
+
+    def _pieces(self, text: str):
+        """Pre-tokens of text, including any characters the pattern skips."""
+        last = 0
+        for match in self.PIECE_RE.finditer(text):
+            if match.start() > last:
+                yield from text[last:match.start()]
+            yield match.group()
+            last = match.end()
+        yield from text[last:]
+
+    def encode(self, text: str) -> List[str]:
+        tokens = []
+        for piece in self._pieces(text):
+            size = self._size(piece)
+            tokens.extend(piece[i:i + size] for i in range(0, len(piece), size))
+        return tokens
+
+    def decode(self, tokens: List[str]) -> str:
+        return ''.join(tokens)
+
+    def count(self, text: str) -> int:
+        pieces = self.PIECE_RE.findall(text)
+        # Characters the pattern skipped count one token each
+        total = len(pieces) + len(text) - sum(map(len, pieces))
+        # Pieces of 1-2 characters are always one token; only longer ones can split
+        for piece in pieces:
+            if len(piece) > 2:
+                total += -(-len(piece) // self._size(piece)) - 1
+        return total
+
+
+class TiktokenTokenizer(Tokenizer):
+    """tiktoken BPE encoding (loaded on first use; requires `pip install tiktoken`)."""
+
+    name = 'tiktoken'
+
+    def __init__(self, encoding: str = 'cl100k_base'):
+        self.encoding_name = encoding
+        self._encoding = None
+
+    @property
+    def encoding(self):
+        if self._encoding is None:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+        return self._encoding
+
+    def encode(self, text: str) -> List[int]:
+        return self.encoding.encode(text, disallowed_special=())
+
+    def decode(self, tokens: List[int]) -> str:
+        return self.encoding.decode(tokens)
+
+
+class FileTokenizer(Tokenizer):
+    """BPE vocabulary from a tokenizer.json data file (requires `pip install tokenizers`)."""
+
+    name = 'file'
+
+    def __init__(self, path: str = TOKENIZER_DATA_PATH):
+        self.path = path
+        self._tokenizer = None
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            from tokenizers import Tokenizer as HFTokenizer
+            self._tokenizer = HFTokenizer.from_file(self.path)
+        return self._tokenizer
+
+    def encode(self, text: str) -> List[int]:
+        return self.tokenizer.encode(text, add_special_tokens=False).ids
+
+    def decode(self, tokens: List[int]) -> str:
+        return self.tokenizer.decode(tokens)
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def load_tokenizer(spec: Optional[str] = None) -> Tokenizer:
+    """
+    Pick a tokenizer backend.
+
+    Args:
+        spec: 'heuristic', 'tiktoken' / 'tiktoken:<encoding>', or a path to a
+            tokenizer.json file. Default: JETT_TOKENIZER env var, else
+            data/tokenizer.json, else tiktoken, else the heuristic, depending
+            on what is installed.
+    """
+    spec = spec or os.environ.get('JETT_TOKENIZER')
+    if spec:
+        if spec == 'heuristic':
+            return HeuristicTokenizer()
+        if spec.startswith('tiktoken'):
+            _, _, encoding = spec.partition(':')
+            return TiktokenTokenizer(encoding or 'cl100k_base')
+        return FileTokenizer(spec)
+
+    if os.path.exists(TOKENIZER_DATA_PATH) and _installed('tokenizers'):
+        return FileTokenizer(TOKENIZER_DATA_PATH)
+    if _installed('tiktoken'):
+        return TiktokenTokenizer()
+    return HeuristicTokenizer()
+
+
+class TokenCounter:
+    """
+    Token counts with an LRU cache keyed on a hash of the text.
+
+    If the configured backend fails to load (missing package, no vocabulary
+    file, no network for tiktoken's download), it falls back to the
+    heuristic tokenizer once and says so.
+    """
+
+    def __init__(self, tokenizer: Optional[Tokenizer] = None, cache_size: int = COUNT_CACHE_SIZE):
+        self.tokenizer = tokenizer or load_tokenizer()
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[bytes, int]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _backend(self, call, *args):
+        """Run a backend call, switching to the heuristic if the backend is unusable."""
+        try:
+            return call(self.tokenizer)(*args)
+        except (ImportError, OSError, ValueError) as e:
+            if isinstance(self.tokenizer, HeuristicTokenizer):
+                raise
+            print(f"⚠️  Tokenizer '{self.tokenizer.name}' unavailable ({e}), using heuristic counts")
+            self.tokenizer = HeuristicTokenizer()
+            with self._lock:
+                self._cache.clear()
+            return call(self.tokenizer)(*args)
+
+    def count(self, text: Optional[str]) -> int:
+        """Number of tokens in text."""
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        tokens = self._backend(lambda t: t.count, text)
+        with self._lock:
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def trim(self, text: str, max_tokens: int) -> Tuple[str, bool]:
+        """
+        Cut text to at most max_tokens, keeping the start.
+
+        Returns (text, trimmed).
+        """
+        if self.count(text) <= max_tokens:
+            return text, False
+        tokens = self._backend(lambda t: t.encode, text)
+        return self._backend(lambda t: t.decode, tokens[:max_tokens]), True
+
+    def chunk(self, text: str, max_tokens: int, overlap: int = 0) -> List[str]:
+        """Split text into pieces of at most max_tokens, overlapping by `overlap` tokens."""
+        if self.count(text) <= max_tokens:
+            return [text]
+        tokens = self._backend(lambda t: t.encode, text)
+        step = max(1, max_tokens - overlap)
+        return [self._backend(lambda t: t.decode, tokens[i:i + max_tokens])
+                for i in range(0, len(tokens), step)
+                if i == 0 or i + overlap < len(tokens)]
+
+    def get_stats(self) -> dict:
+        """Backend name and cache hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'tokenizer': self.tokenizer.name,
+                'entries': len(self._cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_shared_counter: Optional[TokenCounter] = None
+_shared_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Get the shared TokenCounter (and its count cache)."""
+    global _shared_counter
+    with _shared_counter_lock:
+        if _shared_counter is None:
+            _shared_counter = TokenCounter()
+        return _shared_counter
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with the shared TokenCounter."""
+    return get_token_counter().count(text)
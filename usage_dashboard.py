@@ -84,7 +84,7 @@ def show_daily_breakdown(days: int = 7):
     for row in daily:
         date = row['date']
         if date not in by_date:
-            by_date[date] = {'ollama': 0, 'claude': 0, 'cost': 0.0, 'savings': 0.0}
+            by_date[date] = {'ollama': 0, 'claude': 0, 'cache': 0, 'cost': 0.0, 'savings': 0.0}
 
         provider = row['provider']
         by_date[date][provider] = row['count']
@@ -92,17 +92,18 @@ def show_daily_breakdown(days: int = 7):
         by_date[date]['savings'] += row['savings'] or 0.0
 
     # Print table
-    print(f"{'Date':<12} {'Local':>8} {'API':>8} {'Cost':>12} {'Savings':>12}")
-    print("-"*60)
+    print(f"{'Date':<12} {'Local':>8} {'API':>8} {'Cached':>8} {'Cost':>12} {'Savings':>12}")
+    print("-"*70)
 
     for date in sorted(by_date.keys(), reverse=True):
         data = by_date[date]
         local_count = data['ollama']
         api_count = data['claude']
+        cached_count = data['cache']
         cost = format_cost(data['cost'])
         savings = format_cost(data['savings'])
 
-        print(f"{date:<12} {local_count:>8} {api_count:>8} {cost:>12} {savings:>12}")
+        print(f"{date:<12} {local_count:>8} {api_count:>8} {cached_count:>8} {cost:>12} {savings:>12}")
 
 
 def show_routing_analysis():
@@ -131,6 +132,77 @@ def show_routing_analysis():
         print(f"{reason:<50} {provider:<10} {count:>8} {complexity:>12}")
 
 
+def show_model_loads(days: int = 7):
+    """Show local model usage and cold loads."""
+    tracker = UsageTracker()
+    loads = tracker.get_model_loads(days=days)
+
+    print_header(f"🧊 LOCAL MODELS (Last {days} Days)")
+    print()
+
+    if not loads:
+        print("  No local model usage")
+        return
+
+    print(f"{'Model':<28} {'Requests':>10} {'Cold Loads':>12} {'Load Time':>12} {'Avg Time':>10}")
+    print("-"*76)
+
+    for row in loads:
+        model = (row['model'] or 'unknown')[:27]
+        load_time = f"{(row['load_ms'] or 0) / 1000:.1f}s"
+        avg_time = f"{row['avg_time_ms'] or 0:.0f}ms"
+
+        print(f"{model:<28} {row['requests']:>10} {row['cold_loads']:>12} {load_time:>12} {avg_time:>10}")
+
+
+def show_latency(days: int = 7):
+    """Show latency percentiles per provider and model."""
+    tracker = UsageTracker()
+    rows = tracker.get_latency_percentiles(days=days, by_model=True)
+
+    print_header(f"⏱️  LATENCY PERCENTILES (Last {days} Days)")
+    print()
+
+    if not rows:
+        print("  No timed requests")
+        return
+
+    print(f"{'Provider':<10} {'Model':<28} {'Requests':>10} {'p50':>10} {'p90':>10} {'p99':>10}")
+    print("-"*82)
+
+    for row in rows:
+        model = (row['model'] or '-')[:27]
+        p50, p90, p99 = (f"{row[p]:.0f}ms" for p in ('p50', 'p90', 'p99'))
+
+        print(f"{row['provider'].upper():<10} {model:<28} {row['count']:>10} {p50:>10} {p90:>10} {p99:>10}")
+
+
+def show_latency_timeline(days: int = 1):
+    """Show hourly latency percentiles."""
+    tracker = UsageTracker()
+    rows = tracker.get_latency_timeline(days=days)
+
+    print_header(f"📈 LATENCY OVER TIME (Last {days * 24} Hours)")
+    print()
+
+    if not rows:
+        print("  No timed requests")
+        return
+
+    # Bar scaled to the slowest hourly p99
+    slowest = max(row['p99'] for row in rows) or 1.0
+
+    print(f"{'Hour':<15} {'Provider':<10} {'Requests':>9} {'p50':>9} {'p99':>9}  p99")
+    print("-"*80)
+
+    for row in rows:
+        hour = row['hour'].replace('T', ' ') + 'h'
+        bar = '█' * max(1, round(row['p99'] / slowest * 20))
+
+        print(f"{hour:<15} {row['provider'].upper():<10} {row['count']:>9} "
+              f"{row['p50']:>7.0f}ms {row['p99']:>7.0f}ms  {bar}")
+
+
 def show_comparison():
     """Show cost comparison with/without routing."""
     tracker = UsageTracker()
@@ -161,7 +233,11 @@ def show_comparison():
     print(f"  Total: {stats['total_requests']}")
     print(f"  Local (free): {stats['providers'].get('ollama', {}).get('count', 0)} ({stats['local_percentage']:.1f}%)")
     print(f"  API (paid): {stats['providers'].get('claude', {}).get('count', 0)}")
+    print(f"  Cached (free): {stats['providers'].get('cache', {}).get('count', 0)} ({stats['cache_percentage']:.1f}%)")
     print()
+    if stats['cache_savings']:
+        print(f"Response cache saved: {format_cost(stats['cache_savings'])}")
+        print()
 
     # Project annual savings
     if stats['period_days'] > 0:
@@ -225,6 +301,9 @@ def print_menu():
     print("  recent      Show recent requests")
     print("  daily       Show daily breakdown")
     print("  routing     Show routing analysis")
+    print("  models      Show local model cold loads")
+    print("  latency     Show latency percentiles")
+    print("  timeline    Show latency over time")
     print("  compare     Show cost comparison")
     print("  summary     Show comprehensive summary")
     print("  help        Show this menu")
@@ -247,6 +326,9 @@ def main():
             'recent': show_recent,
             'daily': show_daily_breakdown,
             'routing': show_routing_analysis,
+            'models': show_model_loads,
+            'latency': show_latency,
+            'timeline': show_latency_timeline,
             'compare': show_comparison,
             'summary': show_summary,
             'help': print_menu
@@ -281,6 +363,12 @@ def main():
                     show_daily_breakdown()
                 elif cmd == 'routing':
                     show_routing_analysis()
+                elif cmd == 'models':
+                    show_model_loads()
+                elif cmd == 'latency':
+                    show_latency()
+                elif cmd == 'timeline':
+                    show_latency_timeline()
                 elif cmd == 'compare':
                     show_comparison()
                 elif cmd == 'summary':
@@ -3,22 +3,132 @@ Usage Tracker - Track LLM usage and cost savings
 Stores usage stats in SQLite for monitoring and reporting
 """
 
+import atexit
+import gzip
+import math
+import queue
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 from contextlib import contextmanager
 import os
 
+from latency_histogram import LatencyHistogram
+
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'jett_knowledge.db')
 
+# Buffered writes: flush after this many events or seconds, whichever comes first
+FLUSH_EVERY = 200
+FLUSH_INTERVAL = 1.0
+
+# Events held in memory before log_usage() falls back to writing inline
+MAX_QUEUED_EVENTS = 10_000
+
+USAGE_COLUMNS = (
+    'timestamp', 'provider', 'model', 'prompt', 'response_preview',
+    'routing_reason', 'complexity_score', 'tokens', 'time_ms',
+    'cost_usd', 'savings_usd', 'success', 'ttft_ms', 'tokens_per_sec', 'load_ms',
+    'coalesced'
+)
+
+INSERT_USAGE_SQL = (
+    f"INSERT INTO usage_stats ({', '.join(USAGE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(USAGE_COLUMNS))})"
+)
+
+# Retention: raw usage_stats rows older than this are archived and deleted
+# (rollups and latency histograms keep their totals)
+RETENTION_DAYS = 90
+# Buffered trackers apply retention from the writer thread this often (seconds)
+RETENTION_INTERVAL = 24 * 60 * 60
+# Rows archived and deleted per transaction, to keep write-lock hold times short
+DELETE_CHUNK = 2000
+# Monthly archives (usage_stats-YYYY-MM.jsonl.gz) go here, next to the database
+ARCHIVE_DIRNAME = 'usage_archive'
+
+# Marker the writer thread stops on
+_STOP = object()
+
+# Rollup tables: usage_stats pre-aggregated per period and provider/model/routing_reason.
+# Each metric is (column, type, per-row expression over usage_stats).
+ROLLUP_METRICS = (
+    ('count', 'INTEGER', '1'),
+    ('tokens', 'INTEGER', 'COALESCE(tokens, 0)'),
+    ('cost_usd', 'REAL', 'COALESCE(cost_usd, 0)'),
+    ('savings_usd', 'REAL', 'COALESCE(savings_usd, 0)'),
+    ('time_ms_sum', 'REAL', 'COALESCE(time_ms, 0)'),
+    ('time_ms_sumsq', 'REAL', 'COALESCE(time_ms * time_ms, 0)'),
+    ('time_ms_count', 'INTEGER', 'time_ms IS NOT NULL'),
+    ('complexity_sum', 'REAL', 'COALESCE(complexity_score, 0)'),
+    ('complexity_count', 'INTEGER', 'complexity_score IS NOT NULL'),
+    ('ttft_ms_sum', 'REAL', 'COALESCE(ttft_ms, 0)'),
+    ('ttft_ms_count', 'INTEGER', 'ttft_ms IS NOT NULL'),
+    ('tokens_per_sec_sum', 'REAL', 'COALESCE(tokens_per_sec, 0)'),
+    ('tokens_per_sec_count', 'INTEGER', 'tokens_per_sec IS NOT NULL'),
+    ('coalesced', 'INTEGER', 'COALESCE(coalesced, 0)'),
+    ('successes', 'INTEGER', 'COALESCE(success, 0)'),
+)
+
+# True when retention removed raw rows of an hour the hourly rollup still counts
+# (params: hour bucket, hour start, hour end)
+HOUR_PRUNED_SQL = """(
+    (SELECT COALESCE(SUM(count), 0) FROM usage_rollup_hourly WHERE bucket = ?) >
+    (SELECT COUNT(*) FROM usage_stats WHERE timestamp >= ? AND timestamp < ?)
+)"""
+
+# Rollup table -> period key computed from usage_stats.timestamp
+ROLLUP_TABLES = {
+    'usage_rollup_hourly': "REPLACE(SUBSTR(timestamp, 1, 13), ' ', 'T')",  # YYYY-MM-DDTHH
+    'usage_rollup_daily': "SUBSTR(timestamp, 1, 10)",                     # YYYY-MM-DD
+}
+
 
 class UsageTracker:
     """Track LLM usage, costs, and savings."""
 
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        buffered: bool = True,
+        flush_every: int = FLUSH_EVERY,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_queued: int = MAX_QUEUED_EVENTS,
+        spill_path: Optional[str] = None,
+        retention_days: Optional[int] = RETENTION_DAYS,
+        archive_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            db_path: SQLite database holding usage_stats
+            buffered: Queue events and write them from a background thread in
+                batches (reads in this process flush first, so they see them)
+            flush_every: Batch size that triggers a write
+            flush_interval: Max seconds an event waits before being written
+            max_queued: Queue bound; when full, log_usage() writes inline
+            spill_path: Append-only JSONL file for batches that hit a locked
+                database; replayed into usage_stats on the next successful write
+            retention_days: Raw rows kept by the writer's daily retention pass
+                (None to disable; clear_old_data() can always be run by hand)
+            archive_dir: Where old rows are archived before deletion
+                (default: usage_archive/ next to the database)
+        """
         self.db_path = db_path
+        self.buffered = buffered
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_queued)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._retry: List[Tuple] = []
+        self.retention_days = retention_days
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), ARCHIVE_DIRNAME)
+        self._next_retention = 0.0
         self._ensure_table_exists()
 
     @contextmanager
@@ -39,6 +149,9 @@ class UsageTracker:
         """Create usage_stats table if it doesn't exist."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            # Lets clear_old_data() hand freed pages back to the filesystem; only
+            # takes effect on new databases (existing ones are converted there)
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS usage_stats (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -53,10 +166,22 @@ class UsageTracker:
                     time_ms REAL,
                     cost_usd REAL,
                     savings_usd REAL,
-                    success INTEGER DEFAULT 1
+                    success INTEGER DEFAULT 1,
+                    ttft_ms REAL,
+                    tokens_per_sec REAL,
+                    load_ms REAL,
+                    coalesced INTEGER DEFAULT 0
                 )
             """)
 
+            # Columns added after the table was introduced; upgrade older tables in place
+            cursor.execute("PRAGMA table_info(usage_stats)")
+            columns = {row['name'] for row in cursor.fetchall()}
+            for column, definition in (('ttft_ms', 'REAL'), ('tokens_per_sec', 'REAL'),
+                                       ('load_ms', 'REAL'), ('coalesced', 'INTEGER DEFAULT 0')):
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE usage_stats ADD COLUMN {column} {definition}")
+
             # Create indexes
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_usage_timestamp
@@ -67,42 +192,383 @@ class UsageTracker:
                 ON usage_stats(provider)
             """)
 
+            # Rollups; built from existing rows the first time they appear
+            metrics = ',\n'.join(f"{name} {kind} NOT NULL DEFAULT 0" for name, kind, _ in ROLLUP_METRICS)
+            for table in ROLLUP_TABLES:
+                cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        bucket TEXT NOT NULL,
+                        provider TEXT NOT NULL,
+                        model TEXT NOT NULL DEFAULT '',
+                        routing_reason TEXT NOT NULL DEFAULT '',
+                        {metrics},
+                        PRIMARY KEY (bucket, provider, model, routing_reason)
+                    )
+                """)
+
+            # Hourly latency histograms (see latency_histogram.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS usage_latency_hourly (
+                    bucket TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL DEFAULT '',
+                    histogram BLOB NOT NULL,
+                    PRIMARY KEY (bucket, provider, model)
+                )
+            """)
+
+            # Hold the write lock from the emptiness checks through the build, so
+            # trackers opening the database together don't each build them
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT 1 FROM usage_rollup_daily LIMIT 1")
+            if cursor.fetchone() is None:
+                self._update_rollups(conn, after_id=0)
+            cursor.execute("SELECT 1 FROM usage_latency_hourly LIMIT 1")
+            if cursor.fetchone() is None:
+                self._update_latency(conn, after_id=0)
+
     def log_usage(self, provider: str, prompt: str, result: Dict):
         """
         Log an LLM usage event.
 
+        Buffered trackers only queue the row here; it is written within
+        flush_interval seconds by the background writer.
+
         Args:
             provider: 'ollama' or 'claude'
             prompt: User prompt
             result: Result dictionary from LLM router
         """
+        self.log_usage_many([(provider, prompt, result)])
+
+    def log_usage_many(self, events: List[Tuple[str, str, Dict]]):
+        """
+        Log several LLM usage events (in one transaction when unbuffered).
+
+        Args:
+            events: (provider, prompt, result) tuples, as for log_usage()
+        """
+        if not events:
+            return
+
+        rows = [self._usage_row(provider, prompt, result) for provider, prompt, result in events]
+        if not self.buffered:
+            self._write_rows(rows)
+            return
+
+        self._ensure_writer()
+        for index, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                # Writer can't keep up: apply back-pressure rather than drop events
+                self._write_rows(rows[index:])
+                return
+
+    def _ensure_writer(self):
+        """Start the background writer on first use."""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name='usage-writer', daemon=True)
+                self._writer.start()
+                atexit.register(self.close)
+
+    def _run_writer(self):
+        """Background loop: batch queued rows and write them on size or time."""
+        while True:
+            batch, waiters, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_every:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)  # flush() caller: write what we have now
+                    break
+                batch.append(item)
+
+            if batch or self._retry:
+                try:
+                    self._write_rows(batch)
+                except Exception as e:
+                    print(f"⚠️  Usage logging failed, {len(batch)} events lost: {e}")
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+            self._maybe_apply_retention()
+
+    def _maybe_apply_retention(self):
+        """Writer thread: run the retention pass once per RETENTION_INTERVAL."""
+        if self.retention_days is None or time.monotonic() < self._next_retention:
+            return
+        self._next_retention = time.monotonic() + RETENTION_INTERVAL
+        try:
+            # Never the one-time full VACUUM here: it would lock the shared database
+            # from a background thread; only clear_old_data() converts it
+            result = self._apply_retention(self.retention_days, self.archive_dir, DELETE_CHUNK,
+                                           vacuum=True, convert=False)
+        except Exception as e:
+            print(f"⚠️  Usage retention failed: {e}")
+            return
+        if result['deleted_count']:
+            print(f"🗄️  Archived and removed {result['deleted_count']} usage rows older than "
+                  f"{self.retention_days} days ({result['freed_pages']} pages freed)")
+
+    def _write_rows(self, rows: List[Tuple]):
+        """
+        Insert usage rows (plus any spilled or retried ones) in one transaction.
+
+        If the database is locked, rows go to the spill file when configured,
+        otherwise they are kept and retried with the next batch.
+        """
+        with self._write_lock:
+            retry, self._retry = self._retry, []
+            spilled = self._read_spill()
+            pending = spilled + retry + list(rows)
+            if not pending:
+                return
+            try:
+                with self._get_connection() as conn:
+                    # Take the write lock before reading MAX(id): rows other writers
+                    # commit after it would otherwise be rolled up twice
+                    conn.execute("BEGIN IMMEDIATE")
+                    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM usage_stats").fetchone()[0]
+                    conn.executemany(INSERT_USAGE_SQL, pending)
+                    self._update_rollups(conn, after_id=last_id)
+                    self._update_latency(conn, after_id=last_id)
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e):
+                    raise
+                if self.spill_path:
+                    self._spill(retry + list(rows))
+                else:
+                    self._retry = (retry + list(rows))[-self._queue.maxsize:]
+                return
+            if spilled:
+                # Replayed into the database; start a fresh spill file
+                os.remove(self.spill_path)
+
+    @staticmethod
+    def _update_rollups(conn: sqlite3.Connection, after_id: int):
+        """Add usage_stats rows with id > after_id to the rollup tables (same transaction)."""
+        names = ', '.join(name for name, _, _ in ROLLUP_METRICS)
+        sums = ', '.join(f"SUM({expr})" for _, _, expr in ROLLUP_METRICS)
+        updates = ', '.join(f"{name} = {name} + excluded.{name}" for name, _, _ in ROLLUP_METRICS)
+        for table, bucket in ROLLUP_TABLES.items():
+            conn.execute(f"""
+                INSERT INTO {table} (bucket, provider, model, routing_reason, {names})
+                SELECT {bucket}, provider, COALESCE(model, ''), COALESCE(routing_reason, ''), {sums}
+                FROM usage_stats
+                WHERE id > ?
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (bucket, provider, model, routing_reason) DO UPDATE SET {updates}
+            """, (after_id,))
+
+    @staticmethod
+    def _update_latency(conn: sqlite3.Connection, after_id: int):
+        """Merge time_ms of usage_stats rows with id > after_id into the hourly histograms."""
+        cursor = conn.execute(f"""
+            SELECT {ROLLUP_TABLES['usage_rollup_hourly']} AS bucket, provider,
+                   COALESCE(model, '') AS model, time_ms
+            FROM usage_stats
+            WHERE id > ? AND time_ms IS NOT NULL
+        """, (after_id,))
+        added: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        for bucket, provider, model, time_ms in cursor:
+            added.setdefault((bucket, provider, model), LatencyHistogram()).add(time_ms)
+
+        for key, histogram in added.items():
+            row = conn.execute("""
+                SELECT histogram FROM usage_latency_hourly
+                WHERE bucket = ? AND provider = ? AND model = ?
+            """, key).fetchone()
+            if row is not None:
+                histogram.merge(LatencyHistogram.from_bytes(row[0]))
+            conn.execute("""
+                INSERT OR REPLACE INTO usage_latency_hourly (bucket, provider, model, histogram)
+                VALUES (?, ?, ?, ?)
+            """, key + (histogram.to_bytes(),))
+
+    def rebuild_rollups(self):
+        """
+        Recompute the rollup and latency tables from usage_stats (compaction / repair job).
+
+        Only needed after writing to usage_stats outside UsageTracker; rows
+        logged here keep the rollups current. History whose raw rows were
+        removed by clear_old_data() is lost from the rebuilt rollups.
+        """
+        self.flush()
         with self._get_connection() as conn:
-            cursor = conn.cursor()
+            for table in ROLLUP_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM usage_latency_hourly")
+            self._update_rollups(conn, after_id=0)
+            self._update_latency(conn, after_id=0)
 
-            # Truncate prompt and response for storage
-            prompt_preview = prompt[:500] if prompt else None
-            response_preview = result.get('response', '')[:500] if result.get('response') else None
+    @staticmethod
+    def _usage_since(start_date: str) -> Tuple[str, List]:
+        """
+        Subquery of per-period usage since start_date, read mostly from rollups.
 
-            cursor.execute("""
-                INSERT INTO usage_stats (
-                    timestamp, provider, model, prompt, response_preview,
-                    routing_reason, complexity_score, tokens, time_ms,
-                    cost_usd, savings_usd, success
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.now().isoformat(),
-                provider,
-                result.get('model'),
-                prompt_preview,
-                response_preview,
-                result.get('routing_reason'),
-                result.get('complexity_score'),
-                result.get('tokens'),
-                result.get('time_ms'),
-                result.get('cost_usd', 0.0),
-                result.get('savings_usd', 0.0),
-                1 if result.get('success') else 0
-            ))
+        Whole days come from the daily rollup, whole hours of the first day
+        from the hourly rollup, and only the partial first hour from raw
+        usage_stats rows (an index range scan), so totals are exact while
+        the raw rows exist. Once retention has removed raw rows of that
+        first hour, the whole hour is taken from the hourly rollup instead
+        (so up to an hour before start_date is counted).
+
+        Returns (sql, params); rows have day, provider, model, routing_reason
+        and the ROLLUP_METRICS columns.
+        """
+        start, floor, hour = UsageTracker._first_hour(start_date)
+        day = hour.replace(hour=0)
+        if day < hour:
+            day += timedelta(days=1)
+        hour_bucket = hour.strftime('%Y-%m-%dT%H')
+        day_bucket = day.strftime('%Y-%m-%d')
+
+        names = ', '.join(name for name, _, _ in ROLLUP_METRICS)
+        raw = ', '.join(f"{expr} AS {name}" for name, _, expr in ROLLUP_METRICS)
+        sql = f"""
+            SELECT SUBSTR(bucket, 1, 10) AS day, provider, model, routing_reason, {names}
+            FROM usage_rollup_hourly
+            WHERE bucket >= ? AND bucket < ?
+            UNION ALL
+            SELECT bucket, provider, model, routing_reason, {names}
+            FROM usage_rollup_daily
+            WHERE bucket >= ?
+        """
+        params = [hour_bucket, day.strftime('%Y-%m-%dT%H'), day_bucket]
+
+        if floor < start:
+            # Partial first hour: raw rows, or its hourly rollup once they are pruned
+            pruned_params = [floor.strftime('%Y-%m-%dT%H'), floor.isoformat(), hour.isoformat()]
+            sql += f"""
+                UNION ALL
+                SELECT SUBSTR(timestamp, 1, 10), provider,
+                       COALESCE(model, ''), COALESCE(routing_reason, ''), {raw}
+                FROM usage_stats
+                WHERE timestamp >= ? AND timestamp < ? AND NOT {HOUR_PRUNED_SQL}
+                UNION ALL
+                SELECT SUBSTR(bucket, 1, 10), provider, model, routing_reason, {names}
+                FROM usage_rollup_hourly
+                WHERE bucket = ? AND {HOUR_PRUNED_SQL}
+            """
+            params += [start_date, hour.isoformat()] + pruned_params
+            params += [floor.strftime('%Y-%m-%dT%H')] + pruned_params
+        return sql, params
+
+    @staticmethod
+    def _first_hour(start_date: str) -> Tuple[datetime, datetime, datetime]:
+        """(start, start of its hour, first whole hour at or after start)."""
+        start = datetime.fromisoformat(start_date)
+        floor = start.replace(minute=0, second=0, microsecond=0)
+        hour = floor + timedelta(hours=1) if floor < start else floor
+        return start, floor, hour
+
+    @staticmethod
+    def _latency_since(
+        conn: sqlite3.Connection,
+        start_date: str,
+        provider: Optional[str] = None
+    ) -> List[Tuple[str, str, str, LatencyHistogram]]:
+        """
+        (hour bucket, provider, model, histogram) since start_date.
+
+        The partial first hour comes from raw usage_stats rows (or its whole
+        hourly histogram once retention removed them), later hours from
+        usage_latency_hourly, matching _usage_since.
+        """
+        start, floor, hour = UsageTracker._first_hour(start_date)
+        filter_sql, filter_params = (" AND provider = ?", [provider]) if provider else ("", [])
+        first_bucket = floor.strftime('%Y-%m-%dT%H')
+        results = []
+
+        pruned = floor < start and conn.execute(
+            f"SELECT {HOUR_PRUNED_SQL}", (first_bucket, floor.isoformat(), hour.isoformat())
+        ).fetchone()[0]
+        if floor < start and not pruned:
+            first: Dict[Tuple[str, str], LatencyHistogram] = {}
+            for row_provider, model, time_ms in conn.execute(f"""
+                SELECT provider, COALESCE(model, ''), time_ms
+                FROM usage_stats
+                WHERE timestamp >= ? AND timestamp < ? AND time_ms IS NOT NULL{filter_sql}
+            """, [start_date, hour.isoformat()] + filter_params):
+                first.setdefault((row_provider, model), LatencyHistogram()).add(time_ms)
+            results = [(first_bucket, p, m, h) for (p, m), h in first.items()]
+
+        for bucket, row_provider, model, blob in conn.execute(f"""
+            SELECT bucket, provider, model, histogram
+            FROM usage_latency_hourly
+            WHERE bucket >= ?{filter_sql}
+            ORDER BY bucket
+        """, [(floor if pruned else hour).strftime('%Y-%m-%dT%H')] + filter_params):
+            results.append((bucket, row_provider, model, LatencyHistogram.from_bytes(blob)))
+        return results
+
+    def _spill(self, rows: List[Tuple]):
+        """Append rows to the JSONL spill file."""
+        with open(self.spill_path, 'a') as f:
+            for row in rows:
+                f.write(json.dumps(row) + '\n')
+
+    def _read_spill(self) -> List[Tuple]:
+        """Rows waiting in the spill file."""
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+        with open(self.spill_path) as f:
+            return [tuple(json.loads(line)) for line in f if line.strip()]
+
+    def flush(self, timeout: float = 10.0):
+        """Write every event logged so far (no-op when unbuffered or idle)."""
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Drain queued events and stop the background writer."""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        writer.join()
+        atexit.unregister(self.close)
+
+    @staticmethod
+    def _usage_row(provider: str, prompt: str, result: Dict) -> Tuple:
+        """usage_stats column values for one event."""
+        # Truncate prompt and response for storage
+        prompt_preview = prompt[:500] if prompt else None
+        response_preview = result.get('response', '')[:500] if result.get('response') else None
+
+        return (
+            datetime.now().isoformat(),
+            provider,
+            result.get('model'),
+            prompt_preview,
+            response_preview,
+            result.get('routing_reason'),
+            result.get('complexity_score'),
+            result.get('tokens'),
+            result.get('time_ms'),
+            result.get('cost_usd', 0.0),
+            result.get('savings_usd', 0.0),
+            1 if result.get('success') else 0,
+            result.get('ttft_ms'),
+            result.get('tokens_per_sec'),
+            result.get('load_ms'),
+            1 if result.get('coalesced') else 0
+        )
 
     def get_stats(
         self,
@@ -119,29 +585,33 @@ class UsageTracker:
         Returns:
             Dict with usage statistics
         """
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
             # Calculate date threshold
             start_date = (datetime.now() - timedelta(days=days)).isoformat()
 
-            # Build query
-            query = """
+            # Build query (over the rollups, see _usage_since)
+            usage, params = self._usage_since(start_date)
+            query = f"""
                 SELECT
                     provider,
-                    COUNT(*) as count,
+                    SUM(count) as count,
                     SUM(tokens) as total_tokens,
                     SUM(cost_usd) as total_cost,
                     SUM(savings_usd) as total_savings,
-                    AVG(time_ms) as avg_time_ms,
-                    AVG(complexity_score) as avg_complexity
-                FROM usage_stats
-                WHERE timestamp >= ?
+                    SUM(time_ms_sum) / NULLIF(SUM(time_ms_count), 0) as avg_time_ms,
+                    SUM(time_ms_sumsq) / NULLIF(SUM(time_ms_count), 0) as mean_sq_time_ms,
+                    SUM(complexity_sum) / NULLIF(SUM(complexity_count), 0) as avg_complexity,
+                    SUM(ttft_ms_sum) / NULLIF(SUM(ttft_ms_count), 0) as avg_ttft_ms,
+                    SUM(tokens_per_sec_sum) / NULLIF(SUM(tokens_per_sec_count), 0) as avg_tokens_per_sec,
+                    SUM(coalesced) as coalesced
+                FROM ({usage})
             """
-            params = [start_date]
 
             if provider:
-                query += " AND provider = ?"
+                query += " WHERE provider = ?"
                 params.append(provider)
 
             query += " GROUP BY provider"
@@ -157,6 +627,10 @@ class UsageTracker:
                 'providers': {}
             }
 
+            latency: Dict[str, LatencyHistogram] = {}
+            for _, row_provider, _, histogram in self._latency_since(conn, start_date, provider):
+                latency.setdefault(row_provider, LatencyHistogram()).merge(histogram)
+
             total_count = 0
             total_cost = 0.0
             total_savings = 0.0
@@ -168,7 +642,17 @@ class UsageTracker:
                     'total_cost': row['total_cost'] or 0.0,
                     'total_savings': row['total_savings'] or 0.0,
                     'avg_time_ms': row['avg_time_ms'] or 0.0,
-                    'avg_complexity': row['avg_complexity'] or 0.0
+                    'stddev_time_ms': math.sqrt(max(0.0, (row['mean_sq_time_ms'] or 0.0) -
+                                                    (row['avg_time_ms'] or 0.0) ** 2)),
+                    # Tail latency from the hourly histograms (None without timed requests)
+                    **{f"{name}_time_ms": value for name, value in
+                       latency.get(row['provider'], LatencyHistogram()).percentiles().items()},
+                    'avg_complexity': row['avg_complexity'] or 0.0,
+                    # Only streamed requests record these (None otherwise)
+                    'avg_ttft_ms': row['avg_ttft_ms'],
+                    'avg_tokens_per_sec': row['avg_tokens_per_sec'],
+                    # Requests that shared an identical in-flight generation
+                    'coalesced': row['coalesced'] or 0
                 }
                 stats['providers'][row['provider']] = provider_stats
 
@@ -193,10 +677,21 @@ class UsageTracker:
                 (local_count / total_count * 100) if total_count > 0 else 0
             )
 
+            # Requests answered by the response cache
+            cache_stats = stats['providers'].get('cache', {})
+            stats['cache_percentage'] = (
+                (cache_stats.get('count', 0) / total_count * 100) if total_count > 0 else 0
+            )
+            stats['cache_savings'] = cache_stats.get('total_savings', 0.0)
+
+            # Requests that shared another request's generation
+            stats['coalesced_requests'] = sum(p['coalesced'] for p in stats['providers'].values())
+
             return stats
 
     def get_recent_usage(self, limit: int = 20) -> List[Dict]:
         """Get recent usage entries."""
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -208,48 +703,179 @@ class UsageTracker:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
+    def get_last_usage_id(self) -> int:
+        """Highest usage_stats id (0 when empty); a cursor for get_usage_since()."""
+        self.flush()
+        with self._get_connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM usage_stats").fetchone()[0]
+
+    def get_usage_since(self, after_id: int, limit: int = 1000) -> List[Dict]:
+        """
+        Usage events logged after the given id, oldest first (prompts omitted).
+
+        Cheap to poll: a rowid range scan returning only new rows.
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    id, timestamp, provider, model, routing_reason, complexity_score,
+                    tokens, time_ms, cost_usd, savings_usd, success, ttft_ms, coalesced
+                FROM usage_stats
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (after_id, limit))
+
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_routing_history(self, days: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Routed requests (oldest first) with the fields routing policies learn from.
+
+        Args:
+            days: Only the last N days (default: all)
+            limit: Only the most recent N rows (default: all)
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            start_date = (datetime.now() - timedelta(days=days)).isoformat() if days else ''
+
+            cursor.execute("""
+                SELECT * FROM (
+                    SELECT
+                        id, timestamp, provider, model, routing_reason,
+                        complexity_score, time_ms, cost_usd, success
+                    FROM usage_stats
+                    WHERE timestamp >= ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                ) ORDER BY id
+            """, (start_date, limit if limit is not None else -1))
+
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    def get_model_loads(self, days: int = 7, cold_load_ms: float = 500.0) -> List[Dict]:
+        """
+        Local model requests, cold loads and load time per model.
+
+        Args:
+            days: Period to report
+            cold_load_ms: Loads at least this slow count as cold (a model swap)
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            start_date = (datetime.now() - timedelta(days=days)).isoformat()
+
+            cursor.execute("""
+                SELECT
+                    model,
+                    COUNT(*) as requests,
+                    SUM(CASE WHEN load_ms >= ? THEN 1 ELSE 0 END) as cold_loads,
+                    SUM(CASE WHEN load_ms >= ? THEN load_ms ELSE 0 END) as load_ms,
+                    AVG(time_ms) as avg_time_ms
+                FROM usage_stats
+                WHERE timestamp >= ? AND provider = 'ollama'
+                GROUP BY model
+                ORDER BY requests DESC
+            """, (cold_load_ms, cold_load_ms, start_date))
+
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
+
+    def get_latency_percentiles(self, days: int = 7, by_model: bool = False) -> List[Dict]:
+        """
+        Latency percentiles per provider (and model) over the last N days.
+
+        Returns:
+            List of dicts with provider, model (None unless by_model),
+            count, p50, p90 and p99 in milliseconds, slowest p99 first
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            start_date = (datetime.now() - timedelta(days=days)).isoformat()
+            merged: Dict[Tuple[str, Optional[str]], LatencyHistogram] = {}
+            for _, provider, model, histogram in self._latency_since(conn, start_date):
+                key = (provider, (model or None) if by_model else None)
+                merged.setdefault(key, LatencyHistogram()).merge(histogram)
+
+        results = [
+            {'provider': provider, 'model': model, 'count': histogram.total, **histogram.percentiles()}
+            for (provider, model), histogram in merged.items()
+        ]
+        return sorted(results, key=lambda r: r['p99'] or 0.0, reverse=True)
+
+    def get_latency_timeline(self, days: int = 1, provider: Optional[str] = None) -> List[Dict]:
+        """
+        Hourly latency percentiles over the last N days.
+
+        Returns:
+            List of dicts with hour (YYYY-MM-DDTHH), provider, count, p50,
+            p90 and p99, oldest first
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            start_date = (datetime.now() - timedelta(days=days)).isoformat()
+            merged: Dict[Tuple[str, str], LatencyHistogram] = {}
+            for bucket, row_provider, _, histogram in self._latency_since(conn, start_date, provider):
+                merged.setdefault((bucket, row_provider), LatencyHistogram()).merge(histogram)
+
+        return [
+            {'hour': hour, 'provider': row_provider, 'count': histogram.total, **histogram.percentiles()}
+            for (hour, row_provider), histogram in sorted(merged.items())
+        ]
+
     def get_daily_summary(self, days: int = 7) -> List[Dict]:
         """Get daily summary for the past N days."""
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
             start_date = (datetime.now() - timedelta(days=days)).isoformat()
 
-            cursor.execute("""
+            usage, params = self._usage_since(start_date)
+            cursor.execute(f"""
                 SELECT
-                    DATE(timestamp) as date,
+                    day as date,
                     provider,
-                    COUNT(*) as count,
+                    SUM(count) as count,
+                    SUM(tokens) as tokens,
                     SUM(cost_usd) as cost,
                     SUM(savings_usd) as savings
-                FROM usage_stats
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp), provider
+                FROM ({usage})
+                GROUP BY day, provider
                 ORDER BY date DESC
-            """, (start_date,))
+            """, params)
 
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
     def get_routing_accuracy(self, days: int = 7) -> Dict:
         """Analyze routing accuracy and decisions."""
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
             start_date = (datetime.now() - timedelta(days=days)).isoformat()
 
             # Get routing reasons distribution
-            cursor.execute("""
+            usage, params = self._usage_since(start_date)
+            cursor.execute(f"""
                 SELECT
-                    routing_reason,
+                    NULLIF(routing_reason, '') as routing_reason,
                     provider,
-                    COUNT(*) as count,
-                    AVG(complexity_score) as avg_complexity
-                FROM usage_stats
-                WHERE timestamp >= ?
+                    SUM(count) as count,
+                    SUM(complexity_sum) / NULLIF(SUM(complexity_count), 0) as avg_complexity
+                FROM ({usage})
                 GROUP BY routing_reason, provider
                 ORDER BY count DESC
-            """, (start_date,))
+            """, params)
 
             rows = cursor.fetchall()
 
@@ -260,24 +886,142 @@ class UsageTracker:
 
             return routing_analysis
 
-    def clear_old_data(self, days: int = 90):
-        """Clear usage data older than N days."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+    def clear_old_data(
+        self,
+        days: int = RETENTION_DAYS,
+        archive: bool = True,
+        chunk_size: int = DELETE_CHUNK,
+        vacuum: bool = True
+    ) -> Dict:
+        """
+        Archive and delete usage data older than N days.
 
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        Rows are removed DELETE_CHUNK at a time, one short transaction per
+        chunk, after being appended to monthly JSONL-gz archives in
+        archive_dir. Rollups and latency histograms are kept, so reports
+        over longer periods stay complete. Archiving is at-least-once: a
+        crash between archive and delete can repeat rows in the archive.
 
-            cursor.execute("""
-                DELETE FROM usage_stats
-                WHERE timestamp < ?
-            """, (cutoff_date,))
+        Args:
+            days: Raw rows newer than this are kept
+            archive: Write rows to the archive before deleting them
+            chunk_size: Rows per delete transaction
+            vacuum: Return freed pages to the filesystem (converts the
+                database to incremental auto_vacuum with a one-time VACUUM)
 
-            deleted_count = cursor.rowcount
+        Returns:
+            Dict with deleted_count, cutoff_date, archived (rows per month)
+            and freed_pages
+        """
+        self.flush()
+        return self._apply_retention(days, self.archive_dir if archive else None, chunk_size,
+                                     vacuum=vacuum, convert=vacuum)
 
-            return {
-                'deleted_count': deleted_count,
-                'cutoff_date': cutoff_date
-            }
+    def _apply_retention(
+        self,
+        days: int,
+        archive_dir: Optional[str],
+        chunk_size: int,
+        vacuum: bool,
+        convert: bool
+    ) -> Dict:
+        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        deleted_count = 0
+        archived: Dict[str, int] = {}
+
+        while True:
+            with self._get_connection() as conn:
+                # Hold the write lock from SELECT to DELETE: another process
+                # running retention must not archive the same chunk again
+                conn.execute("BEGIN IMMEDIATE")
+                # Oldest rows by id, so the delete below is a rowid range
+                rows = conn.execute("""
+                    SELECT * FROM usage_stats
+                    WHERE timestamp < ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (cutoff_date, chunk_size)).fetchall()
+                if not rows:
+                    break
+                if archive_dir:
+                    for month, count in self._archive_rows(archive_dir, rows).items():
+                        archived[month] = archived.get(month, 0) + count
+                cursor = conn.execute("""
+                    DELETE FROM usage_stats
+                    WHERE id <= ? AND timestamp < ?
+                """, (rows[-1]['id'], cutoff_date))
+                deleted_count += cursor.rowcount
+
+        freed_pages = self._incremental_vacuum(convert) if vacuum and deleted_count else 0
+
+        return {
+            'deleted_count': deleted_count,
+            'cutoff_date': cutoff_date,
+            'archived': archived,
+            'archive_dir': archive_dir,
+            'freed_pages': freed_pages
+        }
+
+    @staticmethod
+    def _archive_rows(archive_dir: str, rows: List[sqlite3.Row]) -> Dict[str, int]:
+        """Append rows to usage_stats-YYYY-MM.jsonl.gz files; returns rows per month."""
+        by_month: Dict[str, List[Dict]] = {}
+        for row in rows:
+            by_month.setdefault(row['timestamp'][:7], []).append(dict(row))
+
+        os.makedirs(archive_dir, exist_ok=True)
+        for month, entries in by_month.items():
+            path = os.path.join(archive_dir, f"usage_stats-{month}.jsonl.gz")
+            # Appending adds a gzip member; gzip.open() reads all members back
+            with gzip.open(path, 'at', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+        return {month: len(entries) for month, entries in by_month.items()}
+
+    def _incremental_vacuum(self, convert: bool) -> int:
+        """
+        Release free pages to the filesystem; returns the number released.
+
+        Databases created before incremental auto_vacuum need one full VACUUM
+        to switch modes; that only happens when convert is set, otherwise
+        their free pages are left for SQLite to reuse.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                if not convert:
+                    return 0
+                # Existing database: switching modes needs one full VACUUM
+                before = conn.execute("PRAGMA page_count").fetchone()[0]
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+                return before - conn.execute("PRAGMA page_count").fetchone()[0]
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+            return free
+        finally:
+            conn.close()
+
+
+def iter_usage_archive(archive_dir: str, months: Optional[List[str]] = None):
+    """
+    Yield archived usage_stats rows (dicts), oldest month first.
+
+    Args:
+        archive_dir: Directory written by UsageTracker.clear_old_data()
+        months: Only these months ('YYYY-MM'); default all
+    """
+    if not os.path.isdir(archive_dir):
+        return
+    for name in sorted(os.listdir(archive_dir)):
+        if not (name.startswith('usage_stats-') and name.endswith('.jsonl.gz')):
+            continue
+        if months is not None and name[len('usage_stats-'):-len('.jsonl.gz')] not in months:
+            continue
+        with gzip.open(os.path.join(archive_dir, name), 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
 
 
 def format_cost(cost_usd: float) -> str:
@@ -301,6 +1045,10 @@ def print_stats_summary(stats: Dict):
     print(f"Cost Avoided: {format_cost(stats['cost_avoided'])}")
     print(f"Savings Rate: {stats['savings_percentage']:.1f}%")
     print(f"Local Usage: {stats['local_percentage']:.1f}%")
+    if stats.get('cache_percentage'):
+        print(f"Cache Hits: {stats['cache_percentage']:.1f}% (saved {format_cost(stats['cache_savings'])})")
+    if stats.get('coalesced_requests'):
+        print(f"Coalesced Requests: {stats['coalesced_requests']}")
     print()
 
     if stats['providers']:
@@ -315,6 +1063,13 @@ def print_stats_summary(stats: Dict):
             print(f"  Cost: {format_cost(pstats['total_cost'])}")
             print(f"  Savings: {format_cost(pstats['total_savings'])}")
             print(f"  Avg Time: {pstats['avg_time_ms']:.0f}ms")
+            if pstats.get('p50_time_ms') is not None:
+                print(f"  Latency p50/p90/p99: {pstats['p50_time_ms']:.0f}/"
+                      f"{pstats['p90_time_ms']:.0f}/{pstats['p99_time_ms']:.0f}ms")
+            if pstats.get('avg_ttft_ms') is not None:
+                print(f"  Avg Time to First Token: {pstats['avg_ttft_ms']:.0f}ms")
+            if pstats.get('avg_tokens_per_sec'):
+                print(f"  Avg Speed: {pstats['avg_tokens_per_sec']:.1f} tokens/sec")
             print(f"  Avg Complexity: {pstats['avg_complexity']:.2f}")
 
     print("\n" + "="*60)